@@ -0,0 +1,83 @@
+import random
+from collections.abc import Callable
+from datetime import date, timedelta
+from operator import itemgetter
+from statistics import quantiles
+from time import perf_counter
+
+import click
+import numpy as np
+
+from fitness_tracker.analytics import EPOCH_ORDINAL, PACKED_FLOAT, PACKED_INT, SetColumns, session_progress
+from fitness_tracker.routers.analytics_router import progress_response
+
+HISTORY_DAYS: int = 5 * 365
+FIRST_DAY: date = date(2020, 1, 1)
+
+
+def synthetic_history(sets: int, exercises: int) -> list[bytes]:
+    # Columns as the progress query packs them on Postgres: sorted by exercise, date and training.
+    generator = random.Random(0)
+    trainings = sorted(
+        (FIRST_DAY + timedelta(days=generator.randrange(HISTORY_DAYS)), training_id)
+        for training_id in range(sets // 20)
+    )
+    rows = [
+        (
+            generator.randrange(exercises),
+            training_id,
+            training_date,
+            generator.randint(1, 15),
+            float(generator.randrange(0, 200, 5)),
+        )
+        for training_date, training_id in (generator.choice(trainings) for _ in range(sets))
+    ]
+    rows.sort(key=itemgetter(0, 2, 1))
+    exercise_ids, training_ids, dates, repetitions, weights = zip(*rows, strict=True)
+    return [
+        np.array(exercise_ids, dtype=PACKED_INT).tobytes(),
+        np.array(training_ids, dtype=PACKED_INT).tobytes(),
+        np.array([day.toordinal() - EPOCH_ORDINAL for day in dates], dtype=PACKED_INT).tobytes(),
+        np.array(repetitions, dtype=PACKED_INT).tobytes(),
+        np.array(weights, dtype=PACKED_FLOAT).tobytes(),
+    ]
+
+
+def measure(step: Callable[[], object], repeats: int) -> tuple[float, float]:
+    timings = []
+    for _ in range(repeats):
+        start = perf_counter()
+        step()
+        timings.append(perf_counter() - start)
+    percentiles = quantiles(timings, n=100)
+    return percentiles[49] * 1000, percentiles[98] * 1000
+
+
+@click.command()
+@click.option("--sets", default=200_000, help="Sets in the history.")
+@click.option("--exercises", default=10, help="Exercises the sets are spread over.")
+@click.option("--repeats", default=50, help="Runs per step.")
+def main(sets: int, exercises: int, repeats: int) -> None:
+    packed = synthetic_history(sets, exercises)
+    columns = SetColumns.from_packed(packed)
+    sessions = session_progress(columns, "epley", 4)
+    click.echo(f"{sets} sets of {exercises} exercises in {len(sessions)} sessions over {HISTORY_DAYS} days")
+    exercise_ids = {str(exercise_id): exercise_id for exercise_id in range(exercises)}
+
+    def respond() -> None:
+        computed = session_progress(SetColumns.from_packed(packed), "epley", 4)
+        progress_response(list(exercise_ids), exercise_ids, computed)
+
+    # The query itself is not included, only the work done in Python on its result.
+    for step_name, step in [
+        ("columns from packed", lambda: SetColumns.from_packed(packed)),
+        ("session aggregates", lambda: session_progress(columns, "epley", 4)),
+        ("sessions to response", lambda: progress_response(list(exercise_ids), exercise_ids, sessions)),
+        ("packed to response", respond),
+    ]:
+        median, p99 = measure(step, repeats)
+        click.echo(f"{step_name:>20}: p50 {median:.1f} ms, p99 {p99:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
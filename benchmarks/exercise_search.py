@@ -0,0 +1,82 @@
+import random
+from collections.abc import Callable
+from pathlib import Path
+from statistics import quantiles
+from time import perf_counter
+
+import click
+
+from fitness_tracker.exercise_catalog import ExerciseIndex
+from fitness_tracker.exercise_database.snapshot import read_snapshot
+from fitness_tracker.models.exercise import Exercise
+
+# The English wger catalog has a little under a thousand exercises.
+CATALOG_SIZE: int = 900
+EQUIPMENT: list[str] = ["Barbell", "Dumbbell", "Cable", "Kettlebell", "Machine", "Band", "Smith Machine", "Bodyweight"]
+MOVEMENTS: list[str] = [
+    "Bench Press", "Incline Press", "Squat", "Front Squat", "Deadlift", "Romanian Deadlift", "Row", "Curl",
+    "Hammer Curl", "Lateral Raise", "Shoulder Press", "Fly", "Lunge", "Hip Thrust", "Pullover", "Shrug",
+    "Triceps Extension", "Kickback", "Calf Raise", "Good Morning", "Pull-ups", "Chin-ups", "Dips", "Push-ups",
+]
+VARIANTS: list[str] = ["", "Narrow Grip", "Wide Grip", "Single Arm", "Seated", "Standing", "Paused"]
+
+
+def synthetic_catalog(size: int) -> list[Exercise]:
+    names = [
+        " ".join(part for part in (equipment, movement, variant) if part)
+        for variant in VARIANTS
+        for equipment in EQUIPMENT
+        for movement in MOVEMENTS
+    ]
+    return [Exercise(exercise_name=name, muscle_group="Chest") for name in names[:size]]
+
+
+def misspell(name: str, generator: random.Random) -> str:
+    characters = list(name.lower())
+    position = generator.randrange(len(characters))
+    del characters[position]
+    return "".join(characters)[: generator.randint(5, len(characters))]
+
+
+def measure(search: Callable[[str], list[Exercise]], queries: list[str]) -> tuple[float, float]:
+    timings = []
+    for query in queries:
+        start = perf_counter()
+        search(query)
+        timings.append(perf_counter() - start)
+    percentiles = quantiles(timings, n=100)
+    return percentiles[49] * 1_000_000, percentiles[98] * 1_000_000
+
+
+@click.command()
+@click.option(
+    "--snapshot",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Catalog exported by fill-exercises --export, a synthetic catalog of the same size is used otherwise.",
+)
+@click.option("--queries", default=5000, help="Number of searches per mode.")
+def main(snapshot: Path | None, queries: int) -> None:
+    if snapshot:
+        exercises = [Exercise(exercise_name=name, muscle_group=group) for name, group in read_snapshot(snapshot)]
+    else:
+        exercises = synthetic_catalog(CATALOG_SIZE)
+
+    start = perf_counter()
+    index = ExerciseIndex(exercises)
+    click.echo(f"Indexed {len(index)} exercises in {(perf_counter() - start) * 1000:.1f} ms")
+
+    generator = random.Random(0)
+    names = [exercise.exercise_name for exercise in exercises]
+    typed = [misspell(generator.choice(names), generator) for _ in range(queries)]
+    prefixes = [generator.choice(names)[: generator.randint(1, 8)] for _ in range(queries)]
+
+    for mode, search, mode_queries in [
+        ("substring", index.search, prefixes),
+        ("fuzzy", index.fuzzy_search, typed),
+    ]:
+        median, p99 = measure(search, mode_queries)
+        click.echo(f"{mode:>9}: p50 {median:.0f} us, p99 {p99:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
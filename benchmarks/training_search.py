@@ -0,0 +1,98 @@
+import os
+from statistics import quantiles
+from time import perf_counter
+
+import click
+from sqlalchemy import Engine, create_engine, inspect, text, tuple_
+from sqlalchemy.orm import Session
+
+from fitness_tracker.configs.pagination import MAX_PAGE_SIZE
+from fitness_tracker.database import Base, to_sync_url
+from fitness_tracker.routers.trainings_router import searched_trainings_statement
+from fitness_tracker.tables import TrainingsTable
+
+SCHEMA: str = "training_search_benchmark"
+TRIGRAM_INDEX: str = "ix_trainings_name_trgm"
+# Common words, a rarer word, a single character, one exact training and a miss.
+QUERIES: list[str] = ["day", "pull", "cardio", "p", "pull day 4321", "missing"]
+SEED_USERS = text("""
+INSERT INTO users (id, username, email, password)
+SELECT user_id, 'benchmark' || user_id, 'benchmark' || user_id || '@example.com', ''
+FROM generate_series(1, :users) AS user_id
+""")
+SEED_TRAININGS = text("""
+INSERT INTO trainings (id, user_id, name, date)
+SELECT
+    (user_id - 1) * :trainings + number,
+    user_id,
+    (ARRAY['Push', 'Pull', 'Legs', 'Upper', 'Lower', 'Full Body', 'Cardio', 'Arms'])[1 + number % 8]
+        || ' ' || (ARRAY['Day', 'Session', 'Workout', 'Heavy', 'Light'])[1 + number / 8 % 5] || ' ' || number,
+    DATE '2020-01-01' + number % 1500
+FROM generate_series(1, :users) AS user_id, generate_series(1, :trainings) AS number
+""")
+
+
+def measure(engine: Engine, user_id: int, characters: str, repeats: int) -> tuple[float, float, int]:
+    statement = searched_trainings_statement(user_id, characters).limit(MAX_PAGE_SIZE + 1)
+    timings = []
+    with Session(engine) as database:
+        for _ in range(repeats):
+            start = perf_counter()
+            page = database.scalars(statement).all()
+            # The second page continues after the last row like a cursor would, as a client scrolling the results.
+            if len(page) > MAX_PAGE_SIZE:
+                last_seen = page[MAX_PAGE_SIZE - 1]
+                database.scalars(statement.where(
+                    tuple_(TrainingsTable.name, TrainingsTable.id) > tuple_(last_seen.name, last_seen.id),
+                )).all()
+            timings.append(perf_counter() - start)
+    percentiles = quantiles(timings, n=100)
+    return percentiles[49] * 1000, percentiles[98] * 1000, len(page)
+
+
+def report(engine: Engine, user_id: int, repeats: int) -> None:
+    for characters in QUERIES:
+        median, p99, matches = measure(engine, user_id, characters, repeats)
+        click.echo(f"{characters!r:>16}: p50 {median:.2f} ms, p99 {p99:.2f} ms, first page {matches} rows")
+
+
+@click.command()
+@click.option("--database-url", default=lambda: os.getenv("DATABASE_URL"), help="Postgres database to benchmark on.")
+@click.option("--users", default=10, help="Users to seed.")
+@click.option("--trainings", default=10_000, help="Trainings per user.")
+@click.option("--repeats", default=200, help="Searches per query.")
+def main(database_url: str, users: int, trainings: int, repeats: int) -> None:
+    # Everything lives in a scratch schema, so the benchmark can run next to real data.
+    engine = create_engine(to_sync_url(database_url), connect_args={"options": f"-csearch_path={SCHEMA}"})
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        connection.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+
+    try:
+        Base.metadata.create_all(bind=engine)
+        start = perf_counter()
+        with engine.begin() as connection:
+            connection.execute(SEED_USERS, {"users": users})
+            connection.execute(SEED_TRAININGS, {"users": users, "trainings": trainings})
+            connection.execute(text("ANALYZE users, trainings"))
+        click.echo(f"Seeded {users} users with {trainings} trainings each in {perf_counter() - start:.1f} s")
+
+        indexes = {index["name"] for index in inspect(engine).get_indexes(TrainingsTable.__tablename__)}
+        if TRIGRAM_INDEX in indexes:
+            click.echo("With the trigram index:")
+            report(engine, users, repeats)
+            with engine.begin() as connection:
+                connection.execute(text(f"DROP INDEX {TRIGRAM_INDEX}"))
+        else:
+            click.echo("pg_trgm is not available, searching through the (user_id, name, id) index only.")
+
+        click.echo("Without the trigram index:")
+        report(engine, users, repeats)
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
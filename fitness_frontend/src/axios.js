@@ -33,6 +33,9 @@ const refreshAccessToken = async () => {
   }
 };
 
+// The API returns the time of each write, sending it back makes the following reads skip lagging replicas.
+const LAST_WRITE_HEADER = "X-Last-Write";
+
 let isRefreshing = false;
 let failedQueue = [];
 
@@ -50,6 +53,11 @@ const processQueue = (error, token = null) => {
 
 axios.interceptors.request.use(
   async (config) => {
+    const lastWrite = localStorage.getItem("last_write");
+    if (lastWrite) {
+      config.headers[LAST_WRITE_HEADER] = lastWrite;
+    }
+
     const accessToken = localStorage.getItem("access_token");
 
     if (accessToken && isTokenExpired(accessToken)) {
@@ -93,4 +101,12 @@ axios.interceptors.request.use(
   }
 );
 
+axios.interceptors.response.use((response) => {
+  const lastWrite = response.headers[LAST_WRITE_HEADER.toLowerCase()];
+  if (lastWrite) {
+    localStorage.setItem("last_write", lastWrite);
+  }
+  return response;
+});
+
 export default axios;
@@ -0,0 +1,152 @@
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import date
+from operator import itemgetter
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+
+OneRepMaxFormula = Literal["epley", "brzycki"]
+# Brzycki's denominator reaches zero at 37 repetitions, such sets fall back to Epley.
+BRZYCKI_MAX_REPETITIONS: int = 36
+
+EPOCH_ORDINAL: int = date(1970, 1, 1).toordinal()
+# Postgres' int4send and float8send write big-endian values, a packed column is a bytea of them.
+PACKED_INT = np.dtype(">i4")
+PACKED_FLOAT = np.dtype(">f8")
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+
+def epley(weights: FloatArray, repetitions: IntArray) -> FloatArray:
+    return weights * (1 + repetitions / 30)
+
+
+def brzycki(weights: FloatArray, repetitions: IntArray) -> FloatArray:
+    valid = repetitions <= BRZYCKI_MAX_REPETITIONS
+    estimate = weights * 36 / (37 - np.where(valid, repetitions, 0))
+    return np.where(valid, estimate, epley(weights, repetitions))
+
+
+ONE_REP_MAX_FORMULAS: dict[str, Callable[[FloatArray, IntArray], FloatArray]] = {
+    "epley": epley,
+    "brzycki": brzycki,
+}
+
+
+@dataclass
+class SetColumns:
+    exercise_ids: IntArray
+    training_ids: IntArray
+    dates: npt.NDArray[np.datetime64]
+    repetitions: IntArray
+    weights: FloatArray
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[tuple[int, int, date, int, float]]) -> "SetColumns":
+        # One pass per column with C-level getters, transposing the rows with zip(*rows) is several times slower.
+        def column(position: int, dtype: type) -> npt.NDArray:
+            return np.fromiter(map(itemgetter(position), rows), dtype=dtype, count=len(rows))
+
+        # Dates go through their ordinals, NumPy converts date objects one by one much more slowly.
+        ordinals = np.fromiter(map(date.toordinal, map(itemgetter(2), rows)), dtype=np.int64, count=len(rows))
+        return cls(
+            exercise_ids=column(0, np.int64),
+            training_ids=column(1, np.int64),
+            dates=(ordinals - EPOCH_ORDINAL).astype("datetime64[D]"),
+            repetitions=column(3, np.int64),
+            weights=column(4, np.float64),
+        )
+
+    @classmethod
+    def from_packed(cls, packed: Sequence[bytes | None]) -> "SetColumns":
+        # Every column arrives as one bytea, read without creating a Python object per set. Dates are sent as days
+        # since the epoch. No matching sets aggregate to NULL.
+        def column(position: int, dtype: np.dtype) -> npt.NDArray:
+            return np.frombuffer(packed[position] or b"", dtype=dtype)
+
+        return cls(
+            exercise_ids=column(0, PACKED_INT).astype(np.int64),
+            training_ids=column(1, PACKED_INT).astype(np.int64),
+            dates=column(2, PACKED_INT).astype("datetime64[D]"),
+            repetitions=column(3, PACKED_INT).astype(np.int64),
+            weights=column(4, PACKED_FLOAT).astype(np.float64),
+        )
+
+
+@dataclass
+class SessionColumns:
+    exercise_ids: IntArray
+    training_ids: IntArray
+    dates: npt.NDArray[np.datetime64]
+    set_counts: IntArray
+    volumes: FloatArray
+    max_weights: FloatArray
+    one_rep_maxes: FloatArray
+    rolling_volumes: FloatArray
+    rolling_one_rep_maxes: FloatArray
+
+    def exercise_slices(self) -> dict[int, slice]:
+        if not len(self):
+            return {}
+
+        starts = group_starts([self.exercise_ids])
+        ends = np.r_[starts[1:], len(self)]
+        return {
+            int(self.exercise_ids[start]): slice(int(start), int(end)) for start, end in zip(starts, ends, strict=True)
+        }
+
+    def __len__(self) -> int:
+        return len(self.exercise_ids)
+
+
+def iso_dates(dates: npt.NDArray[np.datetime64]) -> list[str]:
+    # A history spans a few thousand days at most, each day is formatted once and looked up for every session.
+    if not len(dates):
+        return []
+    days = dates.astype(np.int64)
+    first_day = int(days.min())
+    day_strings = np.datetime_as_string(np.arange(first_day, int(days.max()) + 1).astype("datetime64[D]"))
+    iso: list[str] = day_strings.astype(object)[days - first_day].tolist()
+    return iso
+
+
+def group_starts(keys: list[npt.NDArray]) -> IntArray:
+    changed = np.zeros(len(keys[0]), dtype=bool)
+    if len(changed):
+        changed[0] = True
+    for key in keys:
+        changed[1:] |= key[1:] != key[:-1]
+    return np.flatnonzero(changed)
+
+
+def rolling_means(values: FloatArray, group_ids: IntArray, window: int) -> FloatArray:
+    # Means of the last `window` values within each group, from one cumulative sum instead of a loop per group.
+    positions = np.arange(len(values))
+    first_in_group = group_starts([group_ids])
+    group_first = np.repeat(first_in_group, np.diff(np.r_[first_in_group, len(values)]))
+    window_first = np.maximum(positions + 1 - window, group_first)
+    totals = np.r_[0.0, np.cumsum(values)]
+    means: FloatArray = (totals[positions + 1] - totals[window_first]) / (positions + 1 - window_first)
+    return means
+
+
+def session_progress(columns: SetColumns, formula: OneRepMaxFormula, window: int) -> SessionColumns:
+    # The sets must be ordered by exercise, date and training, every run of equal keys is one session.
+    starts = group_starts([columns.exercise_ids, columns.dates, columns.training_ids])
+    one_rep_maxes = np.maximum.reduceat(ONE_REP_MAX_FORMULAS[formula](columns.weights, columns.repetitions), starts)
+    volumes = np.add.reduceat(columns.repetitions * columns.weights, starts)
+    exercise_ids = columns.exercise_ids[starts]
+    return SessionColumns(
+        exercise_ids=exercise_ids,
+        training_ids=columns.training_ids[starts],
+        dates=columns.dates[starts],
+        set_counts=np.diff(np.r_[starts, len(columns.exercise_ids)]),
+        volumes=volumes,
+        max_weights=np.maximum.reduceat(columns.weights, starts),
+        one_rep_maxes=one_rep_maxes,
+        rolling_volumes=rolling_means(volumes, exercise_ids, window),
+        rolling_one_rep_maxes=rolling_means(one_rep_maxes, exercise_ids, window),
+    )
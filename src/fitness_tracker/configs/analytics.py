@@ -0,0 +1,4 @@
+DEFAULT_ROLLING_WINDOW: int = 4
+MAX_ROLLING_WINDOW: int = 52
+PROGRESS_DECIMALS: int = 2
+MAX_ROLLUP_PERIODS: int = 260
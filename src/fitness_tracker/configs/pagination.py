@@ -0,0 +1,2 @@
+DEFAULT_PAGE_SIZE: int = 5
+MAX_PAGE_SIZE: int = 50
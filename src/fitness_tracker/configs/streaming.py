@@ -0,0 +1,4 @@
+STREAM_BATCH_SIZE: int = 1000
+NDJSON_MEDIA_TYPE: str = "application/x-ndjson"
+CSV_MEDIA_TYPE: str = "text/csv"
+GZIP_ENCODING: str = "gzip"
@@ -1,9 +1,20 @@
 import os
+from collections.abc import AsyncGenerator
+from typing import Annotated, Any
 
 from dotenv import load_dotenv
+from fastapi import Depends, Request
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker  # type: ignore[attr-defined]
 
+from fitness_tracker.pool_monitor import InstrumentedAsyncQueuePool, PoolMonitor
+from fitness_tracker.query_timing import finish_timing, start_timing
+from fitness_tracker.replicas import REPLICA_BIND_KEY, RecentWrites, ReplicaRouter, RoutingSession
+
 load_dotenv()
 
 SQLALCHEMY_DATABASE_URL: str | None = os.getenv("DATABASE_URL")
@@ -11,8 +22,127 @@ if not SQLALCHEMY_DATABASE_URL:
     msg = "There is no database url"
     raise ValueError(msg)
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+ASYNC_DRIVERS: dict[str, str] = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+SYNC_DRIVERS: dict[str, str] = {"postgresql": "psycopg2", "sqlite": "pysqlite"}
+
+POOL_SIZE: int = int(os.getenv("DATABASE_POOL_SIZE", "5"))
+POOL_MAX_OVERFLOW: int = int(os.getenv("DATABASE_POOL_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT: float = float(os.getenv("DATABASE_POOL_TIMEOUT", "30"))
+POOL_RECYCLE: int = int(os.getenv("DATABASE_POOL_RECYCLE", "1800"))
+POOL_PRE_PING: bool = os.getenv("DATABASE_POOL_PRE_PING", "true").lower() in {"1", "true", "yes"}
+
+REPLICA_URLS: list[str] = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+REPLICA_RETRY_SECONDS: float = float(os.getenv("DATABASE_REPLICA_RETRY_SECONDS", "30"))
+REPLICA_CHECK_SECONDS: float = float(os.getenv("DATABASE_REPLICA_CHECK_SECONDS", "2"))
+REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("DATABASE_REPLICA_MAX_LAG_SECONDS", "2"))
+READ_YOUR_WRITES_SECONDS: float = float(os.getenv("DATABASE_READ_YOUR_WRITES_SECONDS", "5"))
+READ_ONLY_OPTIONS: dict[str, bool] = {"postgresql_readonly": True}
+DIALECT_INSERTS: dict[str, Any] = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _with_driver(url: str, drivers: dict[str, str]) -> str:
+    database_url = make_url(url)
+    backend = database_url.get_backend_name()
+    if backend not in drivers:
+        msg = f"Unsupported database backend: {backend}"
+        raise ValueError(msg)
+
+    return database_url.set(drivername=f"{backend}+{drivers[backend]}").render_as_string(hide_password=False)
+
+
+def to_async_url(url: str) -> str:
+    return _with_driver(url, ASYNC_DRIVERS)
+
+
+def to_sync_url(url: str) -> str:
+    return _with_driver(url, SYNC_DRIVERS)
+
+
+def pool_options(url: str) -> dict[str, Any]:
+    database_url = make_url(url)
+    if database_url.get_backend_name() == "sqlite" and database_url.database in {None, "", ":memory:"}:
+        # In-memory SQLite lives inside a single connection, so it keeps its static pool.
+        return {}
+
+    return {
+        "pool_size": POOL_SIZE,
+        "max_overflow": POOL_MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_pre_ping": POOL_PRE_PING,
+    }
+
+
+def create_monitored_async_engine(url: str, monitor: PoolMonitor) -> AsyncEngine:
+    options = pool_options(url)
+    if options:
+        options["poolclass"] = InstrumentedAsyncQueuePool
+
+    monitored_engine = create_async_engine(to_async_url(url), **options)
+    monitor.attach(monitored_engine)
+    return monitored_engine
+
+
+pool_monitor = PoolMonitor()
+
+engine = create_engine(to_sync_url(SQLALCHEMY_DATABASE_URL), **pool_options(SQLALCHEMY_DATABASE_URL))
+async_engine = create_monitored_async_engine(SQLALCHEMY_DATABASE_URL, pool_monitor)
+
+replica_router = ReplicaRouter(
+    [create_async_engine(to_async_url(url), **pool_options(url)) for url in REPLICA_URLS],
+    retry_seconds=REPLICA_RETRY_SECONDS,
+    max_lag_seconds=REPLICA_MAX_LAG_SECONDS,
+)
+recent_writes = RecentWrites(window_seconds=READ_YOUR_WRITES_SECONDS)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    sync_session_class=RoutingSession,
+)
 
 Base = declarative_base()
+
+
+async def get_database() -> AsyncGenerator:
+    timing_token = start_timing()
+    try:
+        async with AsyncSessionLocal() as database:
+            yield database
+    finally:
+        finish_timing(timing_token)
+
+
+database_dependency = Annotated[AsyncSession, Depends(get_database)]
+
+
+def get_replica_router() -> ReplicaRouter:
+    return replica_router
+
+
+async def get_read_only_database(
+    request: Request,
+    database: database_dependency,
+    router: Annotated[ReplicaRouter, Depends(get_replica_router)],
+) -> AsyncSession:
+    replica = None if recent_writes.is_recent(request) else router.choose()
+
+    if replica is not None:
+        database.info[REPLICA_BIND_KEY] = replica.sync_engine
+        try:
+            # Postgres starts the transaction with BEGIN READ ONLY, the option is reset when the connection is returned.
+            await database.connection(execution_options=READ_ONLY_OPTIONS)
+        except (DBAPIError, OSError):
+            router.mark_unhealthy(replica)
+            await database.rollback()
+            del database.info[REPLICA_BIND_KEY]
+        else:
+            return database
+
+    await database.connection(execution_options=READ_ONLY_OPTIONS)
+    return database
+
+
+read_only_database_dependency = Annotated[AsyncSession, Depends(get_read_only_database)]
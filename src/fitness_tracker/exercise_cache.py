@@ -0,0 +1,87 @@
+import os
+from collections import OrderedDict
+from math import inf
+from time import monotonic
+
+from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fitness_tracker.exercise_catalog import CATALOG_REFRESH_SECONDS, fetch_catalog_version
+from fitness_tracker.models.exercise_cache_statistics import ExerciseCacheStatistics
+from fitness_tracker.tables.exercise_table import ExerciseTable
+
+load_dotenv()
+
+EXERCISE_CACHE_SIZE: int = int(os.getenv("EXERCISE_CACHE_SIZE", "4096"))
+
+
+class ExerciseIdCache:
+    def __init__(self, max_size: int, refresh_seconds: float) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._max_size = max_size
+        self._ids: OrderedDict[str, int] = OrderedDict()
+        self._version: int | None = None
+        self._checked_at = -inf
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    async def resolve(self, database: AsyncSession, exercise_names: set[str]) -> dict[str, int]:
+        await self._check_version(database)
+
+        exercise_ids: dict[str, int] = {}
+        for exercise_name in exercise_names:
+            if exercise_name in self._ids:
+                self._ids.move_to_end(exercise_name)
+                exercise_ids[exercise_name] = self._ids[exercise_name]
+
+        missing = exercise_names - exercise_ids.keys()
+        self._hits += len(exercise_ids)
+        self._misses += len(missing)
+        if missing:
+            # Unknown names are not cached, they are rejected by the caller and may be added by the next fill.
+            exercises = await database.execute(
+                select(ExerciseTable.exercise_name, ExerciseTable.id).where(ExerciseTable.exercise_name.in_(missing)),
+            )
+            for exercise_name, exercise_id in exercises.tuples():
+                exercise_ids[exercise_name] = exercise_id
+                self._store(exercise_name, exercise_id)
+        return exercise_ids
+
+    async def _check_version(self, database: AsyncSession) -> None:
+        now = monotonic()
+        if now - self._checked_at < self.refresh_seconds:
+            return
+
+        version = await fetch_catalog_version(database)
+        self._checked_at = now
+        if version != self._version:
+            if self._ids:
+                self._invalidations += 1
+            self._ids.clear()
+            self._version = version
+
+    def _store(self, exercise_name: str, exercise_id: int) -> None:
+        self._ids[exercise_name] = exercise_id
+        self._ids.move_to_end(exercise_name)
+        while len(self._ids) > self._max_size:
+            self._ids.popitem(last=False)
+
+    def statistics(self) -> ExerciseCacheStatistics:
+        return ExerciseCacheStatistics(
+            size=len(self._ids),
+            max_size=self._max_size,
+            version=self._version,
+            hits=self._hits,
+            misses=self._misses,
+            invalidations=self._invalidations,
+        )
+
+    def reset(self) -> None:
+        self._ids.clear()
+        self._version = None
+        self._checked_at = -inf
+
+
+exercise_id_cache = ExerciseIdCache(max_size=EXERCISE_CACHE_SIZE, refresh_seconds=CATALOG_REFRESH_SECONDS)
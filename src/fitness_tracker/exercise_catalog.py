@@ -0,0 +1,204 @@
+import heapq
+import os
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from math import inf
+from time import monotonic
+from typing import Literal, cast
+
+from dotenv import load_dotenv
+from sqlalchemy import CursorResult, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from fitness_tracker.models.exercise import Exercise
+from fitness_tracker.muscles import fetch_muscle_bits, muscle_mask
+from fitness_tracker.tables.catalog_version_table import CatalogVersionTable
+from fitness_tracker.tables.exercise_table import ExerciseTable
+
+load_dotenv()
+
+MEMORY_BACKEND: str = "memory"
+DATABASE_BACKEND: str = "database"
+SEARCH_BACKEND: str = os.getenv("EXERCISE_SEARCH_BACKEND", MEMORY_BACKEND).lower()
+if SEARCH_BACKEND not in {MEMORY_BACKEND, DATABASE_BACKEND}:
+    msg = f"Unsupported exercise search backend: {SEARCH_BACKEND}"
+    raise ValueError(msg)
+
+CATALOG_REFRESH_SECONDS: float = float(os.getenv("EXERCISE_CATALOG_REFRESH_SECONDS", "30"))
+EXERCISE_CATALOG: str = "exercise"
+SEARCH_LIMIT: int = 5
+NGRAM_SIZE: int = 3
+
+# Share of trigrams two normalized names have in common before a fuzzy match is returned, like pg_trgm's default.
+FUZZY_THRESHOLD: float = 0.3
+FUZZY_MODE: str = "fuzzy"
+SearchMode = Literal["substring", "fuzzy"]
+
+NAME_PREFIX_RANK: int = 0
+WORD_PREFIX_RANK: int = 1
+INFIX_RANK: int = 2
+
+
+def ngrams(text: str, size: int) -> set[str]:
+    return {text[start:start + size] for start in range(len(text) - size + 1)}
+
+
+def fuzzy_trigrams(text: str) -> set[str]:
+    # Spaces and punctuation are dropped, so "benchpress" and "bench-press" compare equal to "Bench Press".
+    normalized = "".join(character for character in text.casefold() if character.isalnum())
+    return ngrams(f"  {normalized} ", NGRAM_SIZE) if normalized else set()
+
+
+class ExerciseIndex:
+    def __init__(
+        self,
+        exercises: list[Exercise],
+        muscle_masks: dict[str, int] | None = None,
+        muscle_bits: dict[str, int] | None = None,
+    ) -> None:
+        # Positions follow name order, so the position doubles as the tie-breaker between equally ranked matches.
+        self._exercises = sorted(
+            exercises,
+            key=lambda exercise: (exercise.exercise_name.casefold(), exercise.exercise_name),
+        )
+        self._names = [exercise.exercise_name.casefold() for exercise in self._exercises]
+        self._masks = [(muscle_masks or {}).get(exercise.exercise_name, 0) for exercise in self._exercises]
+        self._muscle_bits = muscle_bits or {}
+
+        postings: defaultdict[str, list[int]] = defaultdict(list)
+        for position, name in enumerate(self._names):
+            for gram in set().union(*(ngrams(name, size) for size in range(1, NGRAM_SIZE + 1))):
+                postings[gram].append(position)
+        self._postings: dict[str, list[int]] = dict(postings)
+
+        fuzzy_postings: defaultdict[str, list[int]] = defaultdict(list)
+        self._fuzzy_sizes: list[int] = []
+        for position, exercise in enumerate(self._exercises):
+            trigrams = fuzzy_trigrams(exercise.exercise_name)
+            self._fuzzy_sizes.append(len(trigrams))
+            for trigram in trigrams:
+                fuzzy_postings[trigram].append(position)
+        self._fuzzy_postings: dict[str, list[int]] = dict(fuzzy_postings)
+
+    def __len__(self) -> int:
+        return len(self._exercises)
+
+    def muscle_mask(self, muscle_names: Iterable[str]) -> int:
+        return muscle_mask(muscle_names, self._muscle_bits)
+
+    def search(self, characters: str, limit: int = SEARCH_LIMIT, required_mask: int = 0) -> list[Exercise]:
+        query = characters.casefold()
+        # Shared n-grams do not guarantee the whole query is there, longer queries are checked against the name.
+        matches = [
+            position for position in self._candidates(query)
+            if query in self._names[position] and self._masks[position] & required_mask == required_mask
+        ]
+        best = heapq.nsmallest(limit, matches, key=lambda position: (self._rank(position, query), position))
+        return [self._exercises[position] for position in best]
+
+    def fuzzy_search(self, characters: str, limit: int = SEARCH_LIMIT, required_mask: int = 0) -> list[Exercise]:
+        trigrams = fuzzy_trigrams(characters)
+        if not trigrams:
+            return self.search(characters, limit, required_mask)
+
+        shared: Counter[int] = Counter()
+        for trigram in trigrams:
+            shared.update(self._fuzzy_postings.get(trigram, ()))
+
+        scored = []
+        for position, overlap in shared.items():
+            similarity = overlap / (len(trigrams) + self._fuzzy_sizes[position] - overlap)
+            if similarity >= FUZZY_THRESHOLD and self._masks[position] & required_mask == required_mask:
+                scored.append((-similarity, position))
+        return [self._exercises[position] for _, position in heapq.nsmallest(limit, scored)]
+
+    def _candidates(self, query: str) -> Iterable[int]:
+        if not query:
+            return range(len(self._names))
+
+        grams = sorted(
+            (self._postings.get(gram, []) for gram in ngrams(query, min(len(query), NGRAM_SIZE))),
+            key=len,
+        )
+        return set(grams[0]).intersection(*grams[1:])
+
+    def _rank(self, position: int, query: str) -> int:
+        name = self._names[position]
+        if name.startswith(query):
+            return NAME_PREFIX_RANK
+
+        start = name.find(query)
+        while start != -1:
+            if not name[start - 1].isalnum():
+                return WORD_PREFIX_RANK
+            start = name.find(query, start + 1)
+        return INFIX_RANK
+
+
+class ExerciseCatalog:
+    def __init__(self, refresh_seconds: float) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._index: ExerciseIndex | None = None
+        self._version: int | None = None
+        self._checked_at = -inf
+
+    async def search(
+        self,
+        database: AsyncSession,
+        characters: str,
+        muscles: Iterable[str] = (),
+        mode: SearchMode = "substring",
+        limit: int = SEARCH_LIMIT,
+    ) -> list[Exercise]:
+        index = await self.current_index(database)
+        search = index.fuzzy_search if mode == FUZZY_MODE else index.search
+        return search(characters, limit, index.muscle_mask(muscles))
+
+    async def current_index(self, database: AsyncSession) -> ExerciseIndex:
+        now = monotonic()
+        if self._index is not None and now - self._checked_at < self.refresh_seconds:
+            return self._index
+
+        version = await fetch_catalog_version(database)
+        self._checked_at = now
+        if self._index is None or version != self._version:
+            return await self.load(database, version)
+        return self._index
+
+    async def load(self, database: AsyncSession, version: int) -> ExerciseIndex:
+        exercises = (await database.execute(
+            select(ExerciseTable.exercise_name, ExerciseTable.muscle_group, ExerciseTable.muscle_mask),
+        )).all()
+        index = ExerciseIndex(
+            [Exercise(exercise_name=name, muscle_group=muscle_group) for name, muscle_group, _ in exercises],
+            muscle_masks={name: mask for name, _, mask in exercises},
+            muscle_bits=await fetch_muscle_bits(database),
+        )
+        # Searches in flight keep the index they started with, the new one is swapped in with a single assignment.
+        self._index, self._version = index, version
+        return index
+
+    def reset(self) -> None:
+        self._index = None
+        self._version = None
+        self._checked_at = -inf
+
+
+async def fetch_catalog_version(database: AsyncSession, name: str = EXERCISE_CATALOG) -> int:
+    version = await database.scalar(select(CatalogVersionTable.version).where(CatalogVersionTable.name == name))
+    return version or 0
+
+
+def bump_catalog_version(db: Session, name: str = EXERCISE_CATALOG) -> None:
+    # Executing an update returns a cursor result, which is the one that carries the row count.
+    bumped = cast("CursorResult", db.execute(
+        update(CatalogVersionTable).where(CatalogVersionTable.name == name).values(
+            version=CatalogVersionTable.version + 1,
+        ),
+    ))
+    if bumped.rowcount == 0:
+        db.add(CatalogVersionTable(name=name, version=1))
+
+
+exercise_catalog = ExerciseCatalog(refresh_seconds=CATALOG_REFRESH_SECONDS)
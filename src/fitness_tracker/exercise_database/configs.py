@@ -4,3 +4,6 @@ NEXT_PAGE: str = "next"
 MUSCLES: str = "muscles"
 MUSCLE_ID: str = "id"
 LANGUAGE: str = "name_en"
+COUNT: str = "count"
+LIMIT: str = "limit"
+OFFSET: str = "offset"
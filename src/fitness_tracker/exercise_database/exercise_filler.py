@@ -1,65 +1,102 @@
-from collections.abc import Generator
-
+import os
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import click
 import requests
 from starlette import status
 
 import fitness_tracker.exercise_database.configs as config
 from fitness_tracker.database import SessionLocal
-from fitness_tracker.tables.exercise_table import ExerciseTable
+from fitness_tracker.exercise_database.exercise_writer import upsert_exercises
+from fitness_tracker.exercise_database.snapshot import export_snapshot, import_snapshot
 
 MUSCLE_URL: str = "https://wger.de/api/v2/muscle"
 EXERCISE_URL: str = "https://wger.de/api/v2/exercise/?language=2"
+FETCH_WORKERS: int = int(os.getenv("FILL_EXERCISES_WORKERS", "8"))
 
 
-def fetch_muscles(url: str = MUSCLE_URL) -> dict[int, str]:
-    muscle_response = requests.get(url, timeout=10)
-    if muscle_response.status_code != status.HTTP_200_OK:
-        msg = "Couldn't get muscles response."
+def fetch_page(url: str) -> dict[str, Any]:
+    response = requests.get(url, timeout=10)
+    if response.status_code != status.HTTP_200_OK:
+        msg = f"Couldn't get response for {url}."
         raise requests.exceptions.ConnectionError(msg)
+    page: dict[str, Any] = response.json()
+    return page
 
-    muscle_data = muscle_response.json()[config.RESULTS]
-    return {muscle[config.MUSCLE_ID]: muscle.get(config.LANGUAGE, "Unknown") for muscle in muscle_data}
-
-
-def fetch_exercises(muscle_map: dict[int, str], url: str = EXERCISE_URL) -> dict[str, list[str]]:
-    results: dict[str, list[str]] = {}
-    while url:
-        exercise_response = requests.get(url, timeout=10)
-        if exercise_response.status_code != status.HTTP_200_OK:
-            break
-
-        exercise_data = exercise_response.json()[config.RESULTS]
-        for exercise in exercise_data:
-            muscle_names = [muscle_map.get(muscle_id, "Unknown") for muscle_id in exercise[config.MUSCLES]]
-            muscle_names = [muscle for muscle in muscle_names if muscle and muscle != "Unknown"]
-
-            if muscle_names:
-                results[exercise[config.EXERCISE_NAME]] = muscle_names
 
-        url = exercise_response.json()[config.NEXT_PAGE]
-    return results
-
-
-def get_database() -> Generator:
-    database = SessionLocal()
-    try:
-        yield database
-    finally:
-        database.close()
-
-
-def main() -> None:
-    db = next(get_database())
-
-    muscle_map = fetch_muscles()
-    exercises = fetch_exercises(muscle_map)
+def fetch_muscles(url: str = MUSCLE_URL) -> dict[int, str]:
+    muscle_data = fetch_page(url)[config.RESULTS]
+    return {muscle[config.MUSCLE_ID]: muscle.get(config.LANGUAGE, "Unknown") for muscle in muscle_data}
 
-    for exercise_name, muscle_groups in exercises.items():
-        muscle_group_str = ", ".join(muscle_groups)
 
-        exercise_record = ExerciseTable(exercise_name=exercise_name, muscle_group=muscle_group_str)
-        db.add(exercise_record)
-        db.commit()
+def page_urls(url: str, count: int, page_size: int) -> list[str]:
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    return [
+        urlunsplit(parts._replace(query=urlencode({**query, config.LIMIT: page_size, config.OFFSET: offset})))
+        for offset in range(page_size, count, page_size)
+    ]
+
+
+def parse_exercises(page: dict[str, Any], muscle_map: dict[int, str]) -> Iterator[tuple[str, str]]:
+    for exercise in page[config.RESULTS]:
+        muscle_names = [muscle_map.get(muscle_id, "Unknown") for muscle_id in exercise[config.MUSCLES]]
+        muscle_names = [muscle for muscle in muscle_names if muscle and muscle != "Unknown"]
+
+        if muscle_names:
+            yield exercise[config.EXERCISE_NAME], ", ".join(muscle_names)
+
+
+def fetch_exercises(
+    muscle_map: dict[int, str],
+    url: str = EXERCISE_URL,
+    workers: int = FETCH_WORKERS,
+) -> Iterator[tuple[str, str]]:
+    first_page = fetch_page(url)
+    yield from parse_exercises(first_page, muscle_map)
+
+    page_size = len(first_page[config.RESULTS])
+    if not page_size or not first_page[config.NEXT_PAGE]:
+        return
+
+    # The first page tells how many exercises there are, so the remaining pages are fetched side by side.
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fill-exercises") as executor:
+        for page in executor.map(fetch_page, page_urls(url, first_page[config.COUNT], page_size)):
+            yield from parse_exercises(page, muscle_map)
+
+
+@click.command()
+@click.option(
+    "--export",
+    "export_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write the exercises from the database to a gzip snapshot.",
+)
+@click.option(
+    "--import",
+    "import_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Fill the exercises from a gzip snapshot instead of the WGER API.",
+)
+def main(export_path: Path | None, import_path: Path | None) -> None:
+    if export_path and import_path:
+        msg = "Use either --export or --import."
+        raise click.UsageError(msg)
+
+    with SessionLocal() as db:
+        if export_path:
+            click.echo(f"Exported {export_snapshot(db, export_path)} exercises.")
+        elif import_path:
+            click.echo(f"Updated {import_snapshot(db, import_path)} exercises.")
+        else:
+            muscle_map = fetch_muscles()
+            muscle_names = [muscle for muscle in muscle_map.values() if muscle and muscle != "Unknown"]
+            updated = upsert_exercises(db, fetch_exercises(muscle_map), muscle_names=muscle_names)
+            click.echo(f"Updated {updated} exercises.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,76 @@
+import os
+from collections.abc import Iterable
+from itertools import chain, islice
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, insert, or_, select
+from sqlalchemy.orm import Session
+
+from fitness_tracker.database import DIALECT_INSERTS
+from fitness_tracker.exercise_catalog import bump_catalog_version
+from fitness_tracker.muscles import MAX_MUSCLES, muscle_mask, split_muscle_group
+from fitness_tracker.tables.exercise_table import ExerciseTable
+from fitness_tracker.tables.muscle_table import MuscleTable
+
+UPSERT_BATCH_SIZE: int = int(os.getenv("FILL_EXERCISES_BATCH_SIZE", "500"))
+
+
+def load_muscle_bits(db: Session) -> dict[str, int]:
+    return {muscle_name.casefold(): bit for muscle_name, bit in db.execute(select(MuscleTable.name, MuscleTable.bit))}
+
+
+def add_muscles(db: Session, muscle_bits: dict[str, int], muscle_names: Iterable[str]) -> int:
+    new_muscles: list[dict[str, Any]] = []
+    for muscle_name in muscle_names:
+        if muscle_name.casefold() in muscle_bits:
+            continue
+
+        bit = max(muscle_bits.values(), default=-1) + 1
+        if bit >= MAX_MUSCLES:
+            msg = f"Cannot store more than {MAX_MUSCLES} muscles in the muscle mask"
+            raise ValueError(msg)
+        muscle_bits[muscle_name.casefold()] = bit
+        new_muscles.append({"name": muscle_name, "bit": bit})
+
+    if new_muscles:
+        db.execute(insert(MuscleTable), new_muscles)
+    return len(new_muscles)
+
+
+def upsert_exercises(
+    db: Session,
+    exercises: Iterable[tuple[str, str]],
+    batch_size: int = UPSERT_BATCH_SIZE,
+    muscle_names: Iterable[str] = (),
+) -> int:
+    dialect_insert = DIALECT_INSERTS[db.get_bind().dialect.name]
+    muscle_bits = load_muscle_bits(db)
+    added_muscles = add_muscles(db, muscle_bits, muscle_names)
+
+    exercises = iter(exercises)
+    written = 0
+    while batch := dict(islice(exercises, batch_size)):
+        muscle_groups = {name: split_muscle_group(muscle_group) for name, muscle_group in batch.items()}
+        added_muscles += add_muscles(db, muscle_bits, chain.from_iterable(muscle_groups.values()))
+
+        statement = dialect_insert(ExerciseTable).values([
+            {
+                "exercise_name": exercise_name,
+                "muscle_group": muscle_group,
+                "muscle_mask": muscle_mask(muscle_groups[exercise_name], muscle_bits),
+            }
+            for exercise_name, muscle_group in batch.items()
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=[ExerciseTable.exercise_name],
+            set_={"muscle_group": statement.excluded.muscle_group, "muscle_mask": statement.excluded.muscle_mask},
+            where=or_(
+                ExerciseTable.muscle_group != statement.excluded.muscle_group,
+                ExerciseTable.muscle_mask != statement.excluded.muscle_mask,
+            ),
+        )
+        written += cast("CursorResult", db.execute(statement)).rowcount
+    if written or added_muscles:
+        bump_catalog_version(db)
+    db.commit()
+    return written
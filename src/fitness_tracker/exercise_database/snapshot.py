@@ -0,0 +1,60 @@
+import gzip
+import json
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from fitness_tracker.exercise_database.exercise_writer import upsert_exercises
+from fitness_tracker.tables.exercise_table import ExerciseTable
+
+EXERCISE_NAME: str = "exercise_name"
+MUSCLE_GROUP: str = "muscle_group"
+
+
+def export_snapshot(db: Session, path: Path) -> int:
+    exercises = db.execute(
+        select(ExerciseTable.exercise_name, ExerciseTable.muscle_group).order_by(ExerciseTable.exercise_name),
+    )
+    written = 0
+    temporary_path = path.with_name(f"{path.name}.tmp")
+    # mtime=0 keeps snapshots of the same catalog byte for byte identical.
+    with temporary_path.open("wb") as raw_file, gzip.GzipFile(fileobj=raw_file, mode="wb", mtime=0) as snapshot:
+        for exercise_name, muscle_group in exercises:
+            line = json.dumps({EXERCISE_NAME: exercise_name, MUSCLE_GROUP: muscle_group}, ensure_ascii=False)
+            snapshot.write(f"{line}\n".encode())
+            written += 1
+    temporary_path.replace(path)
+    return written
+
+
+def read_snapshot(path: Path) -> Iterator[tuple[str, str]]:
+    with gzip.open(path, "rt", encoding="utf-8") as snapshot:
+        for line in snapshot:
+            if line.strip():
+                exercise = json.loads(line)
+                yield exercise[EXERCISE_NAME], exercise[MUSCLE_GROUP]
+
+
+def changed_exercises(db: Session, exercises: Iterable[tuple[str, str]]) -> Iterator[tuple[str, str]]:
+    current: dict[str, str] = {}
+    # Rows stored before muscle masks existed are rewritten even when their muscle group is unchanged.
+    unmasked: set[str] = set()
+    for exercise_name, muscle_group, muscle_mask in db.execute(
+        select(ExerciseTable.exercise_name, ExerciseTable.muscle_group, ExerciseTable.muscle_mask),
+    ):
+        current[exercise_name] = muscle_group
+        if not muscle_mask:
+            unmasked.add(exercise_name)
+
+    for exercise_name, muscle_group in exercises:
+        if current.get(exercise_name) != muscle_group or exercise_name in unmasked:
+            current[exercise_name] = muscle_group
+            unmasked.discard(exercise_name)
+            yield exercise_name, muscle_group
+
+
+def import_snapshot(db: Session, path: Path) -> int:
+    # Exercises missing from the snapshot are kept, deleting them would cascade to the sets that use them.
+    return upsert_exercises(db, changed_exercises(db, read_snapshot(path)))
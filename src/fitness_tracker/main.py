@@ -1,28 +1,45 @@
+import asyncio
 import os
-from collections.abc import Generator
-from typing import Annotated
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 import click
 import uvicorn
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
 
 from fitness_tracker import tables
-from fitness_tracker.database import SessionLocal, engine
+from fitness_tracker.database import REPLICA_CHECK_SECONDS, AsyncSessionLocal, engine, replica_router
+from fitness_tracker.exercise_catalog import MEMORY_BACKEND, SEARCH_BACKEND, exercise_catalog
+from fitness_tracker.replicas import LAST_WRITE_HEADER
+from fitness_tracker.routers.analytics_router import analytics_router
 from fitness_tracker.routers.authorization_router import authorization_router
 from fitness_tracker.routers.exercise_router import exercise_router
+from fitness_tracker.routers.internal_router import internal_router
 from fitness_tracker.routers.profiles_router import profiles_router
 from fitness_tracker.routers.trainings_router import trainings_router
 
 load_dotenv()
 
-fitness_app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    if SEARCH_BACKEND == MEMORY_BACKEND:
+        async with AsyncSessionLocal() as database:
+            await exercise_catalog.current_index(database)
+    replica_monitor = asyncio.create_task(replica_router.monitor(REPLICA_CHECK_SECONDS))
+    yield
+    replica_monitor.cancel()
+
+
+fitness_app = FastAPI(lifespan=lifespan)
 fitness_app.include_router(authorization_router)
 fitness_app.include_router(profiles_router)
 fitness_app.include_router(trainings_router)
 fitness_app.include_router(exercise_router)
+fitness_app.include_router(internal_router)
+fitness_app.include_router(analytics_router)
 
 tables.Base.metadata.create_all(bind=engine)
 
@@ -37,20 +54,11 @@ fitness_app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # The frontend reads the time of its last write and sends it back with the following reads.
+    expose_headers=[LAST_WRITE_HEADER],
 )
 
 
-def get_database() -> Generator:
-    database = SessionLocal()
-    try:
-        yield database
-    finally:
-        database.close()
-
-
-database_dependency = Annotated[Session, Depends(get_database)]
-
-
 @click.command()
 @click.option("--host", default="127.0.0.1", help="Host to run the server on.")
 @click.option("--port", default=8000, type=int, help="Port to run the server on.")
@@ -0,0 +1,41 @@
+from bisect import bisect_left
+from threading import Lock
+
+from fitness_tracker.models.histogram_snapshot import HistogramSnapshot
+
+DEFAULT_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class LatencyHistogram:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self._buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+        self._lock = Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._counts[bisect_left(self._buckets, seconds)] += 1
+            self._total_seconds += seconds
+            self._max_seconds = max(self._max_seconds, seconds)
+
+    def snapshot(self) -> HistogramSnapshot:
+        with self._lock:
+            counts = list(self._counts)
+            total_seconds = self._total_seconds
+            max_seconds = self._max_seconds
+
+        buckets: dict[str, int] = {}
+        cumulative = 0
+        for bound, count in zip(self._buckets, counts, strict=False):
+            cumulative += count
+            buckets[f"le_{bound}"] = cumulative
+        buckets["le_inf"] = cumulative + counts[-1]
+
+        return HistogramSnapshot(
+            count=buckets["le_inf"],
+            total_seconds=total_seconds,
+            max_seconds=max_seconds,
+            buckets=buckets,
+        )
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class ExerciseCacheStatistics(BaseModel):
+    size: int
+    max_size: int
+    version: int | None
+    hits: int
+    misses: int
+    invalidations: int
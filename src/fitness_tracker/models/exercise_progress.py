@@ -0,0 +1,15 @@
+import datetime
+
+from pydantic import BaseModel
+
+
+class ExerciseProgress(BaseModel):
+    exercise_name: str
+    training_ids: list[int]
+    dates: list[datetime.date]
+    set_counts: list[int]
+    volumes: list[float]
+    max_weights: list[float]
+    estimated_one_rep_maxes: list[float]
+    rolling_volumes: list[float]
+    rolling_one_rep_maxes: list[float]
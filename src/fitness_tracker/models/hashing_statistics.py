@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+from fitness_tracker.models.histogram_snapshot import HistogramSnapshot
+
+
+class HashingStatistics(BaseModel):
+    workers: int
+    max_pending: int
+    in_flight: int
+    queue_depth: int
+    rejected: int
+    latency: HistogramSnapshot
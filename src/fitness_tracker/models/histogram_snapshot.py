@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class HistogramSnapshot(BaseModel):
+    count: int
+    total_seconds: float
+    max_seconds: float
+    buckets: dict[str, int]
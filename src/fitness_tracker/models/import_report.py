@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class ImportLineError(BaseModel):
+    line: int
+    detail: str
+
+
+class ImportReport(BaseModel):
+    imported_trainings: int = 0
+    imported_sets: int = 0
+    errors: list[ImportLineError] = []
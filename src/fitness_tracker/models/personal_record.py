@@ -0,0 +1,15 @@
+import datetime
+
+from pydantic import BaseModel
+
+
+class PersonalRecord(BaseModel):
+    exercise_name: str
+    max_weight: float
+    max_weight_repetitions: int
+    max_weight_date: datetime.date
+    best_one_rep_max: float
+    best_one_rep_max_date: datetime.date
+    best_session_volume: float
+    best_session_training_id: int
+    best_session_date: datetime.date
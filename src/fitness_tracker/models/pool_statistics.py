@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+from fitness_tracker.models.histogram_snapshot import HistogramSnapshot
+
+
+class PoolStatistics(BaseModel):
+    pool_class: str
+    pool_size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    connections_created: int
+    connections_created_last_minute: int
+    checkout_wait: HistogramSnapshot
@@ -7,3 +7,7 @@ class Training(BaseModel):
     training_id: int
     training_name: str
     date: datetime.date
+    set_count: int
+    total_volume: float
+    exercise_count: int
+    top_muscles: str
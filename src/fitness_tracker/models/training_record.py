@@ -0,0 +1,12 @@
+import datetime
+
+from pydantic import BaseModel
+
+from fitness_tracker.models.exercise_set import ExerciseSet
+
+
+class TrainingRecord(BaseModel):
+    training_id: int | None = None
+    training_name: str
+    date: datetime.date
+    sets: list[ExerciseSet]
@@ -0,0 +1,17 @@
+import datetime
+
+from pydantic import BaseModel
+
+
+class MuscleLoad(BaseModel):
+    muscle: str
+    set_count: int
+    volume: float
+
+
+class TrainingRollup(BaseModel):
+    period_start: datetime.date
+    training_count: int
+    set_count: int
+    total_volume: float
+    muscles: list[MuscleLoad]
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+from fitness_tracker.models.training import Training
+
+
+class TrainingsPage(BaseModel):
+    trainings: list[Training]
+    next_cursor: str | None = None
@@ -0,0 +1,33 @@
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fitness_tracker.tables.muscle_table import MuscleTable
+
+MAX_MUSCLES: int = 63
+MUSCLE_SEPARATOR: str = ","
+
+
+class UnknownMuscleError(ValueError):
+    pass
+
+
+def split_muscle_group(muscle_group: str) -> list[str]:
+    return [muscle.strip() for muscle in muscle_group.split(MUSCLE_SEPARATOR) if muscle.strip()]
+
+
+def muscle_mask(muscle_names: Iterable[str], muscle_bits: dict[str, int]) -> int:
+    mask = 0
+    for muscle_name in muscle_names:
+        bit = muscle_bits.get(muscle_name.casefold())
+        if bit is None:
+            msg = f"Muscle {muscle_name} does not exist in database"
+            raise UnknownMuscleError(msg)
+        mask |= 1 << bit
+    return mask
+
+
+async def fetch_muscle_bits(database: AsyncSession) -> dict[str, int]:
+    muscles = await database.execute(select(MuscleTable.name, MuscleTable.bit))
+    return {muscle_name.casefold(): bit for muscle_name, bit in muscles.tuples()}
@@ -0,0 +1,24 @@
+import base64
+import json
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(*values: str | int) -> str:
+    payload = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[str | int]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError as e:
+        msg = f"Invalid cursor: {cursor}"
+        raise InvalidCursorError(msg) from e
+
+    if not isinstance(values, list):
+        msg = f"Invalid cursor: {cursor}"
+        raise InvalidCursorError(msg)
+    return values
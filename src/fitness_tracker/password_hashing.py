@@ -0,0 +1,72 @@
+import asyncio
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import TypeVar
+
+from dotenv import load_dotenv
+from passlib.context import CryptContext
+
+from fitness_tracker.metrics import LatencyHistogram
+from fitness_tracker.models.hashing_statistics import HashingStatistics
+
+load_dotenv()
+
+T = TypeVar("T")
+
+HASHING_WORKERS: int = int(os.getenv("PASSWORD_HASHING_WORKERS", str(min(4, os.cpu_count() or 1))))
+HASHING_MAX_PENDING: int = int(os.getenv("PASSWORD_HASHING_MAX_PENDING", str(HASHING_WORKERS * 16)))
+
+
+class HashingPoolSaturatedError(Exception):
+    pass
+
+
+class PasswordHasher:
+    def __init__(self, context: CryptContext, workers: int, max_pending: int) -> None:
+        self._context = context
+        self._workers = workers
+        self._max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hashing")
+        self._in_flight = 0
+        self._rejected = 0
+        self._latency = LatencyHistogram()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self._context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self._context.verify, password, hashed_password)
+
+    async def _run(self, function: Callable[..., T], *args: str) -> T:
+        # Only the event loop thread touches the counters, so no lock is needed here.
+        if self._in_flight >= self._max_pending:
+            self._rejected += 1
+            msg = "Password hashing pool is saturated"
+            raise HashingPoolSaturatedError(msg)
+
+        self._in_flight += 1
+        start = perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+        finally:
+            self._in_flight -= 1
+            self._latency.observe(perf_counter() - start)
+
+    def statistics(self) -> HashingStatistics:
+        return HashingStatistics(
+            workers=self._workers,
+            max_pending=self._max_pending,
+            in_flight=self._in_flight,
+            queue_depth=max(0, self._in_flight - self._workers),
+            rejected=self._rejected,
+            latency=self._latency.snapshot(),
+        )
+
+
+password_hasher = PasswordHasher(
+    CryptContext(schemes=["bcrypt"], deprecated="auto"),
+    workers=HASHING_WORKERS,
+    max_pending=HASHING_MAX_PENDING,
+)
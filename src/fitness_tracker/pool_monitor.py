@@ -0,0 +1,84 @@
+from collections import deque
+from threading import Lock
+from time import monotonic, perf_counter
+from typing import Any, cast
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, PoolProxiedConnection, QueuePool
+
+from fitness_tracker.metrics import LatencyHistogram
+from fitness_tracker.models.pool_statistics import PoolStatistics
+
+CREATION_RATE_WINDOW_SECONDS: float = 60.0
+
+
+class PoolMonitor:
+    def __init__(self) -> None:
+        self._checkout_wait = LatencyHistogram()
+        self._created: deque[float] = deque()
+        self._created_total = 0
+        self._lock = Lock()
+        self._pool: Pool | None = None
+
+    def attach(self, engine: AsyncEngine) -> None:
+        pool = engine.sync_engine.pool
+        if isinstance(pool, InstrumentedAsyncQueuePool):
+            pool.monitor = self
+        self._pool = pool
+        event.listen(engine.sync_engine, "connect", self._on_connect)
+        event.listen(engine.sync_engine, "engine_disposed", self._on_dispose)
+
+    def observe_checkout(self, seconds: float) -> None:
+        self._checkout_wait.observe(seconds)
+
+    def _on_connect(self, *_: Any) -> None:  # noqa: ANN401
+        now = monotonic()
+        with self._lock:
+            self._created_total += 1
+            self._created.append(now)
+            self._trim(now)
+
+    def _on_dispose(self, engine: Any) -> None:  # noqa: ANN401
+        self._pool = engine.pool
+
+    def _trim(self, now: float) -> None:
+        while self._created and now - self._created[0] > CREATION_RATE_WINDOW_SECONDS:
+            self._created.popleft()
+
+    def statistics(self) -> PoolStatistics:
+        with self._lock:
+            self._trim(monotonic())
+            created_last_minute = len(self._created)
+            created_total = self._created_total
+
+        pool = self._pool
+        queue_pool = pool if isinstance(pool, QueuePool) else None
+        return PoolStatistics(
+            pool_class=type(pool).__name__ if pool is not None else "None",
+            pool_size=queue_pool.size() if queue_pool else 0,
+            checked_in=queue_pool.checkedin() if queue_pool else 0,
+            checked_out=queue_pool.checkedout() if queue_pool else 0,
+            overflow=max(0, queue_pool.overflow()) if queue_pool else 0,
+            connections_created=created_total,
+            connections_created_last_minute=created_last_minute,
+            checkout_wait=self._checkout_wait.snapshot(),
+        )
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    monitor: PoolMonitor | None = None
+
+    def connect(self) -> PoolProxiedConnection:
+        start = perf_counter()
+        try:
+            return super().connect()
+        finally:
+            if self.monitor is not None:
+                self.monitor.observe_checkout(perf_counter() - start)
+
+    def recreate(self) -> "InstrumentedAsyncQueuePool":
+        # QueuePool.recreate builds the new pool from self.__class__, so it is instrumented as well.
+        pool = cast("InstrumentedAsyncQueuePool", super().recreate())
+        pool.monitor = self.monitor
+        return pool
@@ -0,0 +1,89 @@
+import logging
+import os
+from collections.abc import Callable
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_SECONDS: float = float(os.getenv("DATABASE_SLOW_REQUEST_MS", "500")) / 1000
+STATEMENT_START_KEY: str = "query_timing_start"
+
+
+@dataclass
+class QueryTimings:
+    statements: int = 0
+    total_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.statements += 1
+        self.total_seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+
+QueryTimingHook = Callable[[QueryTimings], None]
+
+current_timings: ContextVar[QueryTimings | None] = ContextVar("current_timings", default=None)
+query_timing_hooks: list[QueryTimingHook] = []
+
+
+def add_query_timing_hook(hook: QueryTimingHook) -> None:
+    query_timing_hooks.append(hook)
+
+
+def start_timing() -> Token[QueryTimings | None]:
+    return current_timings.set(QueryTimings())
+
+
+def finish_timing(token: Token[QueryTimings | None]) -> None:
+    timings = current_timings.get()
+    current_timings.reset(token)
+    if timings is None:
+        return
+
+    for hook in query_timing_hooks:
+        hook(timings)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn: Any, *_: Any) -> None:  # noqa: ANN401
+    if current_timings.get() is not None:
+        conn.info.setdefault(STATEMENT_START_KEY, []).append(perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn: Any, _cursor: Any, statement: str, *_: Any) -> None:  # noqa: ANN401
+    timings = current_timings.get()
+    if timings is None or not conn.info.get(STATEMENT_START_KEY):
+        return
+
+    timings.record(statement, perf_counter() - conn.info[STATEMENT_START_KEY].pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context: Any) -> None:  # noqa: ANN401
+    if context.connection is not None and context.connection.info.get(STATEMENT_START_KEY):
+        context.connection.info[STATEMENT_START_KEY].pop()
+
+
+def log_slow_requests(timings: QueryTimings) -> None:
+    if timings.total_seconds >= SLOW_REQUEST_SECONDS:
+        logger.warning(
+            "Slow database work: %d statements in %.1f ms, slowest %.1f ms: %s",
+            timings.statements,
+            timings.total_seconds * 1000,
+            timings.slowest_seconds * 1000,
+            timings.slowest_statement,
+        )
+
+
+add_query_timing_hook(log_slow_requests)
@@ -0,0 +1,94 @@
+import asyncio
+from itertools import count
+from time import monotonic, time
+from typing import Any
+
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+REPLICA_BIND_KEY: str = "replica_bind"
+LAST_WRITE_HEADER: str = "X-Last-Write"
+# Zero on a replica that has replayed everything it received, an idle primary has no new transactions to replay.
+REPLICA_LAG_QUERY = text("""
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+""")
+
+
+class RoutingSession(Session):
+    def get_bind(self, *args: Any, **kwargs: Any) -> Engine | Connection:  # noqa: ANN401
+        replica: Engine | None = self.info.get(REPLICA_BIND_KEY)
+        if replica is not None:
+            return replica
+        return super().get_bind(*args, **kwargs)
+
+
+async def replica_lag(engine: AsyncEngine) -> float:
+    async with engine.connect() as connection:
+        if engine.dialect.name != "postgresql":
+            await connection.execute(text("SELECT 1"))
+            return 0.0
+        return float(await connection.scalar(REPLICA_LAG_QUERY) or 0.0)
+
+
+class ReplicaRouter:
+    def __init__(self, engines: list[AsyncEngine], retry_seconds: float, max_lag_seconds: float = 0.0) -> None:
+        self._engines = engines
+        self._retry_seconds = retry_seconds
+        self._max_lag_seconds = max_lag_seconds
+        self._unhealthy_until: dict[int, float] = {}
+        self._turn = count()
+
+    def choose(self) -> AsyncEngine | None:
+        now = monotonic()
+        for _ in range(len(self._engines)):
+            position = next(self._turn) % len(self._engines)
+            if self._unhealthy_until.get(position, 0.0) <= now:
+                return self._engines[position]
+        return None
+
+    def mark_unhealthy(self, engine: AsyncEngine) -> None:
+        self._unhealthy_until[self._engines.index(engine)] = monotonic() + self._retry_seconds
+
+    async def check_health(self, timeout: float) -> None:  # noqa: ASYNC109
+        # Replicas that do not answer or lag behind are skipped before a read is sent to them,
+        # and one that recovered is used again without waiting for its retry time.
+        for position, engine in enumerate(self._engines):
+            try:
+                lag = await asyncio.wait_for(replica_lag(engine), timeout)
+            except (DBAPIError, OSError, TimeoutError):
+                lag = None
+            if lag is None or lag > self._max_lag_seconds:
+                self.mark_unhealthy(engine)
+            else:
+                self._unhealthy_until.pop(position, None)
+
+    async def monitor(self, interval_seconds: float) -> None:
+        while self._engines:
+            await self.check_health(timeout=interval_seconds)
+            await asyncio.sleep(interval_seconds)
+
+
+class RecentWrites:
+    # The marker travels with the client, which echoes the header of its last write, so whichever worker process
+    # serves the following reads sends them to the primary. A header works for the cross-origin frontend, which
+    # sends no credentials and so would neither store nor send back a cookie.
+    def __init__(self, window_seconds: float) -> None:
+        self._window_seconds = window_seconds
+
+    @staticmethod
+    def mark(response: Response) -> None:
+        response.headers[LAST_WRITE_HEADER] = f"{time():.3f}"
+
+    def is_recent(self, request: Request) -> bool:
+        try:
+            last_write = float(request.headers.get(LAST_WRITE_HEADER, ""))
+        except ValueError:
+            return False
+        return time() - last_write < self._window_seconds
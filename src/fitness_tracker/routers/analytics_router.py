@@ -0,0 +1,246 @@
+from collections import defaultdict
+from datetime import date
+from typing import Annotated, Any
+
+import numpy as np
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Response
+from sqlalchemy import ColumnElement, LargeBinary, Select, func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from fitness_tracker.analytics import OneRepMaxFormula, SessionColumns, SetColumns, iso_dates, session_progress
+from fitness_tracker.configs.analytics import (
+    DEFAULT_ROLLING_WINDOW,
+    MAX_ROLLING_WINDOW,
+    MAX_ROLLUP_PERIODS,
+    PROGRESS_DECIMALS,
+)
+from fitness_tracker.database import read_only_database_dependency
+from fitness_tracker.exercise_cache import exercise_id_cache
+from fitness_tracker.models.exercise_progress import ExerciseProgress
+from fitness_tracker.models.personal_record import PersonalRecord
+from fitness_tracker.models.training_rollup import MuscleLoad, TrainingRollup
+from fitness_tracker.tables.exercise_table import ExerciseTable
+from fitness_tracker.tables.muscle_rollup_table import MuscleRollupTable
+from fitness_tracker.tables.personal_record_table import PersonalRecordTable
+from fitness_tracker.tables.sets_table import SetsTable
+from fitness_tracker.tables.training_rollup_table import TrainingRollupTable
+from fitness_tracker.tables.trainings_table import TrainingsTable
+from fitness_tracker.training_stats.training_rollups import RollupGranularity, period_count, period_start
+
+analytics_router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+EPOCH: date = date(1970, 1, 1)
+
+
+def progress_statement(user_id: int, exercise_ids: list[int], columns: list[ColumnElement]) -> Select:
+    return select(*columns).select_from(SetsTable).join(
+        TrainingsTable, TrainingsTable.id == SetsTable.training_id,
+    ).where(TrainingsTable.user_id == user_id, SetsTable.exercise_id.in_(exercise_ids))
+
+
+async def progress_sets(database: AsyncSession, user_id: int, exercise_ids: list[int]) -> SetColumns:
+    # Sorted so that every session is a run of adjacent sets.
+    ordering = (SetsTable.exercise_id, TrainingsTable.date, TrainingsTable.id)
+    if database.get_bind().dialect.name != "postgresql":
+        rows = await database.execute(
+            progress_statement(user_id, exercise_ids, [
+                SetsTable.exercise_id,
+                TrainingsTable.id,
+                TrainingsTable.date,
+                SetsTable.repetitions,
+                SetsTable.weight,
+            ]).order_by(*ordering),
+        )
+        return SetColumns.from_rows(rows.tuples().all())
+
+    # Postgres packs every column into one bytea, the rows are never turned into Python objects.
+    def packed(value: ColumnElement) -> ColumnElement:
+        return func.string_agg(value, aggregate_order_by(literal(b"", LargeBinary), *ordering), type_=LargeBinary)
+
+    packed_columns = await database.execute(
+        progress_statement(user_id, exercise_ids, [
+            packed(func.int4send(SetsTable.exercise_id)),
+            packed(func.int4send(TrainingsTable.id)),
+            packed(func.int4send(TrainingsTable.date - EPOCH)),
+            packed(func.int4send(SetsTable.repetitions)),
+            packed(func.float8send(SetsTable.weight)),
+        ]),
+    )
+    return SetColumns.from_packed(packed_columns.one())
+
+
+def exercise_progress(exercise_name: str, sessions: SessionColumns, dates: list[str], rows: slice) -> dict[str, Any]:
+    # Shaped like ExerciseProgress, the arrays are serialized by orjson without converting every value to Python.
+    def rounded(values: np.ndarray) -> np.ndarray:
+        return np.round(values[rows], PROGRESS_DECIMALS)
+
+    return {
+        "exercise_name": exercise_name,
+        "training_ids": sessions.training_ids[rows],
+        "dates": dates[rows],
+        "set_counts": sessions.set_counts[rows],
+        "volumes": rounded(sessions.volumes),
+        "max_weights": rounded(sessions.max_weights),
+        "estimated_one_rep_maxes": rounded(sessions.one_rep_maxes),
+        "rolling_volumes": rounded(sessions.rolling_volumes),
+        "rolling_one_rep_maxes": rounded(sessions.rolling_one_rep_maxes),
+    }
+
+
+def progress_response(
+    exercise_names: list[str],
+    exercise_ids: dict[str, int],
+    sessions: SessionColumns,
+) -> Response:
+    exercise_rows = sessions.exercise_slices()
+    dates = iso_dates(sessions.dates)
+    content = orjson.dumps(
+        [
+            exercise_progress(
+                exercise_name, sessions, dates, exercise_rows.get(exercise_ids[exercise_name], slice(0, 0)),
+            )
+            for exercise_name in exercise_names
+        ],
+        option=orjson.OPT_SERIALIZE_NUMPY,
+    )
+    return Response(content=content, media_type="application/json")
+
+
+# A hundred thousand sessions would take longer to validate than to compute, the response is built from the arrays.
+@analytics_router.get("/progress/{user_id}", response_model=list[ExerciseProgress])
+async def get_exercise_progress(
+    user_id: int,
+    exercises: Annotated[list[str], Query(min_length=1)],
+    database: read_only_database_dependency,
+    formula: OneRepMaxFormula = "epley",
+    window: Annotated[int, Query(ge=1, le=MAX_ROLLING_WINDOW)] = DEFAULT_ROLLING_WINDOW,
+) -> Response:
+    try:
+        exercise_names = list(dict.fromkeys(exercises))
+        exercise_ids = await exercise_id_cache.resolve(database, set(exercise_names))
+        for exercise_name in exercise_names:
+            if exercise_name not in exercise_ids:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Exercise {exercise_name} does not exists in database",
+                )
+
+        # One query for all exercises.
+        sets = await progress_sets(database, user_id, list(exercise_ids.values()))
+        sessions = session_progress(sets, formula, window)
+    except IntegrityError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Error occured while fetching exercise progress.",
+        ) from e
+    else:
+        return progress_response(exercise_names, exercise_ids, sessions)
+
+
+@analytics_router.get("/records/{user_id}")
+async def get_personal_records(user_id: int, database: read_only_database_dependency) -> list[PersonalRecord]:
+    try:
+        # The records are maintained on write, reading them is a primary key range scan.
+        records = await database.execute(
+            select(PersonalRecordTable, ExerciseTable.exercise_name).join(
+                ExerciseTable, ExerciseTable.id == PersonalRecordTable.exercise_id,
+            ).where(PersonalRecordTable.user_id == user_id).order_by(ExerciseTable.exercise_name),
+        )
+        personal_records = [
+            PersonalRecord.model_validate({
+                "exercise_name": exercise_name,
+                "max_weight": record.max_weight,
+                "max_weight_repetitions": record.max_weight_repetitions,
+                "max_weight_date": record.max_weight_date,
+                "best_one_rep_max": round(record.best_one_rep_max, PROGRESS_DECIMALS),
+                "best_one_rep_max_date": record.best_one_rep_max_date,
+                "best_session_volume": record.best_session_volume,
+                "best_session_training_id": record.best_session_training_id,
+                "best_session_date": record.best_session_date,
+            })
+            for record, exercise_name in records.tuples()
+        ]
+    except IntegrityError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Error occured while fetching personal records.",
+        ) from e
+    else:
+        return personal_records
+
+
+@analytics_router.get("/rollups/{user_id}")
+async def get_training_rollups(
+    user_id: int,
+    from_date: Annotated[date, Query(alias="from")],
+    to_date: Annotated[date, Query(alias="to")],
+    database: read_only_database_dependency,
+    granularity: RollupGranularity = "week",
+) -> list[TrainingRollup]:
+    if from_date > to_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Date range starts after it ends.",
+        )
+    first_start, last_start = period_start(from_date, granularity), period_start(to_date, granularity)
+    if period_count(first_start, last_start, granularity) > MAX_ROLLUP_PERIODS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range covers more than {MAX_ROLLUP_PERIODS} periods.",
+        )
+
+    try:
+        # Both reads are primary key range scans over at most one row per period, and per muscle of the period.
+        periods = await database.execute(
+            select(
+                TrainingRollupTable.period_start,
+                TrainingRollupTable.training_count,
+                TrainingRollupTable.set_count,
+                TrainingRollupTable.total_volume,
+            ).where(
+                TrainingRollupTable.user_id == user_id,
+                TrainingRollupTable.granularity == granularity,
+                TrainingRollupTable.period_start.between(first_start, last_start),
+            ).order_by(TrainingRollupTable.period_start),
+        )
+        muscles = await database.execute(
+            select(
+                MuscleRollupTable.period_start,
+                MuscleRollupTable.muscle,
+                MuscleRollupTable.set_count,
+                MuscleRollupTable.volume,
+            ).where(
+                MuscleRollupTable.user_id == user_id,
+                MuscleRollupTable.granularity == granularity,
+                MuscleRollupTable.period_start.between(first_start, last_start),
+            ).order_by(MuscleRollupTable.period_start, MuscleRollupTable.muscle),
+        )
+        period_muscles: defaultdict[date, list[MuscleLoad]] = defaultdict(list)
+        for muscle_start, muscle, muscle_sets, volume in muscles.tuples():
+            period_muscles[muscle_start].append(MuscleLoad(
+                muscle=muscle,
+                set_count=muscle_sets,
+                volume=round(volume, PROGRESS_DECIMALS),
+            ))
+        rollups = [
+            TrainingRollup(
+                period_start=start,
+                training_count=training_count,
+                set_count=set_count,
+                total_volume=round(total_volume, PROGRESS_DECIMALS),
+                muscles=period_muscles[start],
+            )
+            for start, training_count, set_count, total_volume in periods.tuples()
+        ]
+    except IntegrityError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Error occured while fetching training rollups.",
+        ) from e
+    else:
+        return rollups
@@ -1,5 +1,6 @@
 import os
-from collections.abc import Generator
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import UTC, datetime, timedelta
 from typing import Annotated
 
@@ -7,17 +8,16 @@ from dotenv import load_dotenv
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import HTTPBearer, OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy import delete
+from sqlalchemy import delete, select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
 from starlette import status
 
 from fitness_tracker.configs.access_token import PAYLOAD_ID, PAYLOAD_SUB, TIME_EXPIRES
-from fitness_tracker.database import SessionLocal
+from fitness_tracker.database import database_dependency
 from fitness_tracker.models.auth_token import AuthToken
 from fitness_tracker.models.create_user_request import CreateUserRequest
 from fitness_tracker.models.delete_data import DeleteData
+from fitness_tracker.password_hashing import HashingPoolSaturatedError, password_hasher
 from fitness_tracker.tables.users_table import UsersTable
 
 load_dotenv()
@@ -32,33 +32,21 @@ EMAIL_KEY: str = "users_email_key"
 REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
 
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/token")
 security = HTTPBearer()
 
 
-def get_database() -> Generator:
-    database = SessionLocal()
-    try:
-        yield database
-    finally:
-        database.close()
-
-
-database_dependency = Annotated[Session, Depends(get_database)]
-
-
 @authorization_router.post("/", status_code=status.HTTP_201_CREATED)
 async def create_user(database: database_dependency, create_user_request: CreateUserRequest) -> None:
     try:
         create_user_model = UsersTable(
             username=create_user_request.username,
             email=create_user_request.email,
-            password=bcrypt_context.hash(create_user_request.password),
+            password=await hash_password(create_user_request.password),
         )
 
         database.add(create_user_model)
-        database.commit()
+        await database.commit()
     except IntegrityError as e:
         if USERNAME_KEY in str(e):
             raise HTTPException(
@@ -81,7 +69,7 @@ async def login_for_access_token(
     login_form: Annotated[OAuth2PasswordRequestForm, Depends()],
     database: database_dependency,
 ) -> AuthToken:
-    user = authenticate_user(login_form.username, login_form.password, database)
+    user = await authenticate_user(login_form.username, login_form.password, database)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -94,15 +82,37 @@ async def login_for_access_token(
     return AuthToken(access_token=access_token, refresh_token=refresh_token, token_type="bearer")  # noqa: S106
 
 
-def authenticate_user(username: str, password: str, database: database_dependency) -> UsersTable | None:
-    user = database.query(UsersTable).filter(UsersTable.username == username).first()
+async def authenticate_user(username: str, password: str, database: database_dependency) -> UsersTable | None:
+    user = await database.scalar(select(UsersTable).where(UsersTable.username == username))
     if not user:
         return None
-    if not bcrypt_context.verify(password, user.password):
+    if not await verify_password(password, user.password):
         return None
     return user
 
 
+@contextmanager
+def unavailable_when_saturated() -> Iterator[None]:
+    try:
+        yield
+    except HashingPoolSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, try again later.",
+            headers={"Retry-After": "1"},
+        ) from e
+
+
+async def hash_password(password: str) -> str:
+    with unavailable_when_saturated():
+        return await password_hasher.hash(password)
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    with unavailable_when_saturated():
+        return await password_hasher.verify(password, hashed_password)
+
+
 def create_access_token(username: str, user_id: int) -> str:
     if not SECRET_KEY or not ALGORITHM:
         msg = "Missing SECRET_KEY or Algorithm"
@@ -152,7 +162,7 @@ async def refresh_access_token(refresh_token: str, database: database_dependency
             detail="Invalid token payload",
         )
 
-    user = database.query(UsersTable).filter(UsersTable.id == user_id).first()
+    user = await database.get(UsersTable, user_id)
 
     if not user:
         raise HTTPException(
@@ -183,7 +193,7 @@ async def delete_account(delete_data: DeleteData, database: database_dependency)
             detail="Invalid access token.",
         )
 
-    user = authenticate_user(username, delete_data.password, database)
+    user = await authenticate_user(username, delete_data.password, database)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -192,10 +202,10 @@ async def delete_account(delete_data: DeleteData, database: database_dependency)
 
     try:
         delete_account_statement = delete(UsersTable).where(UsersTable.id == user_id)  # type: ignore[arg-type]
-        database.execute(delete_account_statement)
-        database.commit()
+        await database.execute(delete_account_statement)
+        await database.commit()
     except IntegrityError as e:
-        database.rollback()
+        await database.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Missing user.",
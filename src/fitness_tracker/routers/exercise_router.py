@@ -1,50 +1,81 @@
-from collections.abc import Generator
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
-from fitness_tracker.database import SessionLocal
+from fitness_tracker.database import read_only_database_dependency
+from fitness_tracker.exercise_catalog import (
+    FUZZY_MODE,
+    MEMORY_BACKEND,
+    SEARCH_BACKEND,
+    SEARCH_LIMIT,
+    SearchMode,
+    exercise_catalog,
+)
 from fitness_tracker.models.exercise import Exercise
+from fitness_tracker.muscles import UnknownMuscleError, fetch_muscle_bits, muscle_mask
 from fitness_tracker.tables import ExerciseTable
+from fitness_tracker.training_stats.exercise_usage import USAGE_CANDIDATES, rank_by_usage
 
 exercise_router = APIRouter(prefix="/exercise", tags=["exercise"])
 
 
-def get_database() -> Generator:
-    database = SessionLocal()
-    try:
-        yield database
-    finally:
-        database.close()
+async def search_exercises_in_database(
+    database: AsyncSession,
+    characters: str,
+    muscles: list[str],
+    limit: int,
+) -> list[Exercise]:
+    statement = select(ExerciseTable).where(ExerciseTable.exercise_name.ilike(f"%{characters}%")).limit(limit)
+    # The muscle bits cost a round trip, a search without muscles does not need them.
+    if muscles:
+        required_mask = muscle_mask(muscles, await fetch_muscle_bits(database))
+        statement = statement.where(ExerciseTable.muscle_mask.op("&")(required_mask) == required_mask)
 
+    all_exercises: list[Exercise] = []
+    exercises = (await database.scalars(statement)).all()
 
-database_dependency = Annotated[Session, Depends(get_database)]
+    for exercise in exercises:
+        exercise_model = Exercise(
+            exercise_name=exercise.exercise_name,
+            muscle_group=exercise.muscle_group,
+        )
+        all_exercises.append(exercise_model)
+    return all_exercises
 
 
 @exercise_router.get("/search")
-async def get_exercises_by_characters(characters: str, database: database_dependency) -> list[Exercise] | None:
+async def get_exercises_by_characters(
+    characters: str,
+    database: read_only_database_dependency,
+    muscles: Annotated[list[str] | None, Query()] = None,
+    mode: SearchMode = "substring",
+    user_id: int | None = None,
+) -> list[Exercise] | None:
     try:
-        all_exercises: list[Exercise] = []
-        exercises: list[ExerciseTable] | None = database.query(ExerciseTable).filter(
-            ExerciseTable.exercise_name.ilike(f"%{characters}%"),
-        ).limit(5).all()
-        if not exercises:
-            return None
-
-        for exercise in exercises:
-            exercise_model = Exercise(
-                exercise_name=exercise.exercise_name,
-                muscle_group=exercise.muscle_group,
-            )
-            all_exercises.append(exercise_model)
+        # With a user the search looks further, so exercises the user trains can be moved up from below the cut.
+        limit = USAGE_CANDIDATES if user_id is not None else SEARCH_LIMIT
+        # Fuzzy matching needs the precomputed trigram index, so it is always served from the catalog.
+        if SEARCH_BACKEND == MEMORY_BACKEND or mode == FUZZY_MODE:
+            exercises = await exercise_catalog.search(database, characters, muscles or [], mode, limit)
+        else:
+            exercises = await search_exercises_in_database(database, characters, muscles or [], limit)
+
+        if user_id is not None:
+            exercises = (await rank_by_usage(database, user_id, exercises))[:SEARCH_LIMIT]
+    except UnknownMuscleError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
     except IntegrityError as e:
-        database.rollback()
+        await database.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Error occurred while fetching exercises.",
         ) from e
     else:
-        return all_exercises
+        return exercises or None
@@ -0,0 +1,26 @@
+from fastapi import APIRouter
+from starlette import status
+
+from fitness_tracker.database import pool_monitor
+from fitness_tracker.exercise_cache import exercise_id_cache
+from fitness_tracker.models.exercise_cache_statistics import ExerciseCacheStatistics
+from fitness_tracker.models.hashing_statistics import HashingStatistics
+from fitness_tracker.models.pool_statistics import PoolStatistics
+from fitness_tracker.password_hashing import password_hasher
+
+internal_router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+@internal_router.get("/hashing", status_code=status.HTTP_200_OK)
+async def get_hashing_statistics() -> HashingStatistics:
+    return password_hasher.statistics()
+
+
+@internal_router.get("/pool", status_code=status.HTTP_200_OK)
+async def get_pool_statistics() -> PoolStatistics:
+    return pool_monitor.statistics()
+
+
+@internal_router.get("/exercise-cache", status_code=status.HTTP_200_OK)
+async def get_exercise_cache_statistics() -> ExerciseCacheStatistics:
+    return exercise_id_cache.statistics()
@@ -1,13 +1,9 @@
-from collections.abc import Generator
-from typing import Annotated
-
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import update
+from fastapi import APIRouter, HTTPException
+from sqlalchemy import select, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
 from starlette import status
 
-from fitness_tracker.database import SessionLocal
+from fitness_tracker.database import database_dependency
 from fitness_tracker.models.profiles import Profiles
 from fitness_tracker.tables.profile_table import ProfileTable
 
@@ -15,21 +11,10 @@ profiles_router = APIRouter(prefix="/profile", tags=["user_profile"])
 USER_ID_KEY: str = "user_profile_user_id_key"
 
 
-def get_database() -> Generator:
-    database = SessionLocal()
-    try:
-        yield database
-    finally:
-        database.close()
-
-
-database_dependency = Annotated[Session, Depends(get_database)]
-
-
 @profiles_router.get("/{user_id}", status_code=status.HTTP_200_OK)
 async def get_profile(user_id: int, database: database_dependency) -> Profiles | None:
     try:
-        profile = database.query(ProfileTable).filter(ProfileTable.user_id == user_id).first()
+        profile = await database.scalar(select(ProfileTable).where(ProfileTable.user_id == user_id))
         if not profile:
             profile = ProfileTable(
                 user_id=user_id,
@@ -38,10 +23,10 @@ async def get_profile(user_id: int, database: database_dependency) -> Profiles |
                 height=None,
             )
             database.add(profile)
-            database.commit()
-            database.refresh(profile)
+            await database.commit()
+            await database.refresh(profile)
     except IntegrityError as e:
-        database.rollback()
+        await database.rollback()
         if USER_ID_KEY in str(e):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -70,10 +55,10 @@ async def update_profile(user_id: int, updated_profile: Profiles, database: data
                 ProfileTable.height: updated_profile.height,
             },
         )
-        database.execute(update_profile)
-        database.commit()
+        await database.execute(update_profile)
+        await database.commit()
     except IntegrityError as e:
-        database.rollback()
+        await database.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Error occurred while updating profile",
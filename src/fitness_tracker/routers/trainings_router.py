@@ -1,36 +1,41 @@
-from collections.abc import Generator
+from collections.abc import AsyncIterator
 from datetime import date
-from typing import Annotated
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import delete, desc, update
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, delete, insert, literal, select, tuple_, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncResult
 from starlette import status
 
+from fitness_tracker.configs.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from fitness_tracker.configs.sorting_communication import ASCENDING, BY_DATE, BY_NAME, DESCENDING
-from fitness_tracker.database import SessionLocal
+from fitness_tracker.configs.streaming import CSV_MEDIA_TYPE, GZIP_ENCODING, NDJSON_MEDIA_TYPE, STREAM_BATCH_SIZE
+from fitness_tracker.database import database_dependency, read_only_database_dependency, recent_writes
+from fitness_tracker.exercise_cache import exercise_id_cache
 from fitness_tracker.models.exercise_set import ExerciseSet
+from fitness_tracker.models.import_report import ImportReport
 from fitness_tracker.models.training import Training
+from fitness_tracker.models.training_record import TrainingRecord
 from fitness_tracker.models.training_request import TrainingRequest
+from fitness_tracker.models.trainings_page import TrainingsPage
+from fitness_tracker.pagination import decode_cursor, encode_cursor
+from fitness_tracker.streaming import ExportFormat, csv_chunk, gzip_chunks, ndjson_chunk
 from fitness_tracker.tables.exercise_table import ExerciseTable
 from fitness_tracker.tables.sets_table import SetsTable
 from fitness_tracker.tables.trainings_table import TrainingsTable
+from fitness_tracker.training_import import csv_trainings, import_trainings, ndjson_trainings, text_lines
+from fitness_tracker.training_stats.changes import SetChanges, SetRecord, apply_set_changes
 
 trainings_router = APIRouter(prefix="/trainings", tags=["trainings"])
 SORT_BY: set[str] = {BY_NAME, BY_DATE}
 ORDER_BY: set[str] = {DESCENDING, ASCENDING}
-
-
-def get_database() -> Generator:
-    database = SessionLocal()
-    try:
-        yield database
-    finally:
-        database.close()
-
-
-database_dependency = Annotated[Session, Depends(get_database)]
+SORT_COLUMNS: dict[str, Any] = {BY_NAME: TrainingsTable.name, BY_DATE: TrainingsTable.date}
+EXPORT_COLUMNS: list[str] = ["training_id", "training_name", "date", "set_id", "exercise_name", "repetitions", "weight"]
+# Ids are Postgres integers, a larger id in a cursor would fail in the database instead of as a bad request.
+MAX_TRAINING_ID: int = 2**31 - 1
+EXPORT_MEDIA_TYPES: dict[str, str] = {"ndjson": NDJSON_MEDIA_TYPE, "csv": CSV_MEDIA_TYPE}
 
 
 @trainings_router.post("/", status_code=status.HTTP_201_CREATED)
@@ -38,80 +43,139 @@ async def create_training(
     user_id: int,
     training: TrainingRequest,
     sets: list[ExerciseSet],
+    response: Response,
     database: database_dependency,
 ) -> None:
     try:
-        training_model = TrainingsTable(
-            user_id=user_id,
-            name=training.training_name,
-            date=training.date,
-        )
-        database.add(training_model)
-        database.commit()
-
+        exercise_ids = await exercise_id_cache.resolve(database, {exercise_set.exercise_name for exercise_set in sets})
         for exercise_set in sets:
-            exercise = database.query(ExerciseTable).filter(
-                ExerciseTable.exercise_name == exercise_set.exercise_name,
-            ).first()
-            if not exercise:
+            if exercise_set.exercise_name not in exercise_ids:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Exercise {exercise_set.exercise_name} does not exists in database",
                 )
 
-            set_model = SetsTable(
-                training_id=training_model.id,
-                exercise_id=exercise.id,
-                repetitions=exercise_set.repetitions,
-                weight=exercise_set.weight,
+        training_id: int = (await database.execute(
+            insert(TrainingsTable).values(
+                user_id=user_id,
+                name=training.training_name,
+                date=training.date,
+            ).returning(TrainingsTable.id),
+        )).scalar_one()
+        added_sets = [
+            SetRecord(exercise_ids[exercise_set.exercise_name], exercise_set.repetitions, exercise_set.weight)
+            for exercise_set in sets
+        ]
+        if added_sets:
+            await database.execute(
+                insert(SetsTable),
+                [{"training_id": training_id, **added_set._asdict()} for added_set in added_sets],
             )
-            database.add(set_model)
+        await apply_set_changes(database, SetChanges(user_id, training_id, training.date, added=added_sets))
 
-        database.commit()
+        await database.commit()
+        recent_writes.mark(response)
 
     except IntegrityError as e:
-        database.rollback()
+        await database.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Error occurred while creating training.",
         ) from e
 
 
+def training_summary(training: TrainingsTable) -> Training:
+    return Training.model_validate({
+        "training_id": training.id,
+        "training_name": training.name,
+        "date": training.date,
+        "set_count": training.set_count,
+        "total_volume": training.total_volume,
+        "exercise_count": training.exercise_count,
+        "top_muscles": training.top_muscles,
+    })
+
+
+def validate_sorting(sort_by: str, order: str) -> tuple[str, str]:
+    sort_by = sort_by.lower()
+    order = order.lower()
+
+    if sort_by not in SORT_BY:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot sort by: {sort_by}.",
+        )
+    if order not in ORDER_BY:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot order by: {order}.",
+        )
+    return sort_by, order
+
+
+def sorted_trainings_statement(user_id: int, sort_by: str, order: str) -> Select:
+    # The id tie-breaker keeps pages stable for equal names or dates and matches the composite indexes.
+    sort_column = SORT_COLUMNS[sort_by]
+    trainings = select(TrainingsTable).where(TrainingsTable.user_id == user_id)
+    if order == DESCENDING:
+        return trainings.order_by(sort_column.desc(), TrainingsTable.id.desc())
+    return trainings.order_by(sort_column, TrainingsTable.id)
+
+
+def training_cursor(training: Training, sort_by: str, order: str) -> str:
+    sort_key = training.date.isoformat() if sort_by == BY_DATE else training.training_name
+    return encode_cursor(sort_by, order, sort_key, training.training_id)
+
+
+def decode_training_cursor(cursor: str, sort_by: str, order: str) -> tuple[str | date, int]:
+    try:
+        cursor_sort_by, cursor_order, sort_key, training_id = decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor.",
+        ) from e
+
+    if (cursor_sort_by, cursor_order) != (sort_by, order):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor does not match sorting.",
+        )
+    # A forged cursor may hold any JSON value, and isinstance would let true and false pass as ids.
+    if type(training_id) is not int or not isinstance(sort_key, str) or not 0 < training_id <= MAX_TRAINING_ID:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor.",
+        )
+    if sort_by != BY_DATE:
+        return sort_key, training_id
+
+    try:
+        return date.fromisoformat(sort_key), training_id
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor.",
+        ) from e
+
+
 @trainings_router.get("/fetch/sorted/{user_id}")
 async def get_sorted_trainings(
     user_id: int,
     sort_by: str,
     order: str,
-    database: database_dependency,
+    database: read_only_database_dependency,
     offset: int = 0,
 ) -> list[Training] | None:
     try:
-        sort_by = sort_by.lower()
-        order = order.lower()
-
-        if sort_by not in SORT_BY:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot sort by: {sort_by}.",
-            )
-        if order not in ORDER_BY:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot order by: {order}.",
-            )
+        sort_by, order = validate_sorting(sort_by, order)
 
         sorted_results: list[Training] = []
-        trainings = database.query(TrainingsTable).filter(
-            TrainingsTable.user_id == user_id,
-        )
-        if not trainings:
-            return None
-
-        trainings = trainings.order_by(desc(sort_by)) if order == DESCENDING else trainings.order_by(sort_by)
-        sorted_trainings = trainings.offset(offset).limit(5).all()
+        trainings = sorted_trainings_statement(user_id, sort_by, order)
+        sorted_trainings = (await database.scalars(trainings.offset(offset).limit(DEFAULT_PAGE_SIZE))).all()
 
         for training in sorted_trainings:
-            training_model = Training(training_name=training.name, date=training.date, training_id=training.id)
+            training_model = training_summary(training)
             sorted_results.append(training_model)
     except IntegrityError as e:
         raise HTTPException(
@@ -122,24 +186,67 @@ async def get_sorted_trainings(
         return sorted_results
 
 
+@trainings_router.get("/fetch/page/{user_id}")
+async def get_trainings_page(  # noqa: PLR0913, PLR0917
+    user_id: int,
+    sort_by: str,
+    order: str,
+    database: read_only_database_dependency,
+    cursor: str | None = None,
+    page_size: Annotated[int, Query(ge=1)] = DEFAULT_PAGE_SIZE,
+) -> TrainingsPage:
+    try:
+        sort_by, order = validate_sorting(sort_by, order)
+        page_size = min(page_size, MAX_PAGE_SIZE)
+
+        trainings = sorted_trainings_statement(user_id, sort_by, order)
+        if cursor is not None:
+            sort_key, training_id = decode_training_cursor(cursor, sort_by, order)
+            position = tuple_(SORT_COLUMNS[sort_by], TrainingsTable.id)
+            last_seen = tuple_(literal(sort_key), literal(training_id))
+            trainings = trainings.where(position < last_seen if order == DESCENDING else position > last_seen)
+
+        # One extra row tells whether another page exists without a separate count query.
+        page = (await database.scalars(trainings.limit(page_size + 1))).all()
+        page_results = [
+            training_summary(training)
+            for training in page[:page_size]
+        ]
+        next_cursor = training_cursor(page_results[-1], sort_by, order) if len(page) > page_size else None
+    except IntegrityError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Error occured while fetchin trainings page.",
+        ) from e
+    else:
+        return TrainingsPage(trainings=page_results, next_cursor=next_cursor)
+
+
+def searched_trainings_statement(user_id: int, characters: str) -> Select:
+    # ILIKE can use the trigram index on name, the order matches the (user_id, name, id) index for paging.
+    return select(TrainingsTable).where(
+        TrainingsTable.user_id == user_id,
+        TrainingsTable.name.ilike(f"%{characters}%"),
+    ).order_by(TrainingsTable.name, TrainingsTable.id)
+
+
 @trainings_router.get("/fetch/search")
 async def get_trainings_by_characters(
     characters: str,
     user_id: int,
-    database: database_dependency,
+    database: read_only_database_dependency,
 ) -> list[Training] | None:
     try:
         filtered_trainings: list[Training] = []
 
-        trainings = database.query(TrainingsTable).filter(
-            TrainingsTable.name.like(f"%{characters}%"),
-            TrainingsTable.user_id == user_id,
-        ).all()
+        trainings = (await database.scalars(
+            searched_trainings_statement(user_id, characters).limit(MAX_PAGE_SIZE),
+        )).all()
         if not trainings:
             return None
 
         for training in trainings:
-            training_model = Training(training_name=training.name, date=training.date, training_id=training.id)
+            training_model = training_summary(training)
             filtered_trainings.append(training_model)
     except IntegrityError as e:
         raise HTTPException(
@@ -150,49 +257,217 @@ async def get_trainings_by_characters(
         return filtered_trainings
 
 
+@trainings_router.get("/fetch/search/page")
+async def get_trainings_search_page(
+    characters: str,
+    user_id: int,
+    database: read_only_database_dependency,
+    cursor: str | None = None,
+    page_size: Annotated[int, Query(ge=1)] = DEFAULT_PAGE_SIZE,
+) -> TrainingsPage:
+    try:
+        page_size = min(page_size, MAX_PAGE_SIZE)
+
+        trainings = searched_trainings_statement(user_id, characters)
+        if cursor is not None:
+            name, training_id = decode_training_cursor(cursor, BY_NAME, ASCENDING)
+            trainings = trainings.where(tuple_(TrainingsTable.name, TrainingsTable.id) > tuple_(
+                literal(name), literal(training_id),
+            ))
+
+        page = (await database.scalars(trainings.limit(page_size + 1))).all()
+        page_results = [
+            training_summary(training)
+            for training in page[:page_size]
+        ]
+        next_cursor = training_cursor(page_results[-1], BY_NAME, ASCENDING) if len(page) > page_size else None
+    except IntegrityError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Error occured while fetchin trainings page.",
+        ) from e
+    else:
+        return TrainingsPage(trainings=page_results, next_cursor=next_cursor)
+
+
+@trainings_router.get("/range/{user_id}", response_class=StreamingResponse)
+async def get_trainings_in_range(
+    user_id: int,
+    from_date: Annotated[date, Query(alias="from")],
+    to_date: Annotated[date, Query(alias="to")],
+    database: read_only_database_dependency,
+    name: str | None = None,
+) -> StreamingResponse:
+    if from_date > to_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Date range starts after it ends.",
+        )
+
+    # A range scan of the (user_id, date, id) index, already in the order of the response.
+    trainings = select(TrainingsTable).where(
+        TrainingsTable.user_id == user_id,
+        TrainingsTable.date.between(from_date, to_date),
+    ).order_by(TrainingsTable.date, TrainingsTable.id)
+    if name is not None:
+        trainings = trainings.where(TrainingsTable.name.ilike(f"%{name}%"))
+
+    async def training_lines() -> AsyncIterator[str]:
+        result = await database.stream_scalars(trainings.execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for batch in result.partitions():
+            yield ndjson_chunk(training_summary(training) for training in batch)
+
+    return StreamingResponse(training_lines(), media_type=NDJSON_MEDIA_TYPE)
+
+
+def history_statement(user_id: int) -> Select:
+    # Trainings without sets are kept by the outer joins, with empty set columns.
+    return select(
+        TrainingsTable.id.label("training_id"),
+        TrainingsTable.name.label("training_name"),
+        TrainingsTable.date,
+        SetsTable.id.label("set_id"),
+        ExerciseTable.exercise_name,
+        SetsTable.repetitions,
+        SetsTable.weight,
+    ).select_from(TrainingsTable).outerjoin(
+        SetsTable, SetsTable.training_id == TrainingsTable.id,
+    ).outerjoin(
+        ExerciseTable, ExerciseTable.id == SetsTable.exercise_id,
+    ).where(
+        TrainingsTable.user_id == user_id,
+    ).order_by(TrainingsTable.date, TrainingsTable.id, SetsTable.id)
+
+
+async def training_records(result: AsyncResult) -> AsyncIterator[list[TrainingRecord]]:
+    # Rows of one training are adjacent, the last training of a batch may continue in the next one.
+    record: TrainingRecord | None = None
+    async for rows in result.partitions():
+        completed = []
+        for row in rows:
+            if record is None or record.training_id != row.training_id:
+                if record is not None:
+                    completed.append(record)
+                record = TrainingRecord(
+                    training_id=row.training_id,
+                    training_name=row.training_name,
+                    date=row.date,
+                    sets=[],
+                )
+            if row.set_id is not None:
+                record.sets.append(ExerciseSet(
+                    set_id=row.set_id,
+                    exercise_name=row.exercise_name,
+                    repetitions=row.repetitions,
+                    weight=row.weight,
+                ))
+        yield completed
+    if record is not None:
+        yield [record]
+
+
+@trainings_router.get("/export/{user_id}", response_class=StreamingResponse)
+async def export_trainings(
+    user_id: int,
+    request: Request,
+    database: read_only_database_dependency,
+    export_format: Annotated[ExportFormat, Query(alias="format")] = "ndjson",
+) -> StreamingResponse:
+    async def export_lines() -> AsyncIterator[str]:
+        result = await database.stream(history_statement(user_id).execution_options(yield_per=STREAM_BATCH_SIZE))
+        if export_format == "csv":
+            yield csv_chunk([EXPORT_COLUMNS])
+            async for rows in result.partitions():
+                yield csv_chunk(rows)
+        else:
+            async for records in training_records(result):
+                yield ndjson_chunk(records)
+
+    headers = {"Content-Disposition": f'attachment; filename="trainings-{user_id}.{export_format}"'}
+    if GZIP_ENCODING not in request.headers.get("accept-encoding", ""):
+        return StreamingResponse(export_lines(), media_type=EXPORT_MEDIA_TYPES[export_format], headers=headers)
+
+    headers["Content-Encoding"] = GZIP_ENCODING
+    headers["Vary"] = "Accept-Encoding"
+    return StreamingResponse(
+        gzip_chunks(export_lines()),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers=headers,
+    )
+
+
+@trainings_router.post("/import/{user_id}")
+async def import_training_history(
+    user_id: int,
+    request: Request,
+    response: Response,
+    database: database_dependency,
+) -> ImportReport:
+    # The body is parsed while it is received, only one chunk of trainings is held in memory.
+    lines = text_lines(request.stream())
+    if request.headers.get("content-type", "").startswith(CSV_MEDIA_TYPE):
+        report = await import_trainings(database, user_id, csv_trainings(lines))
+    else:
+        report = await import_trainings(database, user_id, ndjson_trainings(lines))
+
+    if report.imported_trainings:
+        recent_writes.mark(response)
+    return report
+
+
 @trainings_router.get("/details/{training_id}")
 async def fetch_training_details(
     training_id: int,
-    database: database_dependency,
+    database: read_only_database_dependency,
 ) -> dict[str, list[ExerciseSet] | str | date | None]:
     try:
         training_details: dict[str, list[ExerciseSet] | str | date | None] = {}
         sets_details: list[ExerciseSet] = []
 
-        training = database.query(TrainingsTable).filter(TrainingsTable.id == training_id).first()
-        if not training:
+        details_statement = select(
+            TrainingsTable.name,
+            TrainingsTable.date,
+            SetsTable.id,
+            SetsTable.repetitions,
+            SetsTable.weight,
+            ExerciseTable.exercise_name,
+        ).select_from(TrainingsTable).outerjoin(
+            SetsTable, SetsTable.training_id == TrainingsTable.id,
+        ).outerjoin(
+            ExerciseTable, ExerciseTable.id == SetsTable.exercise_id,
+        ).where(TrainingsTable.id == training_id).order_by(SetsTable.id)
+
+        rows = (await database.execute(details_statement)).all()
+        if not rows:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"There is no training with id: {training_id}.",
             )
 
-        exercise_sets = database.query(SetsTable).filter(SetsTable.training_id == training_id).all()
-        if not exercise_sets:
+        training_name, training_date, first_set_id, *_ = rows[0]
+        if first_set_id is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Error occurred while getting training details.",
             )
 
-        for exercise_set in exercise_sets:
-            exercise = database.query(ExerciseTable).filter(
-                ExerciseTable.id == exercise_set.exercise_id,
-            ).first()
-            if not exercise:
+        for _, _, set_id, repetitions, weight, exercise_name in rows:
+            if exercise_name is None:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Error occurred while fetching exercise",
                 )
 
             set_model = ExerciseSet(
-                set_id=exercise_set.id,
-                exercise_name=exercise.exercise_name,
-                repetitions=exercise_set.repetitions,
-                weight=float(exercise_set.weight),
+                set_id=set_id,
+                exercise_name=exercise_name,
+                repetitions=repetitions,
+                weight=float(weight),
             )
             sets_details.append(set_model)
         training_details["sets"] = sets_details
-        training_details["name"] = training.name
-        training_details["date"] = training.date
+        training_details["name"] = training_name
+        training_details["date"] = training_date
     except IntegrityError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -204,72 +479,150 @@ async def fetch_training_details(
 
 
 @trainings_router.delete("/delete/{training_id}")
-async def delete_training(training_id: int, user_id: int, database: database_dependency) -> None:
+async def delete_training(
+    training_id: int,
+    user_id: int,
+    response: Response,
+    database: database_dependency,
+) -> None:
     try:
+        # The sets are read before the cascade removes them, the statistics need to know what was lost.
+        training_sets = (await database.execute(
+            select(TrainingsTable.date, SetsTable.exercise_id, SetsTable.repetitions, SetsTable.weight).outerjoin(
+                SetsTable, SetsTable.training_id == TrainingsTable.id,
+            ).where(TrainingsTable.id == training_id, TrainingsTable.user_id == user_id),
+        )).all()
         training_statement = delete(TrainingsTable).where(   # type: ignore[arg-type]
             TrainingsTable.id == training_id,
         ).where(TrainingsTable.user_id == user_id)
 
-        database.execute(training_statement)
-        database.commit()
+        await database.execute(training_statement)
+        if training_sets:
+            await apply_set_changes(database, SetChanges(
+                user_id,
+                training_id,
+                training_sets[0].date,
+                removed=[SetRecord(*training_set[1:]) for training_set in training_sets if training_set.exercise_id],
+            ))
+        await database.commit()
+        recent_writes.mark(response)
     except IntegrityError as e:
-        database.rollback()
+        await database.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Error occured while fetchin all trainings.",
         ) from e
 
 
+def renamed_or_new(exercise_set: ExerciseSet, current_names: dict[int, str]) -> bool:
+    return not exercise_set.set_id or exercise_set.exercise_name != current_names[exercise_set.set_id]
+
+
+def diff_sets(
+    training_id: int,
+    current_sets: dict[int, SetRecord],
+    current_names: dict[int, str],
+    sets: list[ExerciseSet],
+    exercise_ids: dict[str, int],
+) -> tuple[list[dict[str, int | float]], list[dict[str, int | float]]]:
+    changed_sets = []
+    new_sets = []
+    for exercise_set in sets:
+        # A kept set sent with its current name keeps its exercise, only a new name is resolved.
+        set_id = exercise_set.set_id
+        if set_id and not renamed_or_new(exercise_set, current_names):
+            exercise_id = current_sets[set_id].exercise_id
+        else:
+            exercise_id = exercise_ids[exercise_set.exercise_name]
+        values = {
+            "exercise_id": exercise_id,
+            "repetitions": exercise_set.repetitions,
+            "weight": exercise_set.weight,
+        }
+        if not exercise_set.set_id:
+            new_sets.append({"training_id": training_id, **values})
+        elif current_sets[exercise_set.set_id] != tuple(values.values()):
+            changed_sets.append({"id": exercise_set.set_id, **values})
+    return changed_sets, new_sets
+
+
 @trainings_router.put("/update/{training_id}")
 async def update_training(
     training_id: int,
     sets: list[ExerciseSet],
+    response: Response,
     database: database_dependency,
 ) -> None:
     try:
-        all_sets = database.query(SetsTable).filter(SetsTable.training_id == training_id).all()
-        if not all_sets:
+        training_sets = (await database.execute(
+            select(
+                TrainingsTable.user_id,
+                TrainingsTable.date,
+                SetsTable.id,
+                SetsTable.exercise_id,
+                SetsTable.repetitions,
+                SetsTable.weight,
+                ExerciseTable.exercise_name,
+            ).join(SetsTable, SetsTable.training_id == TrainingsTable.id).join(
+                ExerciseTable, ExerciseTable.id == SetsTable.exercise_id,
+            ).where(TrainingsTable.id == training_id),
+        )).all()
+        current_sets = {
+            set_id: SetRecord(exercise_id, repetitions, weight)
+            for _, _, set_id, exercise_id, repetitions, weight, _ in training_sets
+        }
+        current_names = {set_id: exercise_name for _, _, set_id, *_, exercise_name in training_sets}
+        if not current_sets:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Error with processing training with id: {training_id}.",
             )
 
-        sets_id = {exercise_set.set_id for exercise_set in sets}
-        deleted_sets = [exercise_set.id for exercise_set in all_sets if exercise_set.id not in sets_id]
-        for deleted_set in deleted_sets:
-            delete_statement = delete(SetsTable).where(SetsTable.id == deleted_set)  # type: ignore[arg-type]
-            database.execute(delete_statement)
+        sent_set_ids = [exercise_set.set_id for exercise_set in sets if exercise_set.set_id]
+        foreign_set_ids = [set_id for set_id in sent_set_ids if set_id not in current_sets]
+        if foreign_set_ids or len(sent_set_ids) != len(set(sent_set_ids)):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Sets {foreign_set_ids or sent_set_ids} are not unique sets of training {training_id}.",
+            )
 
-        for exercise_set in sets:
-            if not exercise_set.set_id:
-                exercise = database.query(ExerciseTable).filter(
-                    ExerciseTable.exercise_name == exercise_set.exercise_name,
-                ).first()
-                if not exercise:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=f"Error with finding exercise {exercise_set.exercise_name}",
-                    )
-
-                set_model = SetsTable(
-                    training_id=training_id,
-                    exercise_id=exercise.id,
-                    repetitions=exercise_set.repetitions,
-                    weight=exercise_set.weight,
+        resolved_sets = [exercise_set for exercise_set in sets if renamed_or_new(exercise_set, current_names)]
+        exercise_ids = await exercise_id_cache.resolve(
+            database,
+            {exercise_set.exercise_name for exercise_set in resolved_sets},
+        )
+        for exercise_set in resolved_sets:
+            if exercise_set.exercise_name not in exercise_ids:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Error with finding exercise {exercise_set.exercise_name}",
                 )
-                database.add(set_model)
-                continue
-
-            current_set = update(SetsTable).where(SetsTable.id == exercise_set.set_id).values(  # type: ignore[arg-type]
-                {
-                    SetsTable.weight: exercise_set.weight,
-                    SetsTable.repetitions: exercise_set.repetitions,
-                },
-            )
-            database.execute(current_set)
-        database.commit()
+
+        deleted_sets = current_sets.keys() - set(sent_set_ids)
+        changed_sets, new_sets = diff_sets(training_id, current_sets, current_names, sets, exercise_ids)
+        if deleted_sets:
+            await database.execute(delete(SetsTable).where(SetsTable.id.in_(deleted_sets)))  # type: ignore[arg-type]
+        if changed_sets:
+            await database.execute(update(SetsTable), changed_sets)
+        if new_sets:
+            await database.execute(insert(SetsTable), new_sets)
+
+        # A changed set counts as its old version removed and its new version added.
+        added_sets = [
+            SetRecord(int(set_values["exercise_id"]), int(set_values["repetitions"]), float(set_values["weight"]))
+            for set_values in changed_sets + new_sets
+        ]
+        removed_sets = [current_sets[set_id] for set_id in deleted_sets]
+        removed_sets += [current_sets[set_values["id"]] for set_values in changed_sets]
+        user_id, training_date = training_sets[0].user_id, training_sets[0].date
+        await apply_set_changes(
+            database,
+            SetChanges(user_id, training_id, training_date, added=added_sets, removed=removed_sets),
+        )
+        await database.commit()
+        recent_writes.mark(response)
     except IntegrityError as e:
-        database.rollback()
+        await database.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Error occured while updating training.",
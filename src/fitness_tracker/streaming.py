@@ -0,0 +1,31 @@
+import csv
+import io
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Sequence
+from typing import Any, Literal
+
+from pydantic import BaseModel
+
+ExportFormat = Literal["ndjson", "csv"]
+# A window of 16 + 15 bits makes zlib write a gzip header and trailer instead of a zlib one.
+GZIP_WINDOW_BITS: int = 16 + zlib.MAX_WBITS
+
+
+def ndjson_chunk(models: Iterable[BaseModel]) -> str:
+    # One chunk per fetched batch keeps the number of writes to the socket independent of the row count.
+    return "".join(f"{model.model_dump_json()}\n" for model in models)
+
+
+def csv_chunk(rows: Iterable[Sequence[Any]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+async def gzip_chunks(chunks: AsyncIterable[str]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=GZIP_WINDOW_BITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk.encode())
+        if compressed:
+            yield compressed
+    yield compressor.flush()
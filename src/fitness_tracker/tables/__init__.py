@@ -1,8 +1,27 @@
 from fitness_tracker.database import Base
+from fitness_tracker.tables.catalog_version_table import CatalogVersionTable
 from fitness_tracker.tables.exercise_table import ExerciseTable
+from fitness_tracker.tables.exercise_usage_table import ExerciseUsageTable
+from fitness_tracker.tables.muscle_rollup_table import MuscleRollupTable
+from fitness_tracker.tables.muscle_table import MuscleTable
+from fitness_tracker.tables.personal_record_table import PersonalRecordTable
 from fitness_tracker.tables.profile_table import ProfileTable
 from fitness_tracker.tables.sets_table import SetsTable
+from fitness_tracker.tables.training_rollup_table import TrainingRollupTable
 from fitness_tracker.tables.trainings_table import TrainingsTable
 from fitness_tracker.tables.users_table import UsersTable
 
-__all__ = ["Base", "ExerciseTable", "ProfileTable", "SetsTable", "TrainingsTable", "UsersTable"]
+__all__ = [
+    "Base",
+    "CatalogVersionTable",
+    "ExerciseTable",
+    "ExerciseUsageTable",
+    "MuscleRollupTable",
+    "MuscleTable",
+    "PersonalRecordTable",
+    "ProfileTable",
+    "SetsTable",
+    "TrainingRollupTable",
+    "TrainingsTable",
+    "UsersTable",
+]
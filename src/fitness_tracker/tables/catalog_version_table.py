@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, String
+
+from fitness_tracker.database import Base
+
+
+class CatalogVersionTable(Base):
+    __tablename__ = "catalog_version"
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import BigInteger, Column, Integer, String
 
 from fitness_tracker.database import Base
 
@@ -8,3 +8,4 @@ class ExerciseTable(Base):
     id = Column(Integer, primary_key=True, index=True)
     exercise_name = Column(String, nullable=False, unique=True)
     muscle_group = Column(String, nullable=False)
+    muscle_mask = Column(BigInteger, nullable=False, default=0, server_default="0")
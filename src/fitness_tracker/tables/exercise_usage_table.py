@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Date, ForeignKey, Integer
+
+from fitness_tracker.database import Base
+
+
+class ExerciseUsageTable(Base):
+    __tablename__ = "exercise_usage"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    exercise_id = Column(Integer, ForeignKey("exercise.id", ondelete="CASCADE"), primary_key=True, index=True)
+    set_count = Column(Integer, nullable=False)
+    last_used = Column(Date, nullable=False)
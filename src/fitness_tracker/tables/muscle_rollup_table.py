@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Date, Float, ForeignKey, Integer, String
+
+from fitness_tracker.database import Base
+
+
+class MuscleRollupTable(Base):
+    __tablename__ = "muscle_rollups"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    granularity = Column(String, primary_key=True)
+    period_start = Column(Date, primary_key=True)
+    muscle = Column(String, primary_key=True)
+    set_count = Column(Integer, nullable=False)
+    volume = Column(Float, nullable=False)
@@ -0,0 +1,10 @@
+from sqlalchemy import CheckConstraint, Column, Integer, String
+
+from fitness_tracker.database import Base
+
+
+class MuscleTable(Base):
+    __tablename__ = "muscle"
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False, unique=True)
+    bit = Column(Integer, CheckConstraint("bit >= 0 AND bit < 63"), nullable=False, unique=True)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Date, Float, ForeignKey, Integer
+
+from fitness_tracker.database import Base
+
+
+class PersonalRecordTable(Base):
+    __tablename__ = "personal_records"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    exercise_id = Column(Integer, ForeignKey("exercise.id", ondelete="CASCADE"), primary_key=True, index=True)
+    max_weight = Column(Float, nullable=False)
+    max_weight_repetitions = Column(Integer, nullable=False)
+    max_weight_date = Column(Date, nullable=False)
+    best_one_rep_max = Column(Float, nullable=False)
+    best_one_rep_max_date = Column(Date, nullable=False)
+    best_session_volume = Column(Float, nullable=False)
+    # Not a foreign key, deleting the training recomputes the record in the same transaction.
+    best_session_training_id = Column(Integer, nullable=False)
+    best_session_date = Column(Date, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import CheckConstraint, Column, Float, ForeignKey, Integer
+from sqlalchemy import CheckConstraint, Column, Float, ForeignKey, Index, Integer
 
 from fitness_tracker.database import Base
 
@@ -7,6 +7,10 @@ class SetsTable(Base):
     __tablename__ = "sets"
     id = Column(Integer, primary_key=True, index=True)
     training_id = Column(Integer, ForeignKey("trainings.id", ondelete="CASCADE"), nullable=False)
-    exercise_id = Column(Integer, ForeignKey("exercise.id", ondelete="CASCADE"), nullable=False)
+    exercise_id = Column(Integer, ForeignKey("exercise.id", ondelete="CASCADE"), nullable=False, index=True)
     repetitions = Column(Integer, CheckConstraint("repetitions > 0"), nullable=False)
     weight = Column(Float, CheckConstraint("weight >= 0"), nullable=False)
+
+    __table_args__ = (
+        Index("ix_sets_training_id_id", "training_id", "id"),
+    )
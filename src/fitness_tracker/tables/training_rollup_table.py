@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Date, Float, ForeignKey, Integer, String
+
+from fitness_tracker.database import Base
+
+
+class TrainingRollupTable(Base):
+    __tablename__ = "training_rollups"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    # "week" periods start on Monday, "month" periods on the first day of the month.
+    granularity = Column(String, primary_key=True)
+    period_start = Column(Date, primary_key=True)
+    training_count = Column(Integer, nullable=False)
+    set_count = Column(Integer, nullable=False)
+    total_volume = Column(Float, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Date, ForeignKey, Integer, String
+from sqlalchemy import DDL, Column, Date, Float, ForeignKey, Index, Integer, String, event
 
 from fitness_tracker.database import Base
 
@@ -9,3 +9,33 @@ class TrainingsTable(Base):
     name = Column(String, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     date = Column(Date, nullable=False)
+    # Denormalized from the sets by the training_stats handlers, so lists of trainings need no joins.
+    set_count = Column(Integer, nullable=False, default=0, server_default="0")
+    total_volume = Column(Float, nullable=False, default=0, server_default="0")
+    exercise_count = Column(Integer, nullable=False, default=0, server_default="0")
+    top_muscles = Column(String, nullable=False, default="", server_default="")
+
+    __table_args__ = (
+        Index("ix_trainings_user_id_name_id", "user_id", "name", "id"),
+        Index("ix_trainings_user_id_date_id", "user_id", "date", "id"),
+    )
+
+
+# The trigram index lets ILIKE '%characters%' skip rows without the characters' trigrams. pg_trgm ships with
+# contrib and is missing from some builds, where the search falls back to the (user_id, name, id) index.
+TRAINING_NAME_TRIGRAM_INDEX = DDL("""
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS ix_trainings_name_trgm ON trainings USING gin (name gin_trgm_ops);
+    END IF;
+END
+$$
+""")
+
+event.listen(
+    TrainingsTable.__table__,
+    "after_create",
+    TRAINING_NAME_TRIGRAM_INDEX.execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,239 @@
+import codecs
+import csv
+import os
+from collections.abc import AsyncIterable, AsyncIterator
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fitness_tracker.exercise_cache import exercise_id_cache
+from fitness_tracker.models.import_report import ImportLineError, ImportReport
+from fitness_tracker.models.training_record import TrainingRecord
+from fitness_tracker.tables.sets_table import SetsTable
+from fitness_tracker.tables.trainings_table import TrainingsTable
+from fitness_tracker.training_stats.changes import SetChanges, SetRecord, apply_set_changes
+
+IMPORT_CHUNK_SIZE: int = int(os.getenv("TRAINING_IMPORT_CHUNK_SIZE", "1000"))
+CSV_TRAINING_COLUMNS: list[str] = ["training_name", "date"]
+CSV_SET_COLUMNS: list[str] = ["exercise_name", "repetitions", "weight"]
+
+ParsedTraining = tuple[int, TrainingRecord | str]
+
+
+async def text_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    # Invalid UTF-8 is replaced instead of aborting the upload, the broken lines then fail validation.
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.removesuffix("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.removesuffix("\r")
+
+
+def validation_detail(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(location) for location in details['loc'])}: {details['msg']}" if details["loc"]
+        else details["msg"]
+        for details in error.errors()
+    )
+
+
+async def ndjson_trainings(lines: AsyncIterable[str]) -> AsyncIterator[ParsedTraining]:
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            yield line_number, TrainingRecord.model_validate_json(line)
+        except ValidationError as e:
+            yield line_number, validation_detail(e)
+
+
+def csv_training(rows: list[dict[str, str]]) -> TrainingRecord | str:
+    try:
+        return TrainingRecord.model_validate({
+            "training_name": rows[0]["training_name"],
+            "date": rows[0]["date"],
+            # Trainings without sets are exported as a single row with empty set columns.
+            "sets": [{column: row[column] for column in CSV_SET_COLUMNS} for row in rows if row["exercise_name"]],
+        })
+    except ValidationError as e:
+        return validation_detail(e)
+
+
+async def csv_rows(lines: AsyncIterable[str]) -> AsyncIterator[tuple[int, list[str] | None]]:
+    # Quoted fields may hold line breaks, as the export writes them. Lines are collected until their quotes are
+    # balanced and parsed together, so such a field stays one field instead of splitting the row.
+    block: list[str] = []
+    block_line = 0
+    quotes = 0
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not block:
+            block_line = line_number
+        block.append(f"{line}\n")
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+
+        reader = csv.reader(block)
+        row_line = block_line
+        for row in reader:
+            yield row_line, row
+            row_line = block_line + reader.line_num
+        block, quotes = [], 0
+
+    if block:
+        yield block_line, None
+
+
+async def csv_trainings(lines: AsyncIterable[str]) -> AsyncIterator[ParsedTraining]:
+    # Consecutive rows with the same training id, name and date are the sets of one training, as in the export.
+    header: list[str] | None = None
+    group_key: tuple[str, ...] | None = None
+    group_line = 0
+    group_rows: list[dict[str, str]] = []
+    async for line_number, row in csv_rows(lines):
+        if row is None:
+            yield line_number, "Quoted field is not closed"
+            continue
+        if not any(field.strip() for field in row):
+            continue
+        if header is None:
+            missing = [column for column in CSV_TRAINING_COLUMNS + CSV_SET_COLUMNS if column not in row]
+            if missing:
+                yield line_number, f"Missing columns: {', '.join(missing)}"
+                return
+            header = row
+            continue
+
+        values = dict(zip(header, row, strict=False))
+        if len(row) != len(header):
+            yield line_number, f"Expected {len(header)} columns, got {len(row)}"
+            continue
+
+        key = (values.get("training_id", ""), values["training_name"], values["date"])
+        if key != group_key and group_rows:
+            yield group_line, csv_training(group_rows)
+            group_rows = []
+        if not group_rows:
+            group_key, group_line = key, line_number
+        group_rows.append(values)
+
+    if group_rows:
+        yield group_line, csv_training(group_rows)
+
+
+async def insert_trainings(
+    database: AsyncSession,
+    user_id: int,
+    trainings: list[tuple[int, TrainingRecord]],
+    exercise_ids: dict[str, int],
+) -> tuple[int, int]:
+    training_ids = (await database.scalars(
+        insert(TrainingsTable).returning(TrainingsTable.id, sort_by_parameter_order=True),
+        [{"user_id": user_id, "name": training.training_name, "date": training.date} for _, training in trainings],
+    )).all()
+    changes = [
+        SetChanges(
+            user_id,
+            training_id,
+            training.date,
+            added=[
+                SetRecord(exercise_ids[exercise_set.exercise_name], exercise_set.repetitions, exercise_set.weight)
+                for exercise_set in training.sets
+            ],
+        )
+        for training_id, (_, training) in zip(training_ids, trainings, strict=True)
+    ]
+    added_sets = [
+        {"training_id": training_changes.training_id, **added_set._asdict()}
+        for training_changes in changes
+        for added_set in training_changes.added
+    ]
+    if added_sets:
+        await database.execute(insert(SetsTable), added_sets)
+    await apply_set_changes(database, *changes)
+    return len(changes), len(added_sets)
+
+
+async def insert_or_split(
+    database: AsyncSession,
+    user_id: int,
+    trainings: list[tuple[int, TrainingRecord]],
+    exercise_ids: dict[str, int],
+    report: ImportReport,
+) -> tuple[int, int]:
+    # The whole chunk is tried in one savepoint. A failing one is split in halves, down to the single trainings
+    # that fail, so a bad line costs about two savepoints per halving and the other lines are still imported.
+    try:
+        async with database.begin_nested():
+            return await insert_trainings(database, user_id, trainings, exercise_ids)
+    except DBAPIError:
+        # Values out of the column ranges, such as too many repetitions, fail here and not in the validation.
+        if len(trainings) == 1:
+            report.errors.append(ImportLineError(line=trainings[0][0], detail="The database rejected the training."))
+            return 0, 0
+
+    middle = len(trainings) // 2
+    first_trainings, first_sets = await insert_or_split(database, user_id, trainings[:middle], exercise_ids, report)
+    last_trainings, last_sets = await insert_or_split(database, user_id, trainings[middle:], exercise_ids, report)
+    return first_trainings + last_trainings, first_sets + last_sets
+
+
+async def import_chunk(
+    database: AsyncSession,
+    user_id: int,
+    trainings: list[tuple[int, TrainingRecord]],
+    report: ImportReport,
+) -> None:
+    exercise_ids = await exercise_id_cache.resolve(
+        database,
+        {exercise_set.exercise_name for _, training in trainings for exercise_set in training.sets},
+    )
+    valid_trainings = []
+    for line, training in trainings:
+        unknown = sorted({exercise_set.exercise_name for exercise_set in training.sets} - exercise_ids.keys())
+        if unknown:
+            detail = f"Exercise {unknown[0]} does not exists in database"
+            report.errors.append(ImportLineError(line=line, detail=detail))
+        else:
+            valid_trainings.append((line, training))
+    if not valid_trainings:
+        return
+
+    imported_trainings, imported_sets = await insert_or_split(database, user_id, valid_trainings, exercise_ids, report)
+    await database.commit()
+    report.imported_trainings += imported_trainings
+    report.imported_sets += imported_sets
+
+
+async def import_trainings(
+    database: AsyncSession,
+    user_id: int,
+    trainings: AsyncIterable[ParsedTraining],
+) -> ImportReport:
+    # Every chunk is its own transaction, a failing chunk does not undo the ones before it.
+    report = ImportReport()
+    chunk: list[tuple[int, TrainingRecord]] = []
+    async for line, training in trainings:
+        if isinstance(training, str):
+            report.errors.append(ImportLineError(line=line, detail=training))
+            continue
+        chunk.append((line, training))
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            await import_chunk(database, user_id, chunk, report)
+            chunk = []
+    if chunk:
+        await import_chunk(database, user_id, chunk, report)
+
+    report.errors.sort(key=lambda error: error.line)
+    return report
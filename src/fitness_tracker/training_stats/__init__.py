@@ -0,0 +1,4 @@
+# Importing the statistics modules registers their set change handlers and rebuilders.
+from fitness_tracker.training_stats import exercise_usage, personal_records, training_rollups, training_summaries
+
+__all__ = ["exercise_usage", "personal_records", "training_rollups", "training_summaries"]
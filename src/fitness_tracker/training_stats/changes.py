@@ -0,0 +1,66 @@
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import date
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from fitness_tracker.tables.users_table import UsersTable
+
+
+class SetRecord(NamedTuple):
+    exercise_id: int
+    repetitions: int
+    weight: float
+
+
+@dataclass
+class SetChanges:
+    user_id: int
+    training_id: int
+    training_date: date
+    added: list[SetRecord] = field(default_factory=list)
+    removed: list[SetRecord] = field(default_factory=list)
+
+
+SetChangeHandler = Callable[[AsyncSession, list[SetChanges]], Awaitable[None]]
+StatsRebuilder = Callable[[Session], None]
+# A checker compares the statistics with the sets and returns one message per mismatch.
+StatsChecker = Callable[[Session], list[str]]
+
+set_change_handlers: list[SetChangeHandler] = []
+stats_rebuilders: dict[str, StatsRebuilder] = {}
+stats_checkers: dict[str, StatsChecker] = {}
+
+
+def add_set_change_handler(handler: SetChangeHandler) -> None:
+    set_change_handlers.append(handler)
+
+
+def add_stats_rebuilder(name: str, rebuilder: StatsRebuilder) -> None:
+    stats_rebuilders[name] = rebuilder
+
+
+def add_stats_checker(name: str, checker: StatsChecker) -> None:
+    stats_checkers[name] = checker
+
+
+async def apply_set_changes(database: AsyncSession, *changes: SetChanges) -> None:
+    # Handlers write in the caller's transaction, so the statistics commit or roll back together with the sets.
+    # They get all changes at once, so a bulk import costs a few statements instead of a few per training.
+    changed = [training_changes for training_changes in changes if training_changes.added or training_changes.removed]
+    if not changed:
+        return
+
+    # Statistics are read, merged and written back, and their rows may not exist yet, so there is nothing to lock
+    # on. Locking the users before any handler runs makes a concurrent writer of the same user wait and read the
+    # statistics after this transaction. Inserting trainings and sets only takes a key share lock on the user.
+    await database.execute(
+        select(UsersTable.id).where(
+            UsersTable.id.in_({training_changes.user_id for training_changes in changed}),
+        ).order_by(UsersTable.id).with_for_update(key_share=True),
+    )
+    for handler in set_change_handlers:
+        await handler(database, changed)
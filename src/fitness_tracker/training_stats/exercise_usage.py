@@ -0,0 +1,130 @@
+import os
+from collections import Counter
+from datetime import date
+from math import log1p
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from fitness_tracker.database import DIALECT_INSERTS
+from fitness_tracker.models.exercise import Exercise
+from fitness_tracker.tables.exercise_table import ExerciseTable
+from fitness_tracker.tables.exercise_usage_table import ExerciseUsageTable
+from fitness_tracker.tables.sets_table import SetsTable
+from fitness_tracker.tables.trainings_table import TrainingsTable
+from fitness_tracker.training_stats.changes import SetChanges, add_set_change_handler, add_stats_rebuilder
+
+USAGE_CANDIDATES: int = 50
+USAGE_HALF_LIFE_DAYS: float = float(os.getenv("EXERCISE_USAGE_HALF_LIFE_DAYS", "30"))
+
+
+async def update_exercise_usage(database: AsyncSession, changes: list[SetChanges]) -> None:
+    counts: Counter[tuple[int, int]] = Counter()
+    last_used: dict[tuple[int, int], date] = {}
+    for training_changes in changes:
+        for exercise_set in training_changes.added:
+            key = (training_changes.user_id, exercise_set.exercise_id)
+            counts[key] += 1
+            last_used[key] = max(last_used.get(key, training_changes.training_date), training_changes.training_date)
+        for exercise_set in training_changes.removed:
+            key = (training_changes.user_id, exercise_set.exercise_id)
+            counts[key] -= 1
+            last_used.setdefault(key, training_changes.training_date)
+    # Sets that were only edited, without changing the exercise, leave the counter as it is.
+    # Sorted keys make concurrent writers lock the rows in the same order.
+    deltas = {key: delta for key, delta in sorted(counts.items()) if delta}
+    if not deltas:
+        return
+
+    statement = DIALECT_INSERTS[database.get_bind().dialect.name](ExerciseUsageTable).values([
+        {
+            "user_id": user_id,
+            "exercise_id": exercise_id,
+            "set_count": delta,
+            "last_used": last_used[user_id, exercise_id],
+        }
+        for (user_id, exercise_id), delta in deltas.items()
+    ])
+    excluded = statement.excluded
+    await database.execute(statement.on_conflict_do_update(
+        index_elements=[ExerciseUsageTable.user_id, ExerciseUsageTable.exercise_id],
+        set_={
+            "set_count": ExerciseUsageTable.set_count + excluded.set_count,
+            # Removing sets cannot tell the previous date, it stays until the next rebuild.
+            "last_used": case(
+                (
+                    (excluded.set_count > 0) & (excluded.last_used > ExerciseUsageTable.last_used),
+                    excluded.last_used,
+                ),
+                else_=ExerciseUsageTable.last_used,
+            ),
+        },
+    ))
+
+    shrunk_users = {user_id for (user_id, _), delta in deltas.items() if delta < 0}
+    if shrunk_users:
+        await database.execute(
+            delete(ExerciseUsageTable).where(
+                ExerciseUsageTable.user_id.in_(shrunk_users),
+                ExerciseUsageTable.set_count <= 0,
+            ),
+        )
+
+
+async def fetch_exercise_usage(
+    database: AsyncSession,
+    user_id: int,
+    exercise_names: list[str],
+) -> dict[str, tuple[int, date]]:
+    if not exercise_names:
+        return {}
+
+    usage = await database.execute(
+        select(ExerciseTable.exercise_name, ExerciseUsageTable.set_count, ExerciseUsageTable.last_used).join(
+            ExerciseTable, ExerciseTable.id == ExerciseUsageTable.exercise_id,
+        ).where(
+            ExerciseUsageTable.user_id == user_id,
+            ExerciseTable.exercise_name.in_(exercise_names),
+        ),
+    )
+    return {exercise_name: (set_count, last_used) for exercise_name, set_count, last_used in usage}
+
+
+def usage_boost(set_count: int, last_used: date, today: date) -> float:
+    # Frequent exercises are boosted logarithmically and the boost halves every half-life since the last use.
+    decay: float = 0.5 ** (max((today - last_used).days, 0) / USAGE_HALF_LIFE_DAYS)
+    return log1p(set_count) * decay
+
+
+async def rank_by_usage(database: AsyncSession, user_id: int, exercises: list[Exercise]) -> list[Exercise]:
+    usage = await fetch_exercise_usage(database, user_id, [exercise.exercise_name for exercise in exercises])
+    today = date.today()  # noqa: DTZ011
+    boosts = {
+        exercise_name: usage_boost(set_count, last_used, today)
+        for exercise_name, (set_count, last_used) in usage.items()
+    }
+    # The sort is stable, exercises the user never trained keep the order of the search.
+    return sorted(exercises, key=lambda exercise: -boosts.get(exercise.exercise_name, 0.0))
+
+
+def rebuild_exercise_usage(db: Session) -> None:
+    db.execute(delete(ExerciseUsageTable))
+    db.execute(
+        insert(ExerciseUsageTable).from_select(
+            ["user_id", "exercise_id", "set_count", "last_used"],
+            select(
+                TrainingsTable.user_id,
+                SetsTable.exercise_id,
+                func.count(SetsTable.id),
+                func.max(TrainingsTable.date),
+            ).join(SetsTable, SetsTable.training_id == TrainingsTable.id).group_by(
+                TrainingsTable.user_id,
+                SetsTable.exercise_id,
+            ),
+        ),
+    )
+
+
+add_set_change_handler(update_exercise_usage)
+add_stats_rebuilder("exercise_usage", rebuild_exercise_usage)
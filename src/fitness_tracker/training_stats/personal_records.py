@@ -0,0 +1,215 @@
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass, fields, replace
+from datetime import date
+from itertools import groupby
+from operator import attrgetter
+from typing import Any, NamedTuple
+
+from sqlalchemy import Select, delete, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from fitness_tracker.database import DIALECT_INSERTS
+from fitness_tracker.tables.personal_record_table import PersonalRecordTable
+from fitness_tracker.tables.sets_table import SetsTable
+from fitness_tracker.tables.trainings_table import TrainingsTable
+from fitness_tracker.training_stats.changes import SetChanges, SetRecord, add_set_change_handler, add_stats_rebuilder
+
+REBUILD_BATCH_SIZE: int = 1000
+
+
+class RecordSet(NamedTuple):
+    user_id: int
+    exercise_id: int
+    training_id: int
+    training_date: date
+    repetitions: int
+    weight: float
+
+
+def one_rep_max(weight: float, repetitions: int) -> float:
+    # Epley, the default formula of the progress analytics.
+    return weight * (1 + repetitions / 30)
+
+
+@dataclass
+class ExerciseRecord:
+    user_id: int
+    exercise_id: int
+    max_weight: float
+    max_weight_repetitions: int
+    max_weight_date: date
+    best_one_rep_max: float
+    best_one_rep_max_date: date
+    best_session_volume: float
+    best_session_training_id: int
+    best_session_date: date
+
+    @classmethod
+    def from_session(cls, sets: list[RecordSet]) -> "ExerciseRecord":
+        heaviest = max(sets, key=attrgetter("weight", "repetitions"))
+        first = sets[0]
+        return cls(
+            user_id=first.user_id,
+            exercise_id=first.exercise_id,
+            max_weight=heaviest.weight,
+            max_weight_repetitions=heaviest.repetitions,
+            max_weight_date=first.training_date,
+            best_one_rep_max=max(one_rep_max(record_set.weight, record_set.repetitions) for record_set in sets),
+            best_one_rep_max_date=first.training_date,
+            best_session_volume=sum(record_set.repetitions * record_set.weight for record_set in sets),
+            best_session_training_id=first.training_id,
+            best_session_date=first.training_date,
+        )
+
+    @classmethod
+    def from_row(cls, row: PersonalRecordTable) -> "ExerciseRecord":
+        return cls(**{field.name: getattr(row, field.name) for field in fields(cls)})
+
+    def merge(self, other: "ExerciseRecord") -> "ExerciseRecord":
+        # Each record is taken from whichever side beats it, an equal record keeps its earlier date.
+        merged = self
+        if (other.max_weight, other.max_weight_repetitions, -other.max_weight_date.toordinal()) > (
+            self.max_weight, self.max_weight_repetitions, -self.max_weight_date.toordinal(),
+        ):
+            merged = replace(
+                merged,
+                max_weight=other.max_weight,
+                max_weight_repetitions=other.max_weight_repetitions,
+                max_weight_date=other.max_weight_date,
+            )
+        if (other.best_one_rep_max, -other.best_one_rep_max_date.toordinal()) > (
+            self.best_one_rep_max, -self.best_one_rep_max_date.toordinal(),
+        ):
+            merged = replace(
+                merged,
+                best_one_rep_max=other.best_one_rep_max,
+                best_one_rep_max_date=other.best_one_rep_max_date,
+            )
+        if (other.best_session_volume, -other.best_session_date.toordinal()) > (
+            self.best_session_volume, -self.best_session_date.toordinal(),
+        ):
+            merged = replace(
+                merged,
+                best_session_volume=other.best_session_volume,
+                best_session_training_id=other.best_session_training_id,
+                best_session_date=other.best_session_date,
+            )
+        return merged
+
+    def held_by(self, training_id: int, removed: SetRecord) -> bool:
+        # Only then can losing the set lower the record, any other removed set leaves it as it is.
+        return (
+            removed.weight >= self.max_weight
+            or one_rep_max(removed.weight, removed.repetitions) >= self.best_one_rep_max
+            or training_id == self.best_session_training_id
+        )
+
+
+def record_sets_statement() -> Select:
+    return select(
+        TrainingsTable.user_id,
+        SetsTable.exercise_id,
+        SetsTable.training_id,
+        TrainingsTable.date,
+        SetsTable.repetitions,
+        SetsTable.weight,
+    ).join(TrainingsTable, TrainingsTable.id == SetsTable.training_id).order_by(
+        TrainingsTable.user_id,
+        SetsTable.exercise_id,
+        SetsTable.training_id,
+    )
+
+
+def exercise_records(sets: Iterable[tuple[int, int, int, date, int, float]]) -> Iterator[ExerciseRecord]:
+    # The sets must be sorted by user, exercise and training, so only one session is held at a time.
+    for _, exercise_sets in groupby(map(RecordSet._make, sets), key=attrgetter("user_id", "exercise_id")):
+        record: ExerciseRecord | None = None
+        for _, session_sets in groupby(exercise_sets, key=attrgetter("training_id")):
+            session = ExerciseRecord.from_session(list(session_sets))
+            record = session if record is None else record.merge(session)
+        if record is not None:
+            yield record
+
+
+async def update_personal_records(database: AsyncSession, changes: list[SetChanges]) -> None:
+    keys = sorted({
+        (training_changes.user_id, exercise_set.exercise_id)
+        for training_changes in changes
+        for exercise_set in [*training_changes.added, *training_changes.removed]
+    })
+    existing = {
+        (record.user_id, record.exercise_id): record
+        for record in map(ExerciseRecord.from_row, (await database.scalars(
+            select(PersonalRecordTable).where(
+                tuple_(PersonalRecordTable.user_id, PersonalRecordTable.exercise_id).in_(keys),
+            ),
+        )).all())
+    }
+    stale = {
+        (training_changes.user_id, exercise_set.exercise_id)
+        for training_changes in changes
+        for exercise_set in training_changes.removed
+        if (record := existing.get((training_changes.user_id, exercise_set.exercise_id)))
+        and record.held_by(training_changes.training_id, exercise_set)
+    }
+
+    records: dict[tuple[int, int], ExerciseRecord | None] = {}
+    # Added sets can only raise a record, it is merged with the whole session they belong to.
+    sessions = {
+        (training_changes.training_id, exercise_set.exercise_id)
+        for training_changes in changes
+        for exercise_set in training_changes.added
+        if (training_changes.user_id, exercise_set.exercise_id) not in stale
+    }
+    if sessions:
+        session_sets = await database.execute(
+            record_sets_statement().where(tuple_(SetsTable.training_id, SetsTable.exercise_id).in_(sessions)),
+        )
+        for session in exercise_records(session_sets.tuples()):
+            key = (session.user_id, session.exercise_id)
+            current = records.get(key) or existing.get(key)
+            records[key] = session if current is None else current.merge(session)
+
+    # A removed record holder means the record is recounted from all sets of the exercise.
+    if stale:
+        stale_sets = await database.execute(
+            record_sets_statement().where(tuple_(TrainingsTable.user_id, SetsTable.exercise_id).in_(stale)),
+        )
+        recounted = {(record.user_id, record.exercise_id): record for record in exercise_records(stale_sets.tuples())}
+        records.update({key: recounted.get(key) for key in stale})
+
+    changed = [record for key, record in sorted(records.items()) if record is not None and record != existing.get(key)]
+    if changed:
+        statement = DIALECT_INSERTS[database.get_bind().dialect.name](PersonalRecordTable).values(
+            [asdict(record) for record in changed],
+        )
+        await database.execute(statement.on_conflict_do_update(
+            index_elements=[PersonalRecordTable.user_id, PersonalRecordTable.exercise_id],
+            set_={
+                field.name: statement.excluded[field.name]
+                for field in fields(ExerciseRecord)
+                if field.name not in {"user_id", "exercise_id"}
+            },
+        ))
+
+    removed_keys = [key for key, record in records.items() if record is None and key in existing]
+    if removed_keys:
+        await database.execute(
+            delete(PersonalRecordTable).where(
+                tuple_(PersonalRecordTable.user_id, PersonalRecordTable.exercise_id).in_(removed_keys),
+            ),
+        )
+
+
+def rebuild_personal_records(db: Session) -> None:
+    db.execute(delete(PersonalRecordTable))
+    # One record per user and exercise is kept in memory, the sets are streamed.
+    sets = db.execute(record_sets_statement().execution_options(yield_per=REBUILD_BATCH_SIZE))
+    records: list[dict[str, Any]] = [asdict(record) for record in exercise_records(sets.tuples())]
+    for start in range(0, len(records), REBUILD_BATCH_SIZE):
+        db.execute(insert(PersonalRecordTable), records[start:start + REBUILD_BATCH_SIZE])
+
+
+add_set_change_handler(update_personal_records)
+add_stats_rebuilder("personal_records", rebuild_personal_records)
@@ -0,0 +1,49 @@
+from time import perf_counter
+
+import click
+
+from fitness_tracker.database import SessionLocal
+from fitness_tracker.training_stats.changes import stats_checkers, stats_rebuilders
+
+
+def check(names: tuple[str, ...]) -> int:
+    mismatches = 0
+    with SessionLocal() as db:
+        for name in names or sorted(stats_checkers):
+            if name not in stats_checkers:
+                click.echo(f"There is no check of {name}.")
+                continue
+            found = stats_checkers[name](db)
+            for mismatch in found:
+                click.echo(mismatch)
+            click.echo(f"Checked {name}: {len(found)} mismatches.")
+            mismatches += len(found)
+    return mismatches
+
+
+@click.command()
+@click.option(
+    "--only",
+    "names",
+    multiple=True,
+    type=click.Choice(sorted(stats_rebuilders)),
+    help="Statistics to rebuild, all of them by default.",
+)
+@click.option("--check", "check_only", is_flag=True, help="Compare the statistics with the sets, without rebuilding.")
+def main(names: tuple[str, ...], *, check_only: bool) -> None:
+    if check_only:
+        # A non-zero exit code lets a scheduled check alert on drift.
+        if check(names):
+            raise SystemExit(1)
+        return
+
+    with SessionLocal() as db:
+        for name in names or sorted(stats_rebuilders):
+            start = perf_counter()
+            stats_rebuilders[name](db)
+            db.commit()
+            click.echo(f"Rebuilt {name} in {(perf_counter() - start) * 1000:.0f} ms.")
+
+
+if __name__ == "__main__":
+    main()
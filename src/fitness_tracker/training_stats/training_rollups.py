@@ -0,0 +1,248 @@
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from itertools import groupby
+from math import isclose
+from operator import attrgetter
+from typing import Any, Literal, NamedTuple
+
+from sqlalchemy import Select, and_, delete, insert, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from fitness_tracker.muscles import split_muscle_group
+from fitness_tracker.tables.exercise_table import ExerciseTable
+from fitness_tracker.tables.muscle_rollup_table import MuscleRollupTable
+from fitness_tracker.tables.sets_table import SetsTable
+from fitness_tracker.tables.training_rollup_table import TrainingRollupTable
+from fitness_tracker.tables.trainings_table import TrainingsTable
+from fitness_tracker.training_stats.changes import (
+    SetChanges,
+    add_set_change_handler,
+    add_stats_checker,
+    add_stats_rebuilder,
+)
+
+RollupGranularity = Literal["week", "month"]
+GRANULARITIES: tuple[RollupGranularity, ...] = ("week", "month")
+ROLLUP_BATCH_SIZE: int = 1000
+PERIOD_KEY: tuple[str, ...] = ("user_id", "granularity", "period_start")
+MUSCLE_KEY: tuple[str, ...] = (*PERIOD_KEY, "muscle")
+
+
+class RollupKey(NamedTuple):
+    user_id: int
+    granularity: str
+    period_start: date
+
+
+class RollupSet(NamedTuple):
+    user_id: int
+    training_id: int
+    training_date: date
+    repetitions: int
+    weight: float
+    muscle_group: str
+
+
+def period_start(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def next_period_start(start: date, granularity: str) -> date:
+    if granularity == "week":
+        return start + timedelta(days=7)
+    return (start + timedelta(days=31)).replace(day=1)
+
+
+def period_count(first_start: date, last_start: date, granularity: str) -> int:
+    if granularity == "week":
+        return (last_start - first_start).days // 7 + 1
+    return (last_start.year - first_start.year) * 12 + last_start.month - first_start.month + 1
+
+
+@dataclass
+class PeriodTotals:
+    training_ids: set[int] = field(default_factory=set)
+    set_count: int = 0
+    total_volume: float = 0.0
+    muscle_set_counts: Counter[str] = field(default_factory=Counter)
+    muscle_volumes: defaultdict[str, float] = field(default_factory=lambda: defaultdict(float))
+
+    def add(self, training_id: int, volume: float, muscles: list[str]) -> None:
+        self.training_ids.add(training_id)
+        self.set_count += 1
+        self.total_volume += volume
+        # Every muscle of the exercise carries the whole set, as in the top muscles of the training summaries.
+        for muscle in muscles:
+            self.muscle_set_counts[muscle] += 1
+            self.muscle_volumes[muscle] += volume
+
+
+def rollup_sets_statement() -> Select:
+    # Trainings without sets have no period totals, so they are not counted either.
+    return select(
+        TrainingsTable.user_id,
+        SetsTable.training_id,
+        TrainingsTable.date,
+        SetsTable.repetitions,
+        SetsTable.weight,
+        ExerciseTable.muscle_group,
+    ).join(SetsTable, SetsTable.training_id == TrainingsTable.id).join(
+        ExerciseTable, ExerciseTable.id == SetsTable.exercise_id,
+    )
+
+
+def rollup_totals(sets: Iterable[tuple[int, int, date, int, float, str]]) -> dict[RollupKey, PeriodTotals]:
+    totals: dict[RollupKey, PeriodTotals] = {}
+    for rollup_set in map(RollupSet._make, sets):
+        volume = rollup_set.repetitions * rollup_set.weight
+        muscles = split_muscle_group(rollup_set.muscle_group)
+        for granularity in GRANULARITIES:
+            key = RollupKey(rollup_set.user_id, granularity, period_start(rollup_set.training_date, granularity))
+            totals.setdefault(key, PeriodTotals()).add(rollup_set.training_id, volume, muscles)
+    return totals
+
+
+def rollup_rows(
+    totals: dict[RollupKey, PeriodTotals],
+) -> tuple[dict[tuple, dict[str, Any]], dict[tuple, dict[str, Any]]]:
+    periods = {}
+    muscles = {}
+    for key, period in totals.items():
+        periods[tuple(key)] = {
+            "training_count": len(period.training_ids),
+            "set_count": period.set_count,
+            "total_volume": period.total_volume,
+        }
+        for muscle, set_count in period.muscle_set_counts.items():
+            muscles[*key, muscle] = {"set_count": set_count, "volume": period.muscle_volumes[muscle]}
+    return periods, muscles
+
+
+def table_rows(rows: dict[tuple, dict[str, Any]], key_columns: tuple[str, ...]) -> list[dict[str, Any]]:
+    return [{**dict(zip(key_columns, key, strict=True)), **values} for key, values in rows.items()]
+
+
+def touched_ranges(keys: list[RollupKey]) -> list[tuple[int, date, date]]:
+    # Overlapping weeks and months of a user are merged, so one date range of the index is read per run of periods.
+    ranges: list[tuple[int, date, date]] = []
+    periods = sorted(
+        (key.user_id, key.period_start, next_period_start(key.period_start, key.granularity)) for key in keys
+    )
+    for user_id, start, end in periods:
+        if ranges and ranges[-1][0] == user_id and start <= ranges[-1][2]:
+            ranges[-1] = (user_id, ranges[-1][1], max(end, ranges[-1][2]))
+        else:
+            ranges.append((user_id, start, end))
+    return ranges
+
+
+async def update_training_rollups(database: AsyncSession, changes: list[SetChanges]) -> None:
+    keys = sorted({
+        RollupKey(training_changes.user_id, granularity, period_start(training_changes.training_date, granularity))
+        for training_changes in changes
+        for granularity in GRANULARITIES
+    })
+    sets = await database.execute(rollup_sets_statement().where(or_(*[
+        and_(TrainingsTable.user_id == user_id, TrainingsTable.date >= start, TrainingsTable.date < end)
+        for user_id, start, end in touched_ranges(keys)
+    ])))
+    totals = rollup_totals(sets.tuples())
+    periods, muscles = rollup_rows({key: totals[key] for key in keys if key in totals})
+
+    tables: list[type[TrainingRollupTable | MuscleRollupTable]] = [TrainingRollupTable, MuscleRollupTable]
+    for table in tables:
+        await database.execute(
+            delete(table).where(tuple_(table.user_id, table.granularity, table.period_start).in_(keys)),
+        )
+    if periods:
+        await database.execute(insert(TrainingRollupTable), table_rows(periods, PERIOD_KEY))
+    if muscles:
+        await database.execute(insert(MuscleRollupTable), table_rows(muscles, MUSCLE_KEY))
+
+
+def user_rollups(db: Session) -> Iterable[tuple[dict[tuple, dict[str, Any]], dict[tuple, dict[str, Any]]]]:
+    # The sets are streamed by user, only the periods of one user are held at a time.
+    sets = db.execute(
+        rollup_sets_statement().order_by(TrainingsTable.user_id).execution_options(yield_per=ROLLUP_BATCH_SIZE),
+    )
+    for _, user_sets in groupby(map(RollupSet._make, sets.tuples()), key=attrgetter("user_id")):
+        yield rollup_rows(rollup_totals(user_sets))
+
+
+def rebuild_training_rollups(db: Session) -> None:
+    db.execute(delete(MuscleRollupTable))
+    db.execute(delete(TrainingRollupTable))
+    periods: list[dict[str, Any]] = []
+    muscles: list[dict[str, Any]] = []
+    for user_periods, user_muscles in user_rollups(db):
+        periods += table_rows(user_periods, PERIOD_KEY)
+        muscles += table_rows(user_muscles, MUSCLE_KEY)
+        if len(periods) >= ROLLUP_BATCH_SIZE or len(muscles) >= ROLLUP_BATCH_SIZE:
+            db.execute(insert(TrainingRollupTable), periods)
+            db.execute(insert(MuscleRollupTable), muscles)
+            periods, muscles = [], []
+    if periods:
+        db.execute(insert(TrainingRollupTable), periods)
+        db.execute(insert(MuscleRollupTable), muscles)
+
+
+def stored_rows(
+    db: Session,
+    table: type[TrainingRollupTable | MuscleRollupTable],
+    key_columns: tuple[str, ...],
+) -> dict[tuple, dict[str, Any]]:
+    return {
+        tuple(row[column] for column in key_columns): {
+            column: value for column, value in row.items() if column not in key_columns
+        }
+        for row in db.execute(select(table.__table__)).mappings()
+    }
+
+
+def rollup_mismatches(
+    table_name: str,
+    stored: dict[tuple, dict[str, Any]],
+    expected: dict[tuple, dict[str, Any]],
+) -> list[str]:
+    # Volumes are float sums, which differ in the last digits when the sets are added in another order.
+    def matching(stored_values: dict[str, Any] | None, expected_values: dict[str, Any] | None) -> bool:
+        return stored_values is not None and expected_values is not None and all(
+            isclose(stored_values[column], value, rel_tol=1e-9, abs_tol=1e-6)
+            for column, value in expected_values.items()
+        )
+
+    return [
+        f"{table_name} {key}: stored {stored.get(key)}, expected {expected.get(key)}"
+        for key in sorted(stored.keys() | expected.keys())
+        if not matching(stored.get(key), expected.get(key))
+    ]
+
+
+def check_training_rollups(db: Session) -> list[str]:
+    expected_periods: dict[tuple, dict[str, Any]] = {}
+    expected_muscles: dict[tuple, dict[str, Any]] = {}
+    for user_periods, user_muscles in user_rollups(db):
+        expected_periods.update(user_periods)
+        expected_muscles.update(user_muscles)
+    return [
+        *rollup_mismatches(
+            TrainingRollupTable.__tablename__,
+            stored_rows(db, TrainingRollupTable, PERIOD_KEY),
+            expected_periods,
+        ),
+        *rollup_mismatches(
+            MuscleRollupTable.__tablename__,
+            stored_rows(db, MuscleRollupTable, MUSCLE_KEY),
+            expected_muscles,
+        ),
+    ]
+
+
+add_set_change_handler(update_training_rollups)
+add_stats_rebuilder("training_rollups", rebuild_training_rollups)
+add_stats_checker("training_rollups", check_training_rollups)
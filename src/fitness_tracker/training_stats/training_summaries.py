@@ -0,0 +1,88 @@
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import Select, bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from fitness_tracker.muscles import split_muscle_group
+from fitness_tracker.tables.exercise_table import ExerciseTable
+from fitness_tracker.tables.sets_table import SetsTable
+from fitness_tracker.tables.trainings_table import TrainingsTable
+from fitness_tracker.training_stats.changes import SetChanges, add_set_change_handler, add_stats_rebuilder
+
+TOP_MUSCLES: int = 3
+SUMMARY_BATCH_SIZE: int = 1000
+EMPTY_SUMMARY: dict[str, Any] = {"set_count": 0, "total_volume": 0.0, "exercise_count": 0, "top_muscles": ""}
+
+trainings_table = TrainingsTable.__table__
+# Core executemany keyed by id, trainings deleted in the same transaction simply match no row.
+UPDATE_SUMMARY = update(trainings_table).where(trainings_table.c.id == bindparam("training_id"))
+
+
+def summary_sets_statement(training_ids: list[int]) -> Select:
+    return select(
+        SetsTable.training_id,
+        SetsTable.exercise_id,
+        SetsTable.repetitions,
+        SetsTable.weight,
+        ExerciseTable.muscle_group,
+    ).join(ExerciseTable, ExerciseTable.id == SetsTable.exercise_id).where(SetsTable.training_id.in_(training_ids))
+
+
+def top_muscles(muscle_sets: Counter[str]) -> str:
+    # Muscles hit by the most sets first, equal ones by name so the summary does not depend on set order.
+    ranked = sorted(muscle_sets.items(), key=lambda item: (-item[1], item[0]))
+    return ", ".join(muscle for muscle, _ in ranked[:TOP_MUSCLES])
+
+
+def summarize_sets(sets: Iterable[tuple[int, int, int, float, str]]) -> dict[int, dict[str, Any]]:
+    set_counts: Counter[int] = Counter()
+    volumes: defaultdict[int, float] = defaultdict(float)
+    exercises: dict[int, set[int]] = {}
+    muscles: dict[int, Counter[str]] = {}
+    for training_id, exercise_id, repetitions, weight, muscle_group in sets:
+        set_counts[training_id] += 1
+        volumes[training_id] += repetitions * weight
+        exercises.setdefault(training_id, set()).add(exercise_id)
+        muscles.setdefault(training_id, Counter()).update(split_muscle_group(muscle_group))
+
+    return {
+        training_id: {
+            "set_count": set_count,
+            "total_volume": volumes[training_id],
+            "exercise_count": len(exercises[training_id]),
+            "top_muscles": top_muscles(muscles[training_id]),
+        }
+        for training_id, set_count in set_counts.items()
+    }
+
+
+def summary_parameters(training_ids: list[int], summaries: dict[int, dict[str, Any]]) -> list[dict[str, Any]]:
+    return [{"training_id": training_id, **summaries.get(training_id, EMPTY_SUMMARY)} for training_id in training_ids]
+
+
+async def update_training_summaries(database: AsyncSession, changes: list[SetChanges]) -> None:
+    # Distinct exercises and top muscles cannot be derived from the changed sets alone, the trainings are recounted.
+    training_ids = sorted({training_changes.training_id for training_changes in changes})
+    sets = await database.execute(summary_sets_statement(training_ids))
+    await database.execute(UPDATE_SUMMARY, summary_parameters(training_ids, summarize_sets(sets.tuples())))
+
+
+def rebuild_training_summaries(db: Session) -> None:
+    # Batches of trainings are committed one by one, so backfilling a large table does not hold one long transaction.
+    last_id = 0
+    while training_ids := db.scalars(
+        select(TrainingsTable.id).where(TrainingsTable.id > last_id).order_by(TrainingsTable.id).limit(
+            SUMMARY_BATCH_SIZE,
+        ),
+    ).all():
+        sets = db.execute(summary_sets_statement(list(training_ids)))
+        db.execute(UPDATE_SUMMARY, summary_parameters(list(training_ids), summarize_sets(sets.tuples())))
+        db.commit()
+        last_id = training_ids[-1]
+
+
+add_set_change_handler(update_training_summaries)
+add_stats_rebuilder("training_summaries", rebuild_training_summaries)
@@ -0,0 +1,227 @@
+# ruff: noqa: S101
+import asyncio
+import os
+import random
+from collections.abc import AsyncGenerator, Generator
+from dataclasses import fields
+from datetime import date, timedelta
+from itertools import starmap
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from fitness_tracker.analytics import SetColumns
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.main import fitness_app
+from fitness_tracker.routers.analytics_router import progress_sets
+from fitness_tracker.tables.exercise_table import ExerciseTable
+from fitness_tracker.tables.sets_table import SetsTable
+from fitness_tracker.tables.trainings_table import TrainingsTable
+from test.database_filler import fill_database
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
+        yield database
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+fitness_app.dependency_overrides[get_database] = override_get_database
+client = TestClient(fitness_app)
+
+OK_STATUS: int = 200
+BAD_REQUEST_STATUS: int = 400
+UNPROCESSABLE_STATUS: int = 422
+USER_ID: int = 1
+FIRST_EXTRA_ID: int = 100
+RANDOM_TRAININGS: int = 40
+WINDOW: int = 3
+EXERCISES: list[str] = ["Bench Press", "Chin-ups", "Decline Pushups"]
+FLOAT_FIELDS: list[str] = [
+    "volumes",
+    "max_weights",
+    "estimated_one_rep_maxes",
+    "rolling_volumes",
+    "rolling_one_rep_maxes",
+]
+
+
+def add_random_history(test_database: Session) -> None:
+    generator = random.Random(0)
+    exercise_ids = dict(test_database.query(ExerciseTable.exercise_name, ExerciseTable.id).all())
+    for number in range(RANDOM_TRAININGS):
+        training_id = FIRST_EXTRA_ID + number
+        # Several trainings share a date, sessions are told apart by the training.
+        test_database.add(TrainingsTable(
+            id=training_id,
+            user_id=USER_ID,
+            name=f"random{number}",
+            date=date(2024, 1, 1) + timedelta(days=number // 2),
+        ))
+        test_database.flush()
+        test_database.add_all([
+            SetsTable(
+                training_id=training_id,
+                exercise_id=exercise_ids[generator.choice(EXERCISES)],
+                repetitions=generator.randint(1, 40),
+                weight=generator.choice([0, 12.5, 60, 82.5, 100]),
+            )
+            for _ in range(generator.randint(1, 6))
+        ])
+    test_database.commit()
+
+
+def reference_progress(test_database: Session, exercise_name: str, formula: str) -> dict[str, list]:
+    sets = test_database.query(TrainingsTable.id, TrainingsTable.date, SetsTable.repetitions, SetsTable.weight).join(
+        SetsTable, SetsTable.training_id == TrainingsTable.id,
+    ).join(ExerciseTable, ExerciseTable.id == SetsTable.exercise_id).filter(
+        TrainingsTable.user_id == USER_ID,
+        ExerciseTable.exercise_name == exercise_name,
+    ).order_by(TrainingsTable.date, TrainingsTable.id).all()
+
+    sessions: dict[int, list] = {}
+    for training_id, training_date, repetitions, weight in sets:
+        sessions.setdefault(training_id, [training_date, []])[1].append((repetitions, weight))
+
+    def one_rep_max(repetitions: int, weight: float) -> float:
+        if formula == "brzycki" and repetitions < 37:  # noqa: PLR2004
+            return weight * 36 / (37 - repetitions)
+        return weight * (1 + repetitions / 30)
+
+    progress: dict[str, list] = {name: [] for name in ["training_ids", "dates", "set_counts", *FLOAT_FIELDS[:3]]}
+    for training_id, (training_date, training_sets) in sessions.items():
+        progress["training_ids"].append(training_id)
+        progress["dates"].append(training_date.isoformat())
+        progress["set_counts"].append(len(training_sets))
+        progress["volumes"].append(sum(repetitions * weight for repetitions, weight in training_sets))
+        progress["max_weights"].append(max(weight for _, weight in training_sets))
+        progress["estimated_one_rep_maxes"].append(max(starmap(one_rep_max, training_sets)))
+    for name, values in [("rolling_volumes", "volumes"), ("rolling_one_rep_maxes", "estimated_one_rep_maxes")]:
+        progress[name] = [
+            sum(progress[values][max(0, position + 1 - WINDOW):position + 1]) / min(position + 1, WINDOW)
+            for position in range(len(progress[values]))
+        ]
+    return progress
+
+
+@pytest.mark.parametrize("formula", ["epley", "brzycki"])
+def test_get_exercise_progress_matches_reference(formula: str, test_database: Session) -> None:
+    fill_database(test_database)
+    add_random_history(test_database)
+
+    response = client.get(
+        f"/analytics/progress/{USER_ID}",
+        params={"exercises": EXERCISES, "formula": formula, "window": WINDOW},
+    )
+    assert response.status_code == OK_STATUS
+    progress = response.json()
+    assert [exercise["exercise_name"] for exercise in progress] == EXERCISES
+
+    for exercise in progress:
+        expected = reference_progress(test_database, exercise["exercise_name"], formula)
+        assert expected["training_ids"]
+        for name, values in expected.items():
+            assert exercise[name] == (pytest.approx(values, abs=0.01) if name in FLOAT_FIELDS else values)
+
+
+def test_get_exercise_progress_of_filled_user(test_database: Session) -> None:
+    fill_database(test_database)
+    response = client.get("/analytics/progress/2", params={"exercises": ["Bench Press", "Chin-ups"]})
+    assert response.status_code == OK_STATUS
+    assert response.json() == [
+        {
+            "exercise_name": "Bench Press",
+            "training_ids": [3, 2],
+            "dates": ["2025-02-21", "2025-02-23"],
+            "set_counts": [2, 2],
+            "volumes": [2400.0, 2400.0],
+            "max_weights": [100.0, 100.0],
+            "estimated_one_rep_maxes": [140.0, 140.0],
+            "rolling_volumes": [2400.0, 2400.0],
+            "rolling_one_rep_maxes": [140.0, 140.0],
+        },
+        {
+            "exercise_name": "Chin-ups",
+            "training_ids": [],
+            "dates": [],
+            "set_counts": [],
+            "volumes": [],
+            "max_weights": [],
+            "estimated_one_rep_maxes": [],
+            "rolling_volumes": [],
+            "rolling_one_rep_maxes": [],
+        },
+    ]
+
+
+def test_get_exercise_progress_without_sets(test_database: Session) -> None:
+    fill_database(test_database)
+    response = client.get("/analytics/progress/3", params={"exercises": ["Bench Press"]})
+    assert response.status_code == OK_STATUS
+    assert response.json() == [{"exercise_name": "Bench Press"} | {field: [] for field in [
+        "training_ids", "dates", "set_counts", *FLOAT_FIELDS,
+    ]}]
+
+
+def test_packed_progress_sets_match_rows(test_database: Session) -> None:
+    fill_database(test_database)
+    add_random_history(test_database)
+    exercise_ids = [exercise_id for (exercise_id,) in test_database.query(ExerciseTable.id).filter(
+        ExerciseTable.exercise_name.in_(EXERCISES),
+    )]
+    rows = test_database.execute(
+        select(SetsTable.exercise_id, TrainingsTable.id, TrainingsTable.date, SetsTable.repetitions, SetsTable.weight)
+        .join(TrainingsTable, TrainingsTable.id == SetsTable.training_id)
+        .where(TrainingsTable.user_id == USER_ID, SetsTable.exercise_id.in_(exercise_ids))
+        .order_by(SetsTable.exercise_id, TrainingsTable.date, TrainingsTable.id),
+    ).tuples().all()
+
+    async def packed_sets() -> SetColumns:
+        async with TestingAsyncSessionLocal() as database:
+            return await progress_sets(database, USER_ID, exercise_ids)
+
+    packed, expected = asyncio.run(packed_sets()), SetColumns.from_rows(rows)
+    assert len(expected.exercise_ids) == len(rows)
+    for column in fields(SetColumns):
+        np.testing.assert_array_equal(getattr(packed, column.name), getattr(expected, column.name))
+
+
+@pytest.mark.parametrize(("params", "expected_status"), [
+    ({"exercises": ["Bench Press", "Unknown"]}, BAD_REQUEST_STATUS),
+    ({}, UNPROCESSABLE_STATUS),
+    ({"exercises": ["Bench Press"], "formula": "lombardi"}, UNPROCESSABLE_STATUS),
+    ({"exercises": ["Bench Press"], "window": 0}, UNPROCESSABLE_STATUS),
+])
+def test_get_exercise_progress_rejects_invalid_parameters(
+    params: dict[str, str | int | list[str]],
+    expected_status: int,
+    test_database: Session,
+) -> None:
+    fill_database(test_database)
+    response = client.get(f"/analytics/progress/{USER_ID}", params=params)
+    assert response.status_code == expected_status
@@ -1,14 +1,19 @@
 # ruff: noqa: S101
 import os
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 import pytest
 from fastapi.testclient import TestClient
+from passlib.context import CryptContext
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
-from fitness_tracker.database import Base
-from fitness_tracker.main import fitness_app, get_database
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.main import fitness_app
+from fitness_tracker.password_hashing import PasswordHasher
+from fitness_tracker.routers import authorization_router
 
 TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
 if not TESTING_DATABASE_URL:
@@ -16,16 +21,16 @@ if not TESTING_DATABASE_URL:
     raise ValueError(msg)
 
 engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
 
 
-def override_get_database() -> Generator:
-    try:
-        database = TestingSessionLocal()
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
         yield database
-    finally:
-        database.close()
 
 
 @pytest.fixture
@@ -41,6 +46,7 @@ fitness_app.dependency_overrides[get_database] = override_get_database
 client = TestClient(fitness_app)
 OK_STATUS: int = 200
 NOT_AUTHORIZED_STATUS: int = 401
+UNAVAILABLE_STATUS: int = 503
 
 
 @pytest.mark.parametrize(("user"), [
@@ -64,3 +70,18 @@ def test_login_for_access_failed(user: dict[str, str], wrong_password: str, test
     client.post("/auth/", json=user)
     response = client.post("/auth/token", data={"username": user["username"], "password": wrong_password})
     assert response.status_code == NOT_AUTHORIZED_STATUS
+
+
+def test_login_for_access_with_saturated_hashing_pool(test_database: Session, monkeypatch: pytest.MonkeyPatch) -> None:  # noqa: ARG001
+    user = {"username": "test1", "email": "email1@email.com", "password": "test2"}
+    client.post("/auth/", json=user)
+    # A pool without room for pending work rejects every hash and verification.
+    saturated = PasswordHasher(CryptContext(schemes=["bcrypt"]), workers=1, max_pending=0)
+    monkeypatch.setattr(authorization_router, "password_hasher", saturated)
+
+    for response in [
+        client.post("/auth/", json={**user, "username": "test3", "email": "email2@email.com"}),
+        client.post("/auth/token", data=user),
+    ]:
+        assert response.status_code == UNAVAILABLE_STATUS
+        assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,16 @@
+from collections.abc import Generator
+
+import pytest
+
+from fitness_tracker.exercise_cache import exercise_id_cache
+from fitness_tracker.exercise_catalog import exercise_catalog
+
+
+@pytest.fixture(autouse=True)
+def reset_exercise_caches() -> Generator:
+    # Every test recreates the tables, so caches filled by an earlier test would serve stale exercises.
+    exercise_catalog.reset()
+    exercise_id_cache.reset()
+    yield
+    exercise_catalog.reset()
+    exercise_id_cache.reset()
@@ -0,0 +1,115 @@
+# ruff: noqa: S101
+import asyncio
+import os
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+from fastapi import Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from fitness_tracker import database as database_module
+from fitness_tracker.database import Base, get_database, get_read_only_database, to_async_url
+from fitness_tracker.main import fitness_app
+from fitness_tracker.query_timing import QueryTimings, add_query_timing_hook, query_timing_hooks
+from fitness_tracker.replicas import ReplicaRouter, RoutingSession
+from test.database_filler import fill_database
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+client = TestClient(fitness_app)
+
+OK_STATUS: int = 200
+
+
+def session_factory(**engine_options: Any) -> async_sessionmaker:  # noqa: ANN401
+    # The same options as the application's session factory, bound to the testing database.
+    return async_sessionmaker(
+        bind=create_async_engine(to_async_url(TESTING_DATABASE_URL), **engine_options),
+        autoflush=False,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+    )
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def real_get_database(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Other test modules override get_database for the whole app, requests here go through the real dependency.
+    monkeypatch.delitem(fitness_app.dependency_overrides, get_database, raising=False)
+
+
+def test_read_only_session_is_reset_when_returned(monkeypatch: pytest.MonkeyPatch) -> None:
+    # A single pooled connection, so the session after the read-only one gets the very same connection.
+    session_local = session_factory(pool_size=1, max_overflow=0)
+    monkeypatch.setattr(database_module, "AsyncSessionLocal", session_local)
+    request = Request({"type": "http", "path_params": {"user_id": "1"}, "query_string": b"", "headers": []})
+
+    async def read_only_flags() -> tuple[str, str, int, int]:
+        sessions = get_database()
+        database = await anext(sessions)
+        read_only_database = await get_read_only_database(request, database, ReplicaRouter([], retry_seconds=30))
+        inside = await read_only_database.scalar(text("SHOW transaction_read_only"))
+        inside_backend = await read_only_database.scalar(text("SELECT pg_backend_pid()"))
+        await sessions.aclose()
+
+        async with session_local() as next_database:
+            afterwards = await next_database.scalar(text("SHOW transaction_read_only"))
+            afterwards_backend = await next_database.scalar(text("SELECT pg_backend_pid()"))
+        await session_local.kw["bind"].dispose()
+        return inside, afterwards, inside_backend, afterwards_backend
+
+    inside, afterwards, inside_backend, afterwards_backend = asyncio.run(read_only_flags())
+    assert inside_backend == afterwards_backend
+    assert (inside, afterwards) == ("on", "off")
+
+
+@pytest.mark.usefixtures("real_get_database")
+def test_timing_hook_receives_the_statements_of_a_request(
+    test_database: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fill_database(test_database)
+    # TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+    session_local = session_factory(poolclass=NullPool)
+    monkeypatch.setattr(database_module, "AsyncSessionLocal", session_local)
+
+    executed: list[str] = []
+    event.listen(
+        session_local.kw["bind"].sync_engine,
+        "before_cursor_execute",
+        lambda *arguments: executed.append(arguments[2]),
+    )
+    received: list[QueryTimings] = []
+    add_query_timing_hook(received.append)
+    try:
+        response = client.get("/trainings/details/1")
+        assert response.status_code == OK_STATUS
+        # Statements outside a request are not timed.
+        test_database.execute(text("SELECT 1"))
+    finally:
+        query_timing_hooks.remove(received.append)
+
+    assert len(received) == 1
+    assert executed
+    assert received[0].statements == len(executed)
+    assert received[0].slowest_statement in executed
+    assert received[0].total_seconds >= received[0].slowest_seconds > 0
@@ -5,6 +5,7 @@ from fitness_tracker.tables.profile_table import ProfileTable
 from fitness_tracker.tables.sets_table import SetsTable
 from fitness_tracker.tables.trainings_table import TrainingsTable
 from fitness_tracker.tables.users_table import UsersTable
+from fitness_tracker.training_stats.training_summaries import rebuild_training_summaries
 
 EXERCISES: list[dict[str, str]] = [
     {
@@ -183,6 +184,9 @@ def fill_database(db_session: Session) -> None:
                 db_session.add(set_record)
             db_session.commit()
 
+    # The sets are added directly, the summaries the write paths maintain are backfilled once.
+    rebuild_training_summaries(db_session)
+
 
 def fill_users(db_session: Session) -> None:
     for exercise_dict in EXERCISES:
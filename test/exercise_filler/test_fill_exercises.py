@@ -0,0 +1,158 @@
+# ruff: noqa: S101
+import json
+import os
+import threading
+from collections.abc import Generator
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from fitness_tracker.database import Base
+from fitness_tracker.exercise_database.exercise_filler import fetch_exercises, fetch_muscles
+from fitness_tracker.exercise_database.exercise_writer import upsert_exercises
+from fitness_tracker.tables.catalog_version_table import CatalogVersionTable
+from fitness_tracker.tables.exercise_table import ExerciseTable
+from fitness_tracker.tables.muscle_table import MuscleTable
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+MUSCLES: dict[str, Any] = {
+    "count": 3,
+    "next": None,
+    "results": [
+        {"id": 1, "name_en": "Biceps"},
+        {"id": 2, "name_en": "Chest"},
+        {"id": 3, "name_en": ""},
+    ],
+}
+# Recorded from the exercise endpoint with a page size of 2, the last page repeats a name like wger does.
+EXERCISES: list[dict[str, Any]] = [
+    {"name": "Bench Press", "muscles": [2]},
+    {"name": "Biceps Curl", "muscles": [1]},
+    {"name": "Stretching", "muscles": [3]},
+    {"name": "Chin-ups", "muscles": [1, 2]},
+    {"name": "Bench Press", "muscles": [2, 1]},
+]
+PAGE_SIZE: int = 2
+
+
+class RecordedWgerHandler(BaseHTTPRequestHandler):
+    requested_offsets: list[int] = []  # noqa: RUF012
+
+    def do_GET(self) -> None:  # noqa: N802
+        url = urlsplit(self.path)
+        if url.path == "/muscle":
+            self._send(MUSCLES)
+            return
+
+        query = parse_qs(url.query)
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query.get("limit", [str(PAGE_SIZE)])[0])
+        self.requested_offsets.append(offset)
+        next_offset = offset + limit
+        self._send({
+            "count": len(EXERCISES),
+            "next": f"/exercise/?language=2&limit={limit}&offset={next_offset}"
+            if next_offset < len(EXERCISES) else None,
+            "results": EXERCISES[offset:next_offset],
+        })
+
+    def _send(self, body: dict[str, Any]) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *_: Any) -> None:  # noqa: ANN401
+        pass
+
+
+@pytest.fixture
+def wger_url() -> Generator:
+    RecordedWgerHandler.requested_offsets = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RecordedWgerHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_exercises_reads_every_page(wger_url: str) -> None:
+    muscle_map = fetch_muscles(f"{wger_url}/muscle")
+    exercises = list(fetch_exercises(muscle_map, f"{wger_url}/exercise/?language=2", workers=2))
+
+    assert exercises == [
+        ("Bench Press", "Chest"),
+        ("Biceps Curl", "Biceps"),
+        ("Chin-ups", "Biceps, Chest"),
+        ("Bench Press", "Chest, Biceps"),
+    ]
+    assert sorted(RecordedWgerHandler.requested_offsets) == [0, 2, 4]
+
+
+def test_upsert_exercises_inserts_and_updates(wger_url: str, test_database: Session) -> None:
+    test_database.add(ExerciseTable(exercise_name="Chin-ups", muscle_group="Lats"))
+    test_database.commit()
+
+    muscle_map = fetch_muscles(f"{wger_url}/muscle")
+    upsert_exercises(test_database, fetch_exercises(muscle_map, f"{wger_url}/exercise/?language=2"), batch_size=2)
+
+    exercises = test_database.execute(
+        select(ExerciseTable.exercise_name, ExerciseTable.muscle_group).order_by(ExerciseTable.exercise_name),
+    ).all()
+    assert exercises == [
+        ("Bench Press", "Chest, Biceps"),
+        ("Biceps Curl", "Biceps"),
+        ("Chin-ups", "Biceps, Chest"),
+    ]
+    assert test_database.scalar(select(CatalogVersionTable.version)) == 1
+
+
+def test_upsert_exercises_skips_unchanged_rows(test_database: Session) -> None:
+    exercises = [("Bench Press", "Chest"), ("Biceps Curl", "Biceps")]
+    assert upsert_exercises(test_database, exercises) == len(exercises)
+    assert upsert_exercises(test_database, exercises) == 0
+    assert test_database.scalar(select(CatalogVersionTable.version)) == 1
+
+
+def test_upsert_exercises_stores_muscle_masks(wger_url: str, test_database: Session) -> None:
+    muscle_map = fetch_muscles(f"{wger_url}/muscle")
+    muscle_names = [muscle for muscle in muscle_map.values() if muscle]
+    exercises = fetch_exercises(muscle_map, f"{wger_url}/exercise/?language=2")
+    upsert_exercises(test_database, exercises, muscle_names=muscle_names)
+
+    muscle_bits = dict(test_database.execute(select(MuscleTable.name, MuscleTable.bit)).tuples().all())
+    assert set(muscle_bits) == {"Biceps", "Chest"}
+    muscle_masks = dict(test_database.execute(
+        select(ExerciseTable.exercise_name, ExerciseTable.muscle_mask),
+    ).tuples().all())
+    assert muscle_masks == {
+        "Bench Press": 1 << muscle_bits["Chest"] | 1 << muscle_bits["Biceps"],
+        "Biceps Curl": 1 << muscle_bits["Biceps"],
+        "Chin-ups": 1 << muscle_bits["Chest"] | 1 << muscle_bits["Biceps"],
+    }
@@ -0,0 +1,91 @@
+# ruff: noqa: S101
+import gzip
+import json
+import os
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from fitness_tracker.database import Base
+from fitness_tracker.exercise_database.exercise_writer import upsert_exercises
+from fitness_tracker.exercise_database.snapshot import export_snapshot, import_snapshot, read_snapshot
+from fitness_tracker.tables.catalog_version_table import CatalogVersionTable
+from fitness_tracker.tables.exercise_table import ExerciseTable
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+EXERCISES: list[tuple[str, str]] = [(f"Exercise {number}", f"Muscle {number % 7}") for number in range(1000)]
+
+
+def all_exercises(test_database: Session) -> list[tuple[str, str]]:
+    return list(test_database.execute(
+        select(ExerciseTable.exercise_name, ExerciseTable.muscle_group).order_by(ExerciseTable.exercise_name),
+    ).tuples())
+
+
+def test_export_snapshot_round_trip(test_database: Session, tmp_path: Path) -> None:
+    upsert_exercises(test_database, EXERCISES)
+    snapshot = tmp_path / "exercises.ndjson.gz"
+
+    assert export_snapshot(test_database, snapshot) == len(EXERCISES)
+    assert sorted(read_snapshot(snapshot)) == sorted(EXERCISES)
+    first_export = snapshot.read_bytes()
+    export_snapshot(test_database, snapshot)
+    assert snapshot.read_bytes() == first_export
+
+
+def test_import_snapshot_writes_only_changes(test_database: Session, tmp_path: Path) -> None:
+    snapshot = tmp_path / "exercises.ndjson.gz"
+    rows: list[dict[str, Any]] = [
+        {"exercise_name": exercise_name, "muscle_group": muscle_group} for exercise_name, muscle_group in EXERCISES
+    ]
+    rows[0]["muscle_group"] = "Changed"
+    rows.append({"exercise_name": "New Exercise", "muscle_group": "Chest"})
+    with gzip.open(snapshot, "wt", encoding="utf-8") as snapshot_file:
+        snapshot_file.writelines(f"{json.dumps(row)}\n" for row in rows)
+
+    upsert_exercises(test_database, EXERCISES)
+    assert import_snapshot(test_database, snapshot) == 2  # noqa: PLR2004
+    assert all_exercises(test_database) == sorted((row["exercise_name"], row["muscle_group"]) for row in rows)
+    assert test_database.scalar(select(CatalogVersionTable.version)) == 2  # noqa: PLR2004
+
+
+def test_import_unchanged_snapshot_is_read_only(test_database: Session, tmp_path: Path) -> None:
+    upsert_exercises(test_database, EXERCISES)
+    snapshot = tmp_path / "exercises.ndjson.gz"
+    export_snapshot(test_database, snapshot)
+
+    statements: list[str] = []
+
+    def before_cursor_execute(*args: Any) -> None:  # noqa: ANN401
+        statements.append(args[2])
+
+    event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        assert import_snapshot(test_database, snapshot) == 0
+    finally:
+        event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+    assert all(statement.lstrip().upper().startswith("SELECT") for statement in statements)
+    assert test_database.scalar(select(CatalogVersionTable.version)) == 1
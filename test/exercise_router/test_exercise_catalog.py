@@ -0,0 +1,102 @@
+# ruff: noqa: S101
+import os
+from collections.abc import AsyncGenerator, Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.exercise_catalog import DATABASE_BACKEND, ExerciseIndex, bump_catalog_version, exercise_catalog
+from fitness_tracker.main import fitness_app
+from fitness_tracker.models.exercise import Exercise
+from fitness_tracker.tables.exercise_table import ExerciseTable
+from test.database_filler import fill_database
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
+        yield database
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+fitness_app.dependency_overrides[get_database] = override_get_database
+client = TestClient(fitness_app)
+
+
+OK_STATUS: int = 200
+
+INDEXED_EXERCISES: list[Exercise] = [
+    Exercise(exercise_name=exercise_name, muscle_group="Chest")
+    for exercise_name in ["Incline Press", "Press-ups", "Barbell Press", "Leg Press", "Pressdown", "Ab Rollout 100%"]
+]
+
+
+@pytest.mark.parametrize(("characters", "expected_names"), [
+    ("press", ["Press-ups", "Pressdown", "Barbell Press", "Incline Press", "Leg Press"]),
+    ("PRESS-", ["Press-ups"]),
+    ("e", ["Barbell Press", "Incline Press", "Leg Press", "Press-ups", "Pressdown"]),
+    ("ss-u", ["Press-ups"]),
+    ("100%", ["Ab Rollout 100%"]),
+    ("_", []),
+    ("pressing", []),
+])
+def test_exercise_index_ranks_prefix_before_infix(characters: str, expected_names: list[str]) -> None:
+    index = ExerciseIndex(INDEXED_EXERCISES)
+    assert [exercise.exercise_name for exercise in index.search(characters)] == expected_names
+
+
+def test_exercise_catalog_reloads_after_version_bump(
+    test_database: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fill_database(test_database)
+    monkeypatch.setattr(exercise_catalog, "refresh_seconds", 0)
+    assert client.get("/exercise/search", params={"characters": "squat"}).json() is None
+
+    test_database.add(ExerciseTable(exercise_name="Goblet Squat", muscle_group="Quads"))
+    test_database.commit()
+    assert client.get("/exercise/search", params={"characters": "squat"}).json() is None
+
+    bump_catalog_version(test_database)
+    test_database.commit()
+    response = client.get("/exercise/search", params={"characters": "squat"})
+    assert response.status_code == OK_STATUS
+    assert response.json() == [{"exercise_name": "Goblet Squat", "muscle_group": "Quads"}]
+
+
+def test_exercise_search_database_backend(test_database: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    fill_database(test_database)
+    monkeypatch.setattr("fitness_tracker.routers.exercise_router.SEARCH_BACKEND", DATABASE_BACKEND)
+    response = client.get("/exercise/search", params={"characters": "bench"})
+    assert response.status_code == OK_STATUS
+    assert {exercise["exercise_name"] for exercise in response.json()} == {
+        "Barbell Bench Press - NB",
+        "Bench Dips On Floor HD",
+        "Bench Press",
+        "Bench Press Narrow Grip",
+        "Benchpress Dumbbells",
+    }
@@ -0,0 +1,114 @@
+# ruff: noqa: S101
+import os
+from collections.abc import AsyncGenerator, Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.exercise_catalog import ExerciseIndex
+from fitness_tracker.main import fitness_app
+from fitness_tracker.models.exercise import Exercise
+from test.database_filler import fill_database
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
+        yield database
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+fitness_app.dependency_overrides[get_database] = override_get_database
+client = TestClient(fitness_app)
+
+
+OK_STATUS: int = 200
+
+CATALOG: list[str] = [
+    "Australian pull-ups",
+    "Barbell Bench Press - NB",
+    "Bench Dips On Floor HD",
+    "Bench Press",
+    "Bench Press Narrow Grip",
+    "Benchpress Dumbbells",
+    "Biceps Curls With Barbell",
+    "Calf Raises",
+    "Chin-ups",
+    "Close-grip Press-ups",
+    "Crunches With Legs Up",
+    "Deadlifts",
+    "Decline Pushups",
+    "Dips",
+    "Face Pull",
+    "Front Squats",
+    "Hammercurls",
+    "Hip Thrust",
+    "Incline Dumbbell Press",
+    "Lat Pull Down (Straight Back)",
+    "Leg Curls (laying)",
+    "Leg Press",
+    "Lunges",
+    "Overhead Squat",
+    "Plank",
+    "Pull-ups",
+    "Romanian Deadlift",
+    "Shoulder Press, Dumbbells",
+    "Squats",
+    "Triceps Extensions on Cable",
+]
+
+
+@pytest.mark.parametrize(("characters", "expected_name"), [
+    ("bench pres", "Bench Press"),
+    ("benchpress", "Bench Press"),
+    ("barbel bench", "Barbell Bench Press - NB"),
+    ("chinups", "Chin-ups"),
+    ("declne pushup", "Decline Pushups"),
+    ("sqats", "Squats"),
+    ("dedlift", "Deadlifts"),
+    ("hamer curl", "Hammercurls"),
+    ("latpulldown", "Lat Pull Down (Straight Back)"),
+    ("pulups", "Pull-ups"),
+    ("inclin dumbell press", "Incline Dumbbell Press"),
+    ("tricep extension", "Triceps Extensions on Cable"),
+    ("overhead squats", "Overhead Squat"),
+])
+def test_fuzzy_search_ranks_intended_exercise_first(characters: str, expected_name: str) -> None:
+    index = ExerciseIndex([Exercise(exercise_name=exercise_name, muscle_group="Chest") for exercise_name in CATALOG])
+    assert index.fuzzy_search(characters)[0].exercise_name == expected_name
+
+
+def test_fuzzy_search_ignores_unrelated_exercises() -> None:
+    index = ExerciseIndex([Exercise(exercise_name=exercise_name, muscle_group="Chest") for exercise_name in CATALOG])
+    assert index.fuzzy_search("xyzzy") == []
+
+
+def test_get_exercises_fuzzy_mode(test_database: Session) -> None:
+    fill_database(test_database)
+    response = client.get("/exercise/search", params={"characters": "bench pres", "mode": "fuzzy"})
+    assert response.status_code == OK_STATUS
+    assert response.json()[0] == {"exercise_name": "Bench Press", "muscle_group": "Chest"}
@@ -1,14 +1,16 @@
 # ruff: noqa: S101
 import os
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
-from fitness_tracker.database import Base
-from fitness_tracker.main import fitness_app, get_database
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.main import fitness_app
 from test.database_filler import fill_database
 
 TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
@@ -17,16 +19,16 @@ if not TESTING_DATABASE_URL:
     raise ValueError(msg)
 
 engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
 
 
-def override_get_database() -> Generator:
-    try:
-        database = TestingSessionLocal()
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
         yield database
-    finally:
-        database.close()
 
 
 @pytest.fixture
@@ -66,10 +68,6 @@ client = TestClient(fitness_app)
         },
     ]),
     ("bench", [
-        {
-            "exercise_name": "Barbell Bench Press - NB",
-            "muscle_group": "Chest",
-        },
         {
             "exercise_name": "Bench Dips On Floor HD",
             "muscle_group": "Biceps, Triceps",
@@ -86,6 +84,10 @@ client = TestClient(fitness_app)
             "exercise_name": "Benchpress Dumbbells",
             "muscle_group": "Chest",
         },
+        {
+            "exercise_name": "Barbell Bench Press - NB",
+            "muscle_group": "Chest",
+        },
     ]),
     ("123;'[]", None,
     ),
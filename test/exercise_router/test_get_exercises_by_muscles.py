@@ -0,0 +1,105 @@
+# ruff: noqa: S101
+import os
+from collections.abc import AsyncGenerator, Generator
+from typing import NoReturn
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.exercise_catalog import DATABASE_BACKEND, MEMORY_BACKEND
+from fitness_tracker.exercise_database.exercise_writer import upsert_exercises
+from fitness_tracker.main import fitness_app
+from test.database_filler import EXERCISES
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
+        yield database
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+fitness_app.dependency_overrides[get_database] = override_get_database
+client = TestClient(fitness_app)
+
+
+OK_STATUS: int = 200
+BAD_REQUEST_STATUS: int = 400
+
+
+@pytest.mark.parametrize("backend", [MEMORY_BACKEND, DATABASE_BACKEND])
+@pytest.mark.parametrize(("characters", "muscles", "expected_names"), [
+    ("", ["Biceps"], ["Australian pull-ups", "Bench Dips On Floor HD"]),
+    ("up", ["lats"], ["Australian pull-ups", "Chin-ups", "Close-grip Press-ups"]),
+    ("up", ["Lats", "Chest"], ["Close-grip Press-ups"]),
+    ("bench", ["Triceps", "Chest"], []),
+])
+def test_get_exercises_by_muscles(  # noqa: PLR0913, PLR0917
+    backend: str,
+    characters: str,
+    muscles: list[str],
+    expected_names: list[str],
+    test_database: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    upsert_exercises(test_database, [(exercise["exercise_name"], exercise["muscle_group"]) for exercise in EXERCISES])
+    monkeypatch.setattr("fitness_tracker.routers.exercise_router.SEARCH_BACKEND", backend)
+
+    response = client.get("/exercise/search", params={"characters": characters, "muscles": muscles})
+    assert response.status_code == OK_STATUS
+    exercises = response.json() or []
+    assert sorted(exercise["exercise_name"] for exercise in exercises) == expected_names
+    for exercise in exercises:
+        assert {muscle.casefold() for muscle in muscles} <= {
+            muscle.strip().casefold() for muscle in exercise["muscle_group"].split(",")
+        }
+
+
+@pytest.mark.parametrize("backend", [MEMORY_BACKEND, DATABASE_BACKEND])
+def test_get_exercises_by_unknown_muscle(backend: str, test_database: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    upsert_exercises(test_database, [(exercise["exercise_name"], exercise["muscle_group"]) for exercise in EXERCISES])
+    monkeypatch.setattr("fitness_tracker.routers.exercise_router.SEARCH_BACKEND", backend)
+
+    response = client.get("/exercise/search", params={"characters": "up", "muscles": ["Wings"]})
+    assert response.status_code == BAD_REQUEST_STATUS
+    assert response.json()["detail"] == "Muscle Wings does not exist in database"
+
+
+def test_database_search_without_muscles_skips_muscle_bits(
+    test_database: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    upsert_exercises(test_database, [(exercise["exercise_name"], exercise["muscle_group"]) for exercise in EXERCISES])
+    monkeypatch.setattr("fitness_tracker.routers.exercise_router.SEARCH_BACKEND", DATABASE_BACKEND)
+
+    def unexpected_fetch(*_: object) -> NoReturn:
+        pytest.fail("The muscle bits were fetched for a search without muscles.")
+
+    monkeypatch.setattr("fitness_tracker.routers.exercise_router.fetch_muscle_bits", unexpected_fetch)
+    response = client.get("/exercise/search", params={"characters": "chin"})
+    assert response.status_code == OK_STATUS
+    assert [exercise["exercise_name"] for exercise in response.json()] == ["Chin-ups"]
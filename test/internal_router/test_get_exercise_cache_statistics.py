@@ -0,0 +1,105 @@
+# ruff: noqa: S101
+import os
+from collections.abc import AsyncGenerator, Generator
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.exercise_cache import exercise_id_cache
+from fitness_tracker.exercise_catalog import bump_catalog_version
+from fitness_tracker.main import fitness_app
+from test.database_filler import fill_users
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
+        yield database
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+fitness_app.dependency_overrides[get_database] = override_get_database
+client = TestClient(fitness_app)
+
+OK_STATUS: int = 200
+CREATED_STATUS: int = 201
+
+
+TRAINING: dict[str, Any] = {
+    "training": {"training_name": "test1", "date": "2025-02-23"},
+    "sets": [
+        {"exercise_name": "Bench Press", "repetitions": 12, "weight": 100},
+        {"exercise_name": "Chin-ups", "repetitions": 8, "weight": 0},
+    ],
+}
+
+
+def create_training_statements() -> list[str]:
+    statements: list[str] = []
+
+    def before_cursor_execute(*args: Any) -> None:  # noqa: ANN401
+        statements.append(args[2])
+
+    event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.post("/trainings/", params={"user_id": 1}, json=TRAINING)
+    finally:
+        event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+    assert response.status_code == CREATED_STATUS
+    return statements
+
+
+def test_get_exercise_cache_statistics(test_database: Session) -> None:
+    fill_users(test_database)
+    before = client.get("/internal/exercise-cache").json()
+
+    first_statements = create_training_statements()
+    assert any("FROM exercise" in statement for statement in first_statements)
+    second_statements = create_training_statements()
+    assert not any("FROM exercise" in statement for statement in second_statements)
+
+    response = client.get("/internal/exercise-cache")
+    assert response.status_code == OK_STATUS
+    statistics = response.json()
+    assert statistics["size"] == len(TRAINING["sets"])
+    assert statistics["misses"] - before["misses"] == len(TRAINING["sets"])
+    assert statistics["hits"] - before["hits"] == len(TRAINING["sets"])
+
+
+def test_exercise_cache_invalidated_by_version_bump(test_database: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    fill_users(test_database)
+    monkeypatch.setattr(exercise_id_cache, "refresh_seconds", 0)
+    create_training_statements()
+    invalidations = client.get("/internal/exercise-cache").json()["invalidations"]
+
+    bump_catalog_version(test_database)
+    test_database.commit()
+    statements = create_training_statements()
+    assert any("FROM exercise" in statement for statement in statements)
+    assert client.get("/internal/exercise-cache").json()["invalidations"] == invalidations + 1
@@ -0,0 +1,62 @@
+# ruff: noqa: S101
+import os
+from collections.abc import AsyncGenerator, Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.main import fitness_app
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
+        yield database
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+fitness_app.dependency_overrides[get_database] = override_get_database
+client = TestClient(fitness_app)
+
+OK_STATUS: int = 200
+
+
+@pytest.mark.parametrize(("user"), [
+    {"username": "test1", "email": "email1@email.com", "password": "test2"},
+])
+def test_get_hashing_statistics(user: dict[str, str], test_database: Session) -> None:  # noqa: ARG001
+    hashed_before = client.get("/internal/hashing").json()["latency"]["count"]
+
+    client.post("/auth/", json=user)
+    client.post("/auth/token", data=user)
+
+    response = client.get("/internal/hashing")
+    assert response.status_code == OK_STATUS
+    statistics = response.json()
+    assert statistics["latency"]["count"] == hashed_before + 2
+    assert statistics["in_flight"] == 0
+    assert statistics["queue_depth"] == 0
@@ -0,0 +1,44 @@
+# ruff: noqa: S101
+import asyncio
+import os
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from fitness_tracker.database import POOL_SIZE, create_monitored_async_engine
+from fitness_tracker.main import fitness_app
+from fitness_tracker.pool_monitor import PoolMonitor
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+client = TestClient(fitness_app)
+
+OK_STATUS: int = 200
+QUERIES: int = 3
+
+
+def test_get_pool_statistics() -> None:
+    response = client.get("/internal/pool")
+    assert response.status_code == OK_STATUS
+    assert response.json()["pool_size"] == POOL_SIZE
+
+
+def test_pool_monitor_counts_checkouts() -> None:
+    monitor = PoolMonitor()
+
+    async def run_queries() -> None:
+        monitored_engine = create_monitored_async_engine(TESTING_DATABASE_URL, monitor)
+        for _ in range(QUERIES):
+            async with monitored_engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        await monitored_engine.dispose()
+
+    asyncio.run(run_queries())
+
+    statistics = monitor.statistics()
+    assert statistics.checked_out == 0
+    assert statistics.connections_created == 1
+    assert statistics.checkout_wait.count == QUERIES
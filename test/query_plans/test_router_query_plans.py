@@ -0,0 +1,213 @@
+# ruff: noqa: S101
+import asyncio
+import os
+from collections.abc import AsyncGenerator, Generator, Iterator
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from httpx import Response
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.main import fitness_app
+from fitness_tracker.training_stats.exercise_usage import rebuild_exercise_usage
+from fitness_tracker.training_stats.personal_records import rebuild_personal_records
+from fitness_tracker.training_stats.training_rollups import rebuild_training_rollups
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
+        yield database
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+fitness_app.dependency_overrides[get_database] = override_get_database
+client = TestClient(fitness_app)
+
+USERS: int = 2000
+TRAININGS_PER_USER: int = 25
+SETS_PER_TRAINING: int = 4
+EXERCISES: int = 50
+# The exercise catalog stays small, every other table grows with the number of users.
+LARGE_TABLES: set[str] = {
+    "users", "user_profile", "trainings", "sets", "exercise_usage", "personal_records",
+    "training_rollups", "muscle_rollups",
+}
+EXPLAINED_STATEMENTS: tuple[str, ...] = ("SELECT", "UPDATE", "DELETE")
+OK_STATUS: int = 200
+CREATED_STATUS: int = 201
+
+# Foreign key cascades run inside Postgres triggers, so EXPLAIN of the parent delete does not show them.
+CASCADE_STATEMENTS: list[str] = [
+    "SELECT 1 FROM sets WHERE training_id = 1",
+    "SELECT 1 FROM sets WHERE exercise_id = 1",
+    "SELECT 1 FROM trainings WHERE user_id = 1",
+    "SELECT 1 FROM user_profile WHERE user_id = 1",
+    "SELECT 1 FROM exercise_usage WHERE user_id = 1",
+    "SELECT 1 FROM exercise_usage WHERE exercise_id = 1",
+    "SELECT 1 FROM personal_records WHERE user_id = 1",
+    "SELECT 1 FROM personal_records WHERE exercise_id = 1",
+    "SELECT 1 FROM training_rollups WHERE user_id = 1",
+    "SELECT 1 FROM muscle_rollups WHERE user_id = 1",
+]
+
+
+def seed_large_dataset(test_database: Session) -> None:
+    test_database.execute(text(
+        "INSERT INTO exercise (exercise_name, muscle_group) "
+        "SELECT 'exercise ' || n, 'group ' || n % 8 FROM generate_series(1, :exercises) AS n",
+    ), {"exercises": EXERCISES})
+    test_database.execute(text(
+        "INSERT INTO users (username, email, password) "
+        "SELECT 'user' || n, 'user' || n || '@example.com', 'password' FROM generate_series(1, :users) AS n",
+    ), {"users": USERS})
+    test_database.execute(text(
+        "INSERT INTO user_profile (user_id, age, weight, height) SELECT id, 30, 80, 180 FROM users",
+    ))
+    test_database.execute(text(
+        "INSERT INTO trainings (name, user_id, date) "
+        "SELECT 'training ' || n % 40, users.id, DATE '2020-01-01' + n % 1500 "
+        "FROM users CROSS JOIN generate_series(1, :trainings) AS n",
+    ), {"trainings": TRAININGS_PER_USER})
+    test_database.execute(text(
+        "INSERT INTO sets (training_id, exercise_id, repetitions, weight) "
+        "SELECT trainings.id, 1 + (trainings.id + n) % :exercises, 10, 50 "
+        "FROM trainings CROSS JOIN generate_series(1, :sets) AS n",
+    ), {"exercises": EXERCISES, "sets": SETS_PER_TRAINING})
+    rebuild_exercise_usage(test_database)
+    rebuild_personal_records(test_database)
+    rebuild_training_rollups(test_database)
+    test_database.commit()
+
+    with engine.connect() as connection:
+        connection.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE"))
+
+
+def succeeded(response: Response, status_code: int = OK_STATUS) -> Response:
+    # An endpoint that fails does not run all of its statements, which would then escape the plan check.
+    assert response.status_code == status_code, response.text
+    return response
+
+
+def call_every_router_query() -> None:
+    user = {"username": "planner", "email": "planner@example.com", "password": "Password1!"}
+    succeeded(client.post("/auth/", json=user), CREATED_STATUS)
+    tokens = succeeded(client.post("/auth/token", data=user)).json()
+    succeeded(client.post("/auth/refresh", params={"refresh_token": tokens["refresh_token"]}))
+
+    succeeded(client.get("/profile/1"))
+    succeeded(client.put("/profile/update/1", json={"age": 31, "weight": 81, "height": 181}))
+
+    for sort_by, order in [("name", "asc"), ("date", "desc")]:
+        params = {"sort_by": sort_by, "order": order}
+        succeeded(client.get("/trainings/fetch/sorted/1", params=params))
+        next_cursor = succeeded(client.get("/trainings/fetch/page/1", params=params)).json()["next_cursor"]
+        succeeded(client.get("/trainings/fetch/page/1", params={**params, "cursor": next_cursor}))
+    succeeded(client.get("/trainings/fetch/search", params={"characters": "training 1", "user_id": 1}))
+    succeeded(
+        client.get("/trainings/range/1", params={"from": "2021-03-01", "to": "2021-05-31", "name": "training 1"}),
+    )
+    succeeded(client.get("/trainings/details/1"))
+    succeeded(client.get("/trainings/export/1"))
+    succeeded(client.get("/exercise/search", params={"characters": "exercise 1", "user_id": 1}))
+    succeeded(client.get("/analytics/progress/1", params={"exercises": ["exercise 1", "exercise 2"]}))
+    succeeded(client.get("/analytics/records/1"))
+    succeeded(
+        client.get("/analytics/rollups/1", params={"granularity": "month", "from": "2020-01-01", "to": "2024-12-31"}),
+    )
+
+    sets = succeeded(client.get("/trainings/details/2")).json()["sets"]
+    sets[0]["repetitions"] += 1
+    succeeded(client.put(
+        "/trainings/update/2",
+        json=sets[1:] + [{"exercise_name": "exercise 3", "repetitions": 5, "weight": 20}],
+    ))
+    succeeded(
+        client.post(
+            "/trainings/",
+            params={"user_id": 1},
+            json={
+                "training": {"training_name": "planned", "date": "2025-01-01"},
+                "sets": [{"exercise_name": "exercise 1", "repetitions": 5, "weight": 20}],
+            },
+        ),
+        CREATED_STATUS,
+    )
+    succeeded(client.delete("/trainings/delete/3", params={"user_id": 1}))
+    succeeded(client.post("/auth/delete", json={"access_token": tokens["access_token"], "password": user["password"]}))
+
+
+def record_statements() -> tuple[list[tuple[str, Any]], Any]:
+    statements: list[tuple[str, Any]] = []
+
+    def before_cursor_execute(*args: Any) -> None:  # noqa: ANN401
+        _, _, statement, parameters, _, executemany = args
+        if statement.lstrip().upper().startswith(EXPLAINED_STATEMENTS):
+            statements.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+    return statements, before_cursor_execute
+
+
+async def explain(statements: list[tuple[str, Any]]) -> list[tuple[str, dict]]:
+    plans = []
+    async with async_engine.connect() as connection:
+        for statement, parameters in statements:
+            result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plans.append((statement, result.scalar()[0]["Plan"]))
+    return plans
+
+
+def plan_nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def sequential_scans(plan: dict) -> set[str]:
+    return {
+        node["Relation Name"]
+        for node in plan_nodes(plan)
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in LARGE_TABLES
+    }
+
+
+def test_router_queries_use_indexes(test_database: Session) -> None:
+    seed_large_dataset(test_database)
+
+    statements, listener = record_statements()
+    try:
+        call_every_router_query()
+    finally:
+        event.remove(Engine, "before_cursor_execute", listener)
+    statements.extend((statement, ()) for statement in CASCADE_STATEMENTS)
+
+    plans = asyncio.run(explain(statements))
+    assert len(plans) > len(CASCADE_STATEMENTS)
+    scanning = {statement: sequential_scans(plan) for statement, plan in plans if sequential_scans(plan)}
+    assert scanning == {}
@@ -0,0 +1,199 @@
+# ruff: noqa: S101
+import asyncio
+import os
+from collections.abc import AsyncGenerator, Generator
+from pathlib import Path
+from time import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from fitness_tracker.database import Base, get_database, get_replica_router, to_async_url
+from fitness_tracker.main import fitness_app
+from fitness_tracker.replicas import LAST_WRITE_HEADER, ReplicaRouter, RoutingSession
+from fitness_tracker.tables.exercise_table import ExerciseTable
+from test.database_filler import fill_database, fill_users
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    sync_session_class=RoutingSession,
+)
+
+
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
+        yield database
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def use_replica(replica_url: str) -> Generator:
+    replica_engine = create_async_engine(to_async_url(replica_url), poolclass=NullPool)
+    router = ReplicaRouter([replica_engine], retry_seconds=30)
+    previous_override = fitness_app.dependency_overrides.get(get_database)
+    fitness_app.dependency_overrides[get_database] = override_get_database
+    fitness_app.dependency_overrides[get_replica_router] = lambda: router
+    yield router
+    fitness_app.dependency_overrides.pop(get_replica_router)
+    if previous_override is not None:
+        fitness_app.dependency_overrides[get_database] = previous_override
+
+
+@pytest.fixture
+def replica(tmp_path: Path) -> Generator:
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    replica_engine = create_engine(replica_url)
+    Base.metadata.create_all(bind=replica_engine)
+    with Session(replica_engine) as replica_session:
+        replica_session.add(ExerciseTable(exercise_name="Replica Curl", muscle_group="Biceps"))
+        replica_session.commit()
+
+    yield from use_replica(replica_url)
+    replica_engine.dispose()
+
+
+@pytest.fixture
+def broken_replica() -> Generator:
+    # Nothing listens on port 1, so every connection to the replica is refused.
+    yield from use_replica("postgresql://replica@127.0.0.1:1/replica")
+
+
+client = TestClient(fitness_app)
+
+OK_STATUS: int = 200
+CREATED_STATUS: int = 201
+FRONTEND_URL: str | None = os.getenv("FRONTEND_URL")
+NEW_TRAINING: dict = {
+    "training": {"training_name": "fresh", "date": "2025-03-01"},
+    "sets": [{"exercise_name": "Bench Press", "repetitions": 5, "weight": 100}],
+}
+
+
+def test_reads_are_routed_to_replica(test_database: Session, replica: ReplicaRouter) -> None:  # noqa: ARG001
+    fill_database(test_database)
+    response = client.get("/exercise/search", params={"characters": "curl"})
+    assert response.status_code == OK_STATUS
+    assert response.json() == [{"exercise_name": "Replica Curl", "muscle_group": "Biceps"}]
+
+
+def test_recent_writes_are_read_from_primary(test_database: Session, replica: ReplicaRouter) -> None:  # noqa: ARG001
+    fill_users(test_database)
+    response = client.post("/trainings/", params={"user_id": 1}, json=NEW_TRAINING)
+    assert response.status_code == CREATED_STATUS
+
+    response = client.get(
+        "/trainings/fetch/sorted/1",
+        params={"sort_by": "date", "order": "desc"},
+        headers={LAST_WRITE_HEADER: response.headers[LAST_WRITE_HEADER]},
+    )
+    assert response.status_code == OK_STATUS
+    assert [training["training_name"] for training in response.json()] == ["fresh"]
+
+
+def test_cross_origin_client_without_credentials_reads_its_writes(
+    test_database: Session,
+    replica: ReplicaRouter,  # noqa: ARG001
+) -> None:
+    fill_users(test_database)
+    # Like the frontend, the browser sends no cookies and only exposed headers can be read from the response.
+    browser = TestClient(fitness_app, headers={"Origin": FRONTEND_URL})
+    response = browser.post("/trainings/", params={"user_id": 1}, json=NEW_TRAINING)
+    assert response.status_code == CREATED_STATUS
+    assert "set-cookie" not in response.headers
+    assert LAST_WRITE_HEADER in response.headers["access-control-expose-headers"].split(",")
+
+    preflight = browser.options(
+        "/trainings/fetch/sorted/1",
+        headers={"Access-Control-Request-Method": "GET", "Access-Control-Request-Headers": LAST_WRITE_HEADER},
+    )
+    assert preflight.status_code == OK_STATUS
+    assert preflight.headers["access-control-allow-origin"] == FRONTEND_URL
+
+    response = browser.get(
+        "/trainings/fetch/sorted/1",
+        params={"sort_by": "date", "order": "desc"},
+        headers={LAST_WRITE_HEADER: response.headers[LAST_WRITE_HEADER]},
+    )
+    assert response.status_code == OK_STATUS
+    assert [training["training_name"] for training in response.json()] == ["fresh"]
+
+
+def test_unhealthy_replica_falls_back_to_primary(
+    test_database: Session,
+    broken_replica: ReplicaRouter,
+) -> None:
+    fill_database(test_database)
+    response = client.get("/exercise/search", params={"characters": "Bench Press"})
+    assert response.status_code == OK_STATUS
+    assert response.json()[0]["exercise_name"] == "Bench Press"
+    assert broken_replica.choose() is None
+
+
+@pytest.mark.parametrize(("written_seconds_ago", "read_from_replica"), [(1, False), (60, True)])
+def test_last_write_header_is_honored_by_any_worker(
+    test_database: Session,
+    replica: ReplicaRouter,  # noqa: ARG001
+    written_seconds_ago: int,
+    read_from_replica: bool,  # noqa: FBT001
+) -> None:
+    fill_database(test_database)
+    # No worker keeps the write, as if another worker process served it, the client only sends its time back.
+    response = client.get(
+        "/exercise/search",
+        params={"characters": "curl"},
+        headers={LAST_WRITE_HEADER: f"{time() - written_seconds_ago}"},
+    )
+    assert response.status_code == OK_STATUS
+    replica_exercises = [{"exercise_name": "Replica Curl", "muscle_group": "Biceps"}]
+    assert (response.json() == replica_exercises) is read_from_replica
+
+
+def test_health_check_skips_broken_replicas(broken_replica: ReplicaRouter) -> None:
+    asyncio.run(broken_replica.check_health(timeout=5))
+    assert broken_replica.choose() is None
+
+
+def test_health_check_restores_recovered_replicas(replica: ReplicaRouter) -> None:
+    chosen = replica.choose()
+    assert chosen is not None
+    replica.mark_unhealthy(chosen)
+    assert replica.choose() is None
+    asyncio.run(replica.check_health(timeout=5))
+    assert replica.choose() is chosen
+
+
+def test_health_check_measures_postgres_replay_lag() -> None:
+    postgres = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
+    router = ReplicaRouter([postgres], retry_seconds=30, max_lag_seconds=0)
+    router.mark_unhealthy(postgres)
+
+    async def check() -> None:
+        await router.check_health(timeout=5)
+        await postgres.dispose()
+
+    # The primary is not in recovery, so it counts as a replica without lag.
+    asyncio.run(check())
+    assert router.choose() is postgres
@@ -0,0 +1,131 @@
+# ruff: noqa: S101
+import os
+from collections.abc import AsyncGenerator, Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.main import fitness_app
+from fitness_tracker.tables.exercise_table import ExerciseTable
+from fitness_tracker.tables.exercise_usage_table import ExerciseUsageTable
+from fitness_tracker.training_stats.exercise_usage import rebuild_exercise_usage
+from test.database_filler import fill_database, fill_users
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
+        yield database
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+fitness_app.dependency_overrides[get_database] = override_get_database
+client = TestClient(fitness_app)
+
+OK_STATUS: int = 200
+CREATED_STATUS: int = 201
+USER_ID: int = 1
+
+
+def exercise_usage(test_database: Session) -> dict[tuple[int, str], tuple[int, str]]:
+    test_database.expire_all()
+    usage = test_database.execute(
+        select(
+            ExerciseUsageTable.user_id,
+            ExerciseTable.exercise_name,
+            ExerciseUsageTable.set_count,
+            ExerciseUsageTable.last_used,
+        ).join(ExerciseTable, ExerciseTable.id == ExerciseUsageTable.exercise_id),
+    )
+    return {
+        (user_id, exercise_name): (set_count, last_used.isoformat())
+        for user_id, exercise_name, set_count, last_used in usage
+    }
+
+
+def assert_matches_rebuild(test_database: Session) -> None:
+    incremental = exercise_usage(test_database)
+    rebuild_exercise_usage(test_database)
+    test_database.commit()
+    assert exercise_usage(test_database) == incremental
+
+
+def test_exercise_usage_follows_training_changes(test_database: Session) -> None:
+    fill_users(test_database)
+    response = client.post(
+        "/trainings/",
+        params={"user_id": USER_ID},
+        json={
+            "training": {"training_name": "push", "date": "2025-03-01"},
+            "sets": [
+                {"exercise_name": "Bench Press", "repetitions": 10, "weight": 80},
+                {"exercise_name": "Bench Press", "repetitions": 8, "weight": 90},
+                {"exercise_name": "Decline Pushups", "repetitions": 15, "weight": 0},
+            ],
+        },
+    )
+    assert response.status_code == CREATED_STATUS
+    assert exercise_usage(test_database) == {
+        (USER_ID, "Bench Press"): (2, "2025-03-01"),
+        (USER_ID, "Decline Pushups"): (1, "2025-03-01"),
+    }
+    assert_matches_rebuild(test_database)
+
+    training_id = client.get(
+        f"/trainings/fetch/sorted/{USER_ID}",
+        params={"sort_by": "date", "order": "desc"},
+    ).json()[0]["training_id"]
+    sets = client.get(f"/trainings/details/{training_id}").json()["sets"]
+    sets[0]["repetitions"] = 12
+    sets[1]["exercise_name"] = "Chin-ups"
+    response = client.put(f"/trainings/update/{training_id}", json=sets[:2])
+    assert response.status_code == OK_STATUS
+    assert exercise_usage(test_database) == {
+        (USER_ID, "Bench Press"): (1, "2025-03-01"),
+        (USER_ID, "Chin-ups"): (1, "2025-03-01"),
+    }
+    assert_matches_rebuild(test_database)
+
+    response = client.delete(f"/trainings/delete/{training_id}", params={"user_id": USER_ID})
+    assert response.status_code == OK_STATUS
+    assert exercise_usage(test_database) == {}
+
+
+def test_search_ranks_users_exercises_first(test_database: Session) -> None:
+    fill_database(test_database)
+    rebuild_exercise_usage(test_database)
+    test_database.commit()
+
+    params = {"characters": "press"}
+    anonymous = [exercise["exercise_name"] for exercise in client.get("/exercise/search", params=params).json()]
+    response = client.get("/exercise/search", params={**params, "user_id": 2})
+    assert response.status_code == OK_STATUS
+    ranked = [exercise["exercise_name"] for exercise in response.json()]
+
+    assert anonymous[0] != "Bench Press"
+    assert ranked[0] == "Bench Press"
+    assert sorted(ranked) == sorted(anonymous)
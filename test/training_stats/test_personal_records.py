@@ -0,0 +1,206 @@
+# ruff: noqa: S101
+import asyncio
+import os
+import random
+from collections.abc import AsyncGenerator, Generator
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.main import fitness_app
+from fitness_tracker.tables.exercise_table import ExerciseTable
+from fitness_tracker.tables.sets_table import SetsTable
+from fitness_tracker.tables.trainings_table import TrainingsTable
+from fitness_tracker.training_stats import changes
+from fitness_tracker.training_stats.changes import SetChanges, SetRecord, apply_set_changes
+from fitness_tracker.training_stats.personal_records import rebuild_personal_records, update_personal_records
+from test.database_filler import fill_users
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
+        yield database
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+fitness_app.dependency_overrides[get_database] = override_get_database
+client = TestClient(fitness_app)
+
+OK_STATUS: int = 200
+CREATED_STATUS: int = 201
+USER_ID: int = 1
+
+EXERCISES: list[str] = ["Bench Press", "Chin-ups", "Decline Pushups"]
+RANDOM_STEPS: int = 30
+KEPT_SET_SHARE: float = 0.7
+HEAVY_WEIGHT: float = 120
+LIGHT_WEIGHT: float = 100
+BLOCKED_SECONDS: float = 0.5
+
+
+def personal_records() -> list[dict]:
+    response = client.get(f"/analytics/records/{USER_ID}")
+    assert response.status_code == OK_STATUS
+    return response.json()
+
+
+def assert_matches_rebuild(test_database: Session) -> list[dict]:
+    incremental = personal_records()
+    rebuild_personal_records(test_database)
+    test_database.commit()
+    assert personal_records() == incremental
+    return incremental
+
+
+def create_training(test_database: Session, date: str, sets: list[dict[str, str | int | float]]) -> int:
+    response = client.post(
+        "/trainings/",
+        params={"user_id": USER_ID},
+        json={"training": {"training_name": "push", "date": date}, "sets": sets},
+    )
+    assert response.status_code == CREATED_STATUS
+    return test_database.scalar(select(func.max(TrainingsTable.id)))
+
+
+def bench_record(test_database: Session) -> dict:
+    return next(record for record in assert_matches_rebuild(test_database) if record["exercise_name"] == "Bench Press")
+
+
+def test_personal_records_follow_training_changes(test_database: Session) -> None:
+    fill_users(test_database)
+    first_id = create_training(test_database, "2025-03-01", [
+        {"exercise_name": "Bench Press", "repetitions": 5, "weight": 100},
+        {"exercise_name": "Bench Press", "repetitions": 12, "weight": 80},
+    ])
+    second_id = create_training(test_database, "2025-03-08", [
+        {"exercise_name": "Bench Press", "repetitions": 8, "weight": 100},
+        {"exercise_name": "Chin-ups", "repetitions": 10, "weight": 0},
+    ])
+    assert bench_record(test_database) == {
+        "exercise_name": "Bench Press",
+        "max_weight": 100.0,
+        "max_weight_repetitions": 8,
+        "max_weight_date": "2025-03-08",
+        "best_one_rep_max": 126.67,
+        "best_one_rep_max_date": "2025-03-08",
+        "best_session_volume": 1460.0,
+        "best_session_training_id": first_id,
+        "best_session_date": "2025-03-01",
+    }
+
+    # Lowering the record-holding set recounts the exercise from the remaining sets.
+    sets = client.get(f"/trainings/details/{second_id}").json()["sets"]
+    sets[0]["weight"] = 90
+    assert client.put(f"/trainings/update/{second_id}", json=sets).status_code == OK_STATUS
+    record = bench_record(test_database)
+    assert (record["max_weight"], record["max_weight_repetitions"], record["max_weight_date"]) == (
+        100.0, 5, "2025-03-01",
+    )
+    assert (record["best_one_rep_max"], record["best_one_rep_max_date"]) == (116.67, "2025-03-01")
+
+    assert client.delete(f"/trainings/delete/{first_id}", params={"user_id": USER_ID}).status_code == OK_STATUS
+    record = bench_record(test_database)
+    assert (record["max_weight"], record["best_session_volume"], record["best_session_training_id"]) == (
+        90.0, 720.0, second_id,
+    )
+
+    assert client.delete(f"/trainings/delete/{second_id}", params={"user_id": USER_ID}).status_code == OK_STATUS
+    assert assert_matches_rebuild(test_database) == []
+
+
+def random_sets(generator: random.Random) -> list[dict[str, str | int | float]]:
+    return [
+        {
+            "exercise_name": generator.choice(EXERCISES),
+            "repetitions": generator.randint(1, 12),
+            "weight": generator.choice([0, 40, 60, 80, 100]),
+        }
+        for _ in range(generator.randint(1, 4))
+    ]
+
+
+def test_personal_records_match_rebuild_after_random_changes(test_database: Session) -> None:
+    fill_users(test_database)
+    generator = random.Random(0)
+    training_ids: list[int] = []
+    for step in range(RANDOM_STEPS):
+        action = generator.choice(["create", "create", "update", "delete"]) if training_ids else "create"
+        if action == "create":
+            training_ids.append(create_training(test_database, f"2025-03-{1 + step % 28:02d}", random_sets(generator)))
+        elif action == "update":
+            training_id = generator.choice(training_ids)
+            sets = client.get(f"/trainings/details/{training_id}").json()["sets"]
+            edited = generator.choice(sets)
+            edited["weight"] = generator.choice([0, 40, 60, 80, 100])
+            edited["repetitions"] = generator.randint(1, 12)
+            kept = [
+                exercise_set for exercise_set in sets
+                if generator.random() < KEPT_SET_SHARE or exercise_set is edited
+            ]
+            response = client.put(f"/trainings/update/{training_id}", json=kept + random_sets(generator)[:1])
+            assert response.status_code == OK_STATUS
+        else:
+            training_id = training_ids.pop(generator.randrange(len(training_ids)))
+            response = client.delete(f"/trainings/delete/{training_id}", params={"user_id": USER_ID})
+            assert response.status_code == OK_STATUS
+        assert_matches_rebuild(test_database)
+
+
+async def add_first_set(database: AsyncSession, exercise_id: int, training_date: date, weight: float) -> None:
+    training = TrainingsTable(name="push", user_id=USER_ID, date=training_date)
+    database.add(training)
+    await database.flush()
+    database.add(SetsTable(training_id=training.id, exercise_id=exercise_id, repetitions=5, weight=weight))
+    await database.flush()
+    await apply_set_changes(
+        database,
+        SetChanges(USER_ID, training.id, training_date, added=[SetRecord(exercise_id, 5, weight)]),
+    )
+
+
+async def write_concurrent_first_records(exercise_id: int) -> bool:
+    async with TestingAsyncSessionLocal() as heavy, TestingAsyncSessionLocal() as light:
+        await add_first_set(heavy, exercise_id, date(2025, 3, 1), HEAVY_WEIGHT)
+        light_write = asyncio.create_task(add_first_set(light, exercise_id, date(2025, 3, 8), LIGHT_WEIGHT))
+        await asyncio.sleep(BLOCKED_SECONDS)
+        waited = not light_write.done()
+        await heavy.commit()
+        await light_write
+        await light.commit()
+    return waited
+
+
+def test_concurrent_first_records_keep_the_max(test_database: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    fill_users(test_database)
+    # Neither session finds a record row to lock, the lighter one must still merge with the heavier one. The other
+    # handlers are left out, the usage upsert would otherwise make the lighter session wait on its own.
+    monkeypatch.setattr(changes, "set_change_handlers", [update_personal_records])
+    bench_press_id = test_database.scalar(select(ExerciseTable.id).where(ExerciseTable.exercise_name == "Bench Press"))
+    assert asyncio.run(write_concurrent_first_records(bench_press_id))
+    assert bench_record(test_database)["max_weight"] == HEAVY_WEIGHT
@@ -0,0 +1,195 @@
+# ruff: noqa: S101
+import os
+import random
+from collections.abc import AsyncGenerator, Generator
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, delete, func, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.main import fitness_app
+from fitness_tracker.tables.muscle_rollup_table import MuscleRollupTable
+from fitness_tracker.tables.training_rollup_table import TrainingRollupTable
+from fitness_tracker.tables.trainings_table import TrainingsTable
+from fitness_tracker.training_stats.training_rollups import check_training_rollups, rebuild_training_rollups
+from test.database_filler import fill_users
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
+        yield database
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+fitness_app.dependency_overrides[get_database] = override_get_database
+client = TestClient(fitness_app)
+
+
+OK_STATUS: int = 200
+CREATED_STATUS: int = 201
+BAD_REQUEST_STATUS: int = 400
+USER_ID: int = 1
+
+EXERCISES: list[str] = ["Bench Press", "Chin-ups", "Close-grip Press-ups", "Australian pull-ups"]
+RANDOM_STEPS: int = 30
+
+
+def rollups(granularity: str, from_date: str = "2025-03-01", to_date: str = "2025-04-30") -> list[dict[str, Any]]:
+    response = client.get(
+        f"/analytics/rollups/{USER_ID}",
+        params={"granularity": granularity, "from": from_date, "to": to_date},
+    )
+    assert response.status_code == OK_STATUS
+    return response.json()
+
+
+def create_training(test_database: Session, date: str, sets: list[dict[str, str | int | float]]) -> int:
+    response = client.post(
+        "/trainings/",
+        params={"user_id": USER_ID},
+        json={"training": {"training_name": "push", "date": date}, "sets": sets},
+    )
+    assert response.status_code == CREATED_STATUS
+    return test_database.scalar(select(func.max(TrainingsTable.id)))
+
+
+def test_training_rollups_follow_training_changes(test_database: Session) -> None:
+    fill_users(test_database)
+    create_training(test_database, "2025-03-03", [
+        {"exercise_name": "Bench Press", "repetitions": 10, "weight": 100},
+        {"exercise_name": "Close-grip Press-ups", "repetitions": 10, "weight": 0},
+    ])
+    create_training(test_database, "2025-03-09", [{"exercise_name": "Chin-ups", "repetitions": 8, "weight": 10}])
+    march_31_id = create_training(test_database, "2025-03-31", [
+        {"exercise_name": "Bench Press", "repetitions": 5, "weight": 100},
+    ])
+    create_training(test_database, "2025-04-02", [{"exercise_name": "Chin-ups", "repetitions": 10, "weight": 10}])
+    # A training without sets is not counted.
+    create_training(test_database, "2025-04-02", [])
+
+    assert rollups("week") == [
+        {
+            "period_start": "2025-03-03",
+            "training_count": 2,
+            "set_count": 3,
+            "total_volume": 1080.0,
+            "muscles": [
+                {"muscle": "Chest", "set_count": 2, "volume": 1000.0},
+                {"muscle": "Lats", "set_count": 2, "volume": 80.0},
+            ],
+        },
+        {
+            "period_start": "2025-03-31",
+            "training_count": 2,
+            "set_count": 2,
+            "total_volume": 600.0,
+            "muscles": [
+                {"muscle": "Chest", "set_count": 1, "volume": 500.0},
+                {"muscle": "Lats", "set_count": 1, "volume": 100.0},
+            ],
+        },
+    ]
+    assert [(rollup["period_start"], rollup["training_count"], rollup["total_volume"]) for rollup in rollups(
+        "month",
+    )] == [("2025-03-01", 3, 1580.0), ("2025-04-01", 1, 100.0)]
+
+    # The week of the deleted training spans two months, both its week and its month are recounted.
+    assert client.delete(f"/trainings/delete/{march_31_id}", params={"user_id": USER_ID}).status_code == OK_STATUS
+    assert [(rollup["period_start"], rollup["set_count"], rollup["total_volume"]) for rollup in rollups("week")] == [
+        ("2025-03-03", 3, 1080.0),
+        ("2025-03-31", 1, 100.0),
+    ]
+    assert [(rollup["period_start"], rollup["training_count"]) for rollup in rollups("month")] == [
+        ("2025-03-01", 2),
+        ("2025-04-01", 1),
+    ]
+    assert check_training_rollups(test_database) == []
+
+
+def test_training_rollups_check_finds_drift(test_database: Session) -> None:
+    fill_users(test_database)
+    create_training(test_database, "2025-03-03", [
+        {"exercise_name": "Australian pull-ups", "repetitions": 10, "weight": 5},
+    ])
+    test_database.execute(update(TrainingRollupTable).where(TrainingRollupTable.granularity == "week").values(
+        set_count=99,
+    ))
+    test_database.execute(delete(MuscleRollupTable).where(MuscleRollupTable.muscle == "Biceps"))
+    test_database.commit()
+
+    mismatches = check_training_rollups(test_database)
+    assert len(mismatches) == 1 + len(["week", "month"])
+    assert mismatches[0].startswith("training_rollups (1, 'week', datetime.date(2025, 3, 3))")
+
+    rebuild_training_rollups(test_database)
+    test_database.commit()
+    assert check_training_rollups(test_database) == []
+    assert rollups("week")[0]["set_count"] == 1
+
+
+def test_training_rollups_reject_long_ranges(test_database: Session) -> None:
+    fill_users(test_database)
+    params = {"from": "2010-01-01", "to": "2025-12-31"}
+    response = client.get(f"/analytics/rollups/{USER_ID}", params={"granularity": "week", **params})
+    assert response.status_code == BAD_REQUEST_STATUS
+    assert rollups("month", params["from"], params["to"]) == []
+
+    response = client.get(f"/analytics/rollups/{USER_ID}", params={"from": "2025-02-01", "to": "2025-01-01"})
+    assert response.status_code == BAD_REQUEST_STATUS
+
+
+def random_sets(generator: random.Random) -> list[dict[str, str | int | float]]:
+    return [
+        {
+            "exercise_name": generator.choice(EXERCISES),
+            "repetitions": generator.randint(1, 12),
+            "weight": generator.choice([0, 2.5, 40, 60, 80]),
+        }
+        for _ in range(generator.randint(1, 4))
+    ]
+
+
+def test_training_rollups_match_raw_sets_after_random_changes(test_database: Session) -> None:
+    fill_users(test_database)
+    generator = random.Random(0)
+    training_ids: list[int] = []
+    for step in range(RANDOM_STEPS):
+        action = generator.choice(["create", "create", "update", "delete"]) if training_ids else "create"
+        if action == "create":
+            date = f"2025-{1 + step % 4:02d}-{1 + step * 7 % 28:02d}"
+            training_ids.append(create_training(test_database, date, random_sets(generator)))
+        elif action == "update":
+            training_id = generator.choice(training_ids)
+            sets = client.get(f"/trainings/details/{training_id}").json()["sets"]
+            response = client.put(f"/trainings/update/{training_id}", json=sets[1:] + random_sets(generator))
+            assert response.status_code == OK_STATUS
+        else:
+            training_id = training_ids.pop(generator.randrange(len(training_ids)))
+            response = client.delete(f"/trainings/delete/{training_id}", params={"user_id": USER_ID})
+            assert response.status_code == OK_STATUS
+        assert check_training_rollups(test_database) == []
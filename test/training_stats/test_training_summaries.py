@@ -0,0 +1,127 @@
+# ruff: noqa: S101
+import json
+import os
+from collections.abc import AsyncGenerator, Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.main import fitness_app
+from fitness_tracker.tables.trainings_table import TrainingsTable
+from fitness_tracker.training_stats.training_summaries import rebuild_training_summaries
+from test.database_filler import fill_users
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
+        yield database
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+fitness_app.dependency_overrides[get_database] = override_get_database
+client = TestClient(fitness_app)
+
+OK_STATUS: int = 200
+CREATED_STATUS: int = 201
+USER_ID: int = 1
+
+SUMMARY_FIELDS: list[str] = ["set_count", "total_volume", "exercise_count", "top_muscles"]
+
+
+def listed_summaries() -> list[dict[str, str | int | float]]:
+    trainings = client.get(f"/trainings/fetch/sorted/{USER_ID}", params={"sort_by": "date", "order": "asc"}).json()
+    return [{field: training[field] for field in ["training_id", *SUMMARY_FIELDS]} for training in trainings]
+
+
+def assert_matches_rebuild(test_database: Session) -> None:
+    incremental = listed_summaries()
+    test_database.execute(update(TrainingsTable).values(set_count=0, total_volume=0, exercise_count=0, top_muscles=""))
+    test_database.commit()
+    rebuild_training_summaries(test_database)
+    assert listed_summaries() == incremental
+
+
+def create_training(date: str, sets: list[dict[str, str | int]]) -> int:
+    response = client.post(
+        "/trainings/",
+        params={"user_id": USER_ID},
+        json={"training": {"training_name": "push", "date": date}, "sets": sets},
+    )
+    assert response.status_code == CREATED_STATUS
+    return listed_summaries()[-1]["training_id"]
+
+
+def test_training_summaries_follow_training_changes(test_database: Session) -> None:
+    fill_users(test_database)
+    training_id = create_training("2025-03-01", [
+        {"exercise_name": "Bench Press", "repetitions": 10, "weight": 80},
+        {"exercise_name": "Bench Press", "repetitions": 8, "weight": 90},
+        {"exercise_name": "Bench Dips On Floor HD", "repetitions": 15, "weight": 0},
+        {"exercise_name": "Bench Press Narrow Grip", "repetitions": 10, "weight": 60},
+    ])
+    assert listed_summaries() == [{
+        "training_id": training_id,
+        "set_count": 4,
+        "total_volume": 2120.0,
+        "exercise_count": 3,
+        "top_muscles": "Chest, Triceps, Biceps",
+    }]
+    assert_matches_rebuild(test_database)
+
+    sets = client.get(f"/trainings/details/{training_id}").json()["sets"]
+    sets[0]["weight"] = 100
+    sets[1]["exercise_name"] = "Chin-ups"
+    response = client.put(f"/trainings/update/{training_id}", json=sets[:2])
+    assert response.status_code == OK_STATUS
+    assert listed_summaries() == [{
+        "training_id": training_id,
+        "set_count": 2,
+        "total_volume": 1720.0,
+        "exercise_count": 2,
+        "top_muscles": "Chest, Lats",
+    }]
+    assert_matches_rebuild(test_database)
+
+
+def test_training_summaries_of_imported_trainings(test_database: Session) -> None:
+    fill_users(test_database)
+    create_training("2025-03-01", [{"exercise_name": "Chin-ups", "repetitions": 10, "weight": 0}])
+    body = "\n".join(json.dumps(training) for training in [
+        {"training_name": "legs", "date": "2025-03-02", "sets": []},
+        {
+            "training_name": "pull",
+            "date": "2025-03-03",
+            "sets": [{"exercise_name": "Australian pull-ups", "repetitions": 10, "weight": 5}],
+        },
+    ])
+    response = client.post(f"/trainings/import/{USER_ID}", content=body)
+    assert response.status_code == OK_STATUS
+
+    assert [summary["set_count"] for summary in listed_summaries()] == [1, 0, 1]
+    assert listed_summaries()[-1]["top_muscles"] == "Biceps, Lats, Shoulders"
+    assert_matches_rebuild(test_database)
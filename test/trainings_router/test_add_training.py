@@ -1,14 +1,18 @@
 # ruff: noqa: S101
 import os
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
-from fitness_tracker.database import Base
-from fitness_tracker.main import fitness_app, get_database
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.main import fitness_app
+from fitness_tracker.tables.sets_table import SetsTable
+from fitness_tracker.tables.trainings_table import TrainingsTable
 from test.database_filler import fill_users
 
 TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
@@ -17,16 +21,16 @@ if not TESTING_DATABASE_URL:
     raise ValueError(msg)
 
 engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
 
 
-def override_get_database() -> Generator:
-    try:
-        database = TestingSessionLocal()
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
         yield database
-    finally:
-        database.close()
 
 
 @pytest.fixture
@@ -158,3 +162,19 @@ def test_add_training_failed(
     fill_users(test_database)
     response = client.post("/trainings/", params={"user_id": user_id}, json={"training": training_data, "sets": sets})
     assert response.status_code in {UNPROCESSABLE_STATUS, BAD_REQUEST}
+
+
+def test_add_training_is_atomic(test_database: Session) -> None:
+    fill_users(test_database)
+    sets = [
+        {"exercise_name": "Bench Press", "repetitions": 12, "weight": 100},
+        {"exercise_name": "not existing exercise", "repetitions": 12, "weight": 100},
+    ]
+    response = client.post(
+        "/trainings/",
+        params={"user_id": 1},
+        json={"training": {"training_name": "test1", "date": "2025-02-23"}, "sets": sets},
+    )
+    assert response.status_code == BAD_REQUEST
+    assert test_database.query(TrainingsTable).count() == 0
+    assert test_database.query(SetsTable).count() == 0
@@ -0,0 +1,135 @@
+# ruff: noqa: S101
+import csv
+import json
+import os
+from collections.abc import AsyncGenerator, Generator
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.main import fitness_app
+from fitness_tracker.routers import trainings_router
+from fitness_tracker.tables.exercise_table import ExerciseTable
+from fitness_tracker.tables.sets_table import SetsTable
+from fitness_tracker.tables.trainings_table import TrainingsTable
+from test.database_filler import fill_database
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
+        yield database
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+fitness_app.dependency_overrides[get_database] = override_get_database
+client = TestClient(fitness_app)
+
+OK_STATUS: int = 200
+UNPROCESSABLE_STATUS: int = 422
+USER_ID: int = 2
+EMPTY_TRAINING_ID: int = 100
+# Small batches make trainings span several fetches of the server-side cursor.
+BATCH_SIZE: int = 2
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(trainings_router, "STREAM_BATCH_SIZE", BATCH_SIZE)
+
+
+def expected_history(test_database: Session) -> list[dict]:
+    test_database.add(TrainingsTable(id=EMPTY_TRAINING_ID, user_id=USER_ID, name="rest", date=date(2025, 2, 22)))
+    test_database.commit()
+
+    trainings = test_database.query(TrainingsTable).filter(TrainingsTable.user_id == USER_ID).order_by(
+        TrainingsTable.date, TrainingsTable.id,
+    ).all()
+    history = []
+    for training in trainings:
+        sets = test_database.query(SetsTable, ExerciseTable.exercise_name).join(ExerciseTable).filter(
+            SetsTable.training_id == training.id,
+        ).order_by(SetsTable.id).all()
+        history.append({
+            "training_id": training.id,
+            "training_name": training.name,
+            "date": training.date.isoformat(),
+            "sets": [
+                {
+                    "set_id": exercise_set.id,
+                    "exercise_name": exercise_name,
+                    "repetitions": exercise_set.repetitions,
+                    "weight": exercise_set.weight,
+                }
+                for exercise_set, exercise_name in sets
+            ],
+        })
+    return history
+
+
+@pytest.mark.parametrize("accept_encoding", ["gzip", "identity"])
+def test_export_trainings_as_ndjson(accept_encoding: str, test_database: Session) -> None:
+    fill_database(test_database)
+    history = expected_history(test_database)
+
+    response = client.get(f"/trainings/export/{USER_ID}", headers={"Accept-Encoding": accept_encoding})
+    assert response.status_code == OK_STATUS
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers.get("content-encoding", "identity") == accept_encoding
+    assert [json.loads(line) for line in response.text.splitlines()] == history
+
+
+def test_export_trainings_as_csv(test_database: Session) -> None:
+    fill_database(test_database)
+    history = expected_history(test_database)
+
+    response = client.get(f"/trainings/export/{USER_ID}", params={"format": "csv"})
+    assert response.status_code == OK_STATUS
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(response.text.splitlines()))
+    expected_rows = [
+        {
+            "training_id": str(training["training_id"]),
+            "training_name": training["training_name"],
+            "date": training["date"],
+            "set_id": str(exercise_set["set_id"]) if exercise_set else "",
+            "exercise_name": exercise_set["exercise_name"] if exercise_set else "",
+            "repetitions": str(exercise_set["repetitions"]) if exercise_set else "",
+            "weight": str(exercise_set["weight"]) if exercise_set else "",
+        }
+        for training in history
+        for exercise_set in training["sets"] or [None]
+    ]
+    assert rows == expected_rows
+
+
+def test_export_trainings_rejects_unknown_format(test_database: Session) -> None:
+    fill_database(test_database)
+    response = client.get(f"/trainings/export/{USER_ID}", params={"format": "xml"})
+    assert response.status_code == UNPROCESSABLE_STATUS
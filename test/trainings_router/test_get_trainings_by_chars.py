@@ -1,14 +1,16 @@
 # ruff: noqa: S101
 import os
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
-from fitness_tracker.database import Base
-from fitness_tracker.main import fitness_app, get_database
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.main import fitness_app
 from test.database_filler import fill_database
 
 TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
@@ -17,16 +19,16 @@ if not TESTING_DATABASE_URL:
     raise ValueError(msg)
 
 engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
 
 
-def override_get_database() -> Generator:
-    try:
-        database = TestingSessionLocal()
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
         yield database
-    finally:
-        database.close()
 
 
 @pytest.fixture
@@ -51,6 +53,10 @@ OK_STATUS: int = 200
                 "training_id": 1,
                 "training_name": "test1",
                 "date": "2025-02-23",
+                "set_count": 1,
+                "total_volume": 840.0,
+                "exercise_count": 1,
+                "top_muscles": "Biceps, Lats, Shoulders",
             },
 
         ],
@@ -61,11 +67,19 @@ OK_STATUS: int = 200
                 "training_id": 2,
                 "training_name": "test2",
                 "date": "2025-02-23",
+                "set_count": 3,
+                "total_volume": 2400.0,
+                "exercise_count": 2,
+                "top_muscles": "Chest",
             },
             {
                 "training_id": 3,
                 "training_name": "test3",
                 "date": "2025-02-21",
+                "set_count": 3,
+                "total_volume": 2400.0,
+                "exercise_count": 2,
+                "top_muscles": "Chest",
             },
         ],
     ),
@@ -75,6 +89,10 @@ OK_STATUS: int = 200
                 "training_id": 2,
                 "training_name": "test2",
                 "date": "2025-02-23",
+                "set_count": 3,
+                "total_volume": 2400.0,
+                "exercise_count": 2,
+                "top_muscles": "Chest",
             },
         ],
     ),
@@ -82,7 +100,7 @@ OK_STATUS: int = 200
 def test_get_trainings_by_chars(
     characters: str,
     user_id: int,
-    expected_trainings: list[dict[str, str | int]],
+    expected_trainings: list[dict[str, str | int | float]],
     test_database: Session,
 ) -> None:
     fill_database(test_database)
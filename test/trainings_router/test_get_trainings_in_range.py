@@ -0,0 +1,115 @@
+# ruff: noqa: S101
+import json
+import os
+from collections.abc import AsyncGenerator, Generator
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.main import fitness_app
+from fitness_tracker.tables.trainings_table import TrainingsTable
+from test.database_filler import fill_database
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
+        yield database
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+fitness_app.dependency_overrides[get_database] = override_get_database
+fitness_app.dependency_overrides[get_database] = override_get_database
+client = TestClient(fitness_app)
+
+OK_STATUS: int = 200
+BAD_REQUEST_STATUS: int = 400
+USER_ID: int = 2
+OTHER_USER_ID: int = 1
+FIRST_EXTRA_ID: int = 100
+
+
+def add_monthly_trainings(test_database: Session) -> None:
+    test_database.add_all([
+        TrainingsTable(
+            id=FIRST_EXTRA_ID + number,
+            user_id=USER_ID if number % 5 else OTHER_USER_ID,
+            name="Legs" if number % 2 else "Push",
+            date=date(2025, 1 + number % 12, 1 + number % 28),
+        )
+        for number in range(60)
+    ])
+    test_database.commit()
+
+
+def fetch_range(params: dict[str, str]) -> list[dict[str, str | int]]:
+    response = client.get(f"/trainings/range/{USER_ID}", params=params)
+    assert response.status_code == OK_STATUS
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+@pytest.mark.parametrize(("params", "name"), [
+    ({"from": "2025-03-01", "to": "2025-05-31"}, None),
+    ({"from": "2025-03-01", "to": "2025-05-31", "name": "LEG"}, "leg"),
+    ({"from": "2025-02-21", "to": "2025-02-23"}, None),
+    ({"from": "2025-01-01", "to": "2025-12-31", "name": "test"}, "test"),
+])
+def test_get_trainings_in_range(params: dict[str, str], name: str | None, test_database: Session) -> None:
+    fill_database(test_database)
+    add_monthly_trainings(test_database)
+
+    from_date, to_date = date.fromisoformat(params["from"]), date.fromisoformat(params["to"])
+    trainings = test_database.query(TrainingsTable).filter(TrainingsTable.user_id == USER_ID).all()
+    expected_trainings = [
+        {
+            "training_id": training.id,
+            "training_name": training.name,
+            "date": training.date.isoformat(),
+            "set_count": training.set_count,
+            "total_volume": training.total_volume,
+            "exercise_count": training.exercise_count,
+            "top_muscles": training.top_muscles,
+        }
+        for training in sorted(trainings, key=lambda training: (training.date, training.id))
+        if from_date <= training.date <= to_date and (name is None or name in training.name.lower())
+    ]
+
+    assert expected_trainings
+    assert fetch_range(params) == expected_trainings
+
+
+def test_get_trainings_in_empty_range(test_database: Session) -> None:
+    fill_database(test_database)
+    assert fetch_range({"from": "2030-01-01", "to": "2030-12-31"}) == []
+
+
+def test_get_trainings_in_range_rejects_inverted_range(test_database: Session) -> None:
+    fill_database(test_database)
+    response = client.get(f"/trainings/range/{USER_ID}", params={"from": "2025-05-31", "to": "2025-03-01"})
+    assert response.status_code == BAD_REQUEST_STATUS
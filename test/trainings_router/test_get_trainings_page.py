@@ -0,0 +1,141 @@
+# ruff: noqa: S101
+import os
+from collections.abc import AsyncGenerator, Generator
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.main import fitness_app
+from fitness_tracker.pagination import encode_cursor
+from fitness_tracker.tables.trainings_table import TrainingsTable
+from test.database_filler import fill_database
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
+        yield database
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+fitness_app.dependency_overrides[get_database] = override_get_database
+client = TestClient(fitness_app)
+
+OK_STATUS: int = 200
+BAD_REQUEST_STATUS: int = 400
+PAGE_SIZE: int = 3
+USER_ID: int = 2
+# The filler inserts explicit ids, so the extra trainings do too instead of relying on the sequence.
+FIRST_EXTRA_ID: int = 100
+
+
+def add_duplicate_trainings(test_database: Session, user_id: int) -> None:
+    test_database.add_all([
+        TrainingsTable(
+            id=FIRST_EXTRA_ID + number,
+            user_id=user_id,
+            name=f"repeat{number % 3}",
+            date=date(2025, 3, 1 + number % 4),
+        )
+        for number in range(11)
+    ])
+    test_database.commit()
+
+
+@pytest.mark.parametrize(("sort_by", "order"), [
+    ("name", "asc"),
+    ("name", "desc"),
+    ("date", "asc"),
+    ("date", "desc"),
+])
+def test_get_trainings_page_walks_all_trainings(sort_by: str, order: str, test_database: Session) -> None:
+    fill_database(test_database)
+    add_duplicate_trainings(test_database, user_id=USER_ID)
+
+    trainings = test_database.query(TrainingsTable).filter(TrainingsTable.user_id == USER_ID).all()
+    expected_ids = [
+        training.id for training in sorted(
+            trainings,
+            key=lambda training: (getattr(training, sort_by), training.id),
+            reverse=order == "desc",
+        )
+    ]
+
+    fetched_ids: list[int] = []
+    params: dict[str, str | int] = {"sort_by": sort_by, "order": order, "page_size": PAGE_SIZE}
+    while True:
+        response = client.get(f"/trainings/fetch/page/{USER_ID}", params=params)
+        assert response.status_code == OK_STATUS
+        page = response.json()
+        assert len(page["trainings"]) <= PAGE_SIZE
+        fetched_ids.extend(training["training_id"] for training in page["trainings"])
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+
+    assert fetched_ids == expected_ids
+
+
+def test_get_trainings_page_first_page_matches_offset(test_database: Session) -> None:
+    fill_database(test_database)
+    params = {"sort_by": "date", "order": "desc"}
+    page = client.get(f"/trainings/fetch/page/{USER_ID}", params=params).json()
+    sorted_trainings = client.get(f"/trainings/fetch/sorted/{USER_ID}", params=params).json()
+    assert page == {"trainings": sorted_trainings, "next_cursor": None}
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "WyJuYW1lIiwiYXNjIiwidGVzdCIsMV0"])
+def test_get_trainings_page_rejects_invalid_cursor(cursor: str, test_database: Session) -> None:
+    fill_database(test_database)
+    response = client.get(
+        f"/trainings/fetch/page/{USER_ID}",
+        params={"sort_by": "date", "order": "asc", "cursor": cursor},
+    )
+    assert response.status_code == BAD_REQUEST_STATUS
+
+
+@pytest.mark.parametrize(("sort_by", "cursor_values"), [
+    ("date", ["date", "asc", "2025-03-01", True]),
+    ("date", ["date", "asc", "2025-03-01", 2**40]),
+    ("date", ["date", "asc", "not a date", 1]),
+    ("date", ["date", "asc", ["2025-03-01"], 1]),
+    ("name", ["name", "asc", ["test"], 1]),
+    ("name", ["name", "asc", 5, 1]),
+    ("name", ["name", "asc", "test", "1"]),
+])
+def test_get_trainings_page_rejects_forged_cursor(
+    sort_by: str,
+    cursor_values: list,
+    test_database: Session,
+) -> None:
+    fill_database(test_database)
+    response = client.get(
+        f"/trainings/fetch/page/{USER_ID}",
+        params={"sort_by": sort_by, "order": "asc", "cursor": encode_cursor(*cursor_values)},
+    )
+    assert response.status_code == BAD_REQUEST_STATUS
@@ -0,0 +1,218 @@
+# ruff: noqa: S101
+import json
+import os
+from collections.abc import AsyncGenerator, Generator, Iterator
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from fitness_tracker import training_import
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.main import fitness_app
+from fitness_tracker.tables.exercise_usage_table import ExerciseUsageTable
+from fitness_tracker.tables.trainings_table import TrainingsTable
+from fitness_tracker.training_stats.exercise_usage import rebuild_exercise_usage
+from test.database_filler import fill_database
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
+        yield database
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+fitness_app.dependency_overrides[get_database] = override_get_database
+client = TestClient(fitness_app)
+
+OK_STATUS: int = 200
+SOURCE_USER_ID: int = 2
+TARGET_USER_ID: int = 3
+CHUNK_SIZE: int = 2
+SOURCE_REPEATS: int = 3
+UNICODE_TRAINING_ID: int = 100
+BAD_DAY: int = 4
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(training_import, "IMPORT_CHUNK_SIZE", CHUNK_SIZE)
+
+
+def fill_importable_database(test_database: Session) -> None:
+    fill_database(test_database)
+    test_database.add(TrainingsTable(
+        id=UNICODE_TRAINING_ID,
+        user_id=SOURCE_USER_ID,
+        # Quotes, commas and a line break need quoting in the CSV export, the break spans two lines there.
+        name='Rückentraining, "schwer" 💪\nzweiter Teil',
+        date=date(2025, 2, 22),
+    ))
+    # The filler inserts explicit ids, imported trainings take theirs from the sequence.
+    test_database.execute(text("SELECT setval('trainings_id_seq', (SELECT max(id) FROM trainings))"))
+    test_database.commit()
+
+
+def history_without_ids(user_id: int) -> list[dict]:
+    lines = client.get(f"/trainings/export/{user_id}").text.splitlines()
+    history = []
+    for line in lines:
+        training = json.loads(line)
+        del training["training_id"]
+        for exercise_set in training["sets"]:
+            del exercise_set["set_id"]
+        history.append(training)
+    return history
+
+
+def target_usage(test_database: Session) -> dict[int, tuple[int, date]]:
+    return {
+        usage.exercise_id: (usage.set_count, usage.last_used)
+        for usage in test_database.query(ExerciseUsageTable).filter(ExerciseUsageTable.user_id == TARGET_USER_ID)
+    }
+
+
+def byte_chunks(body: bytes, size: int) -> Iterator[bytes]:
+    # Small chunks split lines and multi-byte characters between reads.
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+def test_import_exported_history(export_format: str, test_database: Session) -> None:
+    fill_importable_database(test_database)
+    body = client.get(f"/trainings/export/{SOURCE_USER_ID}", params={"format": export_format}).content
+
+    response = client.post(
+        f"/trainings/import/{TARGET_USER_ID}",
+        content=byte_chunks(body, 7),
+        headers={"Content-Type": "text/csv" if export_format == "csv" else "application/x-ndjson"},
+    )
+    assert response.status_code == OK_STATUS
+
+    source_history = history_without_ids(SOURCE_USER_ID)
+    assert response.json() == {
+        "imported_trainings": len(source_history),
+        "imported_sets": sum(len(training["sets"]) for training in source_history),
+        "errors": [],
+    }
+    assert history_without_ids(TARGET_USER_ID) == source_history
+
+
+def test_import_updates_exercise_usage(test_database: Session) -> None:
+    fill_importable_database(test_database)
+    body = client.get(f"/trainings/export/{SOURCE_USER_ID}").content
+    client.post(f"/trainings/import/{TARGET_USER_ID}", content=body * SOURCE_REPEATS)
+
+    imported_usage = target_usage(test_database)
+    # The counters written by the import must match counters rebuilt from the imported sets.
+    rebuild_exercise_usage(test_database)
+    test_database.commit()
+    assert imported_usage
+    assert imported_usage == target_usage(test_database)
+
+
+def test_import_reports_invalid_lines(test_database: Session) -> None:
+    fill_importable_database(test_database)
+    lines = [
+        '{"training_name": "ok", "date": "2025-03-01", "sets": []}',
+        "not json",
+        "",
+        '{"training_name": "ok", "date": "2025-03-02", "sets": '
+        '[{"exercise_name": "Chin-ups", "repetitions": 0, "weight": 10}]}',
+        '{"training_name": "ok", "date": "2025-03-03", "sets": '
+        '[{"exercise_name": "Unknown", "repetitions": 5, "weight": 10}]}',
+        '{"training_name": "ok", "date": "2025-03-04", "sets": '
+        '[{"exercise_name": "Chin-ups", "repetitions": 5, "weight": 10}]}',
+    ]
+
+    response = client.post(f"/trainings/import/{TARGET_USER_ID}", content="\n".join(lines))
+    assert response.status_code == OK_STATUS
+    report = response.json()
+    assert (report["imported_trainings"], report["imported_sets"]) == (2, 1)
+    assert [error["line"] for error in report["errors"]] == [2, 4, 5]
+    assert "repetitions" in report["errors"][1]["detail"]
+    assert report["errors"][2]["detail"] == "Exercise Unknown does not exists in database"
+
+
+def test_import_rejects_csv_without_required_columns(test_database: Session) -> None:
+    fill_importable_database(test_database)
+    response = client.post(
+        f"/trainings/import/{TARGET_USER_ID}",
+        content="training_name,date\nok,2025-03-01\n",
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.status_code == OK_STATUS
+    assert response.json() == {
+        "imported_trainings": 0,
+        "imported_sets": 0,
+        "errors": [{"line": 1, "detail": "Missing columns: exercise_name, repetitions, weight"}],
+    }
+
+
+def test_import_reports_only_lines_the_database_rejects(test_database: Session) -> None:
+    fill_importable_database(test_database)
+    lines = [
+        json.dumps({
+            "training_name": f"day {day}",
+            "date": f"2025-03-0{day}",
+            # Repetitions beyond a Postgres integer pass validation but cannot be stored.
+            "sets": [{"exercise_name": "Chin-ups", "repetitions": 2**40 if day == BAD_DAY else 5, "weight": 10}],
+        })
+        for day in range(1, 6)
+    ]
+
+    response = client.post(f"/trainings/import/{TARGET_USER_ID}", content="\n".join(lines * CHUNK_SIZE))
+    assert response.status_code == OK_STATUS
+    report = response.json()
+    assert (report["imported_trainings"], report["imported_sets"]) == (8, 8)
+    assert report["errors"] == [
+        {"line": BAD_DAY + repeat * len(lines), "detail": "The database rejected the training."}
+        for repeat in range(CHUNK_SIZE)
+    ]
+    assert len(history_without_ids(TARGET_USER_ID)) == len(report["errors"]) * 4
+
+
+def test_import_reassembles_quoted_csv_line_breaks(test_database: Session) -> None:
+    fill_importable_database(test_database)
+    body = (
+        "training_name,date,exercise_name,repetitions,weight\n"
+        '"two\nlines",2025-03-01,Chin-ups,5,10\n'
+        "too,few\n"
+        '"never closed,2025-03-02,Chin-ups,5,10\n'
+    )
+    response = client.post(f"/trainings/import/{TARGET_USER_ID}", content=body, headers={"Content-Type": "text/csv"})
+    assert response.status_code == OK_STATUS
+    assert response.json() == {
+        "imported_trainings": 1,
+        "imported_sets": 1,
+        "errors": [
+            {"line": 4, "detail": "Expected 5 columns, got 2"},
+            {"line": 5, "detail": "Quoted field is not closed"},
+        ],
+    }
+    assert [training["training_name"] for training in history_without_ids(TARGET_USER_ID)] == ["two\nlines"]
@@ -0,0 +1,106 @@
+# ruff: noqa: S101
+import os
+from collections.abc import AsyncGenerator, Generator
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.main import fitness_app
+from fitness_tracker.tables.trainings_table import TrainingsTable
+from test.database_filler import fill_database
+
+TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
+if not TESTING_DATABASE_URL:
+    msg = "Missing url for testing database"
+    raise ValueError(msg)
+
+engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
+        yield database
+
+
+@pytest.fixture
+def test_database() -> Generator:
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+fitness_app.dependency_overrides[get_database] = override_get_database
+client = TestClient(fitness_app)
+
+OK_STATUS: int = 200
+BAD_REQUEST_STATUS: int = 400
+PAGE_SIZE: int = 3
+USER_ID: int = 2
+FIRST_EXTRA_ID: int = 100
+EXTRA_NAMES: list[str] = ["Push Day", "PULL DAY", "Legs", "upper pull", "Pullover Day"]
+
+
+def add_named_trainings(test_database: Session, user_id: int) -> None:
+    test_database.add_all([
+        TrainingsTable(id=FIRST_EXTRA_ID + number, user_id=user_id, name=name, date=date(2025, 3, 1 + number))
+        for number, name in enumerate(EXTRA_NAMES * 2)
+    ])
+    test_database.commit()
+
+
+def walk_search_pages(characters: str) -> list[int]:
+    fetched_ids: list[int] = []
+    params: dict[str, str | int] = {"characters": characters, "user_id": USER_ID, "page_size": PAGE_SIZE}
+    while True:
+        response = client.get("/trainings/fetch/search/page", params=params)
+        assert response.status_code == OK_STATUS
+        page = response.json()
+        assert len(page["trainings"]) <= PAGE_SIZE
+        fetched_ids.extend(training["training_id"] for training in page["trainings"])
+        if page["next_cursor"] is None:
+            return fetched_ids
+        params["cursor"] = page["next_cursor"]
+
+
+@pytest.mark.parametrize("characters", ["pull", "PULL", "day", "t", "legs", "missing"])
+def test_search_trainings_page_walks_all_matches(characters: str, test_database: Session) -> None:
+    fill_database(test_database)
+    add_named_trainings(test_database, user_id=USER_ID)
+
+    trainings = test_database.query(TrainingsTable).filter(TrainingsTable.user_id == USER_ID).all()
+    expected_ids = [
+        training.id
+        for training in sorted(trainings, key=lambda training: (training.name, training.id))
+        if characters.lower() in training.name.lower()
+    ]
+
+    assert walk_search_pages(characters) == expected_ids
+
+
+def test_search_trainings_is_case_insensitive(test_database: Session) -> None:
+    fill_database(test_database)
+    response = client.get("/trainings/fetch/search", params={"characters": "TEST2", "user_id": USER_ID})
+    assert response.status_code == OK_STATUS
+    assert [training["training_id"] for training in response.json()] == [2]
+
+
+def test_search_trainings_page_rejects_invalid_cursor(test_database: Session) -> None:
+    fill_database(test_database)
+    response = client.get(
+        "/trainings/fetch/search/page",
+        params={"characters": "t", "user_id": USER_ID, "cursor": "not-a-cursor"},
+    )
+    assert response.status_code == BAD_REQUEST_STATUS
@@ -1,15 +1,19 @@
 # ruff: noqa: S101
 import os
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from datetime import date
+from typing import Any
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
-from fitness_tracker.database import Base
-from fitness_tracker.main import fitness_app, get_database
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.main import fitness_app
+from fitness_tracker.tables.sets_table import SetsTable
 from test.database_filler import fill_database
 
 TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
@@ -18,16 +22,16 @@ if not TESTING_DATABASE_URL:
     raise ValueError(msg)
 
 engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
 
 
-def override_get_database() -> Generator:
-    try:
-        database = TestingSessionLocal()
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
         yield database
-    finally:
-        database.close()
 
 
 @pytest.fixture
@@ -43,6 +47,7 @@ fitness_app.dependency_overrides[get_database] = override_get_database
 client = TestClient(fitness_app)
 
 OK_STATUS: int = 200
+SETS_IN_WORKOUT: int = 30
 
 
 @pytest.mark.parametrize(("training_id", "expected_training_details"), [
@@ -71,3 +76,29 @@ def test_training_details(
     assert response.status_code == OK_STATUS
     training_details = response.json()
     assert training_details == expected_training_details
+
+
+def test_training_details_uses_single_query(test_database: Session) -> None:
+    fill_database(test_database)
+    test_database.add_all(
+        SetsTable(training_id=1, exercise_id=1, repetitions=repetitions, weight=70)
+        for repetitions in range(1, SETS_IN_WORKOUT)
+    )
+    test_database.commit()
+
+    statements: list[str] = []
+
+    def count_statement(*args: Any) -> None:  # noqa: ANN401
+        statements.append(args[2])
+
+    event.listen(Engine, "before_cursor_execute", count_statement)
+    try:
+        response = client.get("/trainings/details/1")
+    finally:
+        event.remove(Engine, "before_cursor_execute", count_statement)
+
+    assert response.status_code == OK_STATUS
+    set_ids = [exercise_set["set_id"] for exercise_set in response.json()["sets"]]
+    assert len(set_ids) == SETS_IN_WORKOUT
+    assert set_ids == sorted(set_ids)
+    assert len(statements) == 1
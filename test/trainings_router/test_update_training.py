@@ -1,14 +1,18 @@
 # ruff: noqa: S101
 import os
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
-from fitness_tracker.database import Base
-from fitness_tracker.main import fitness_app, get_database
+from fitness_tracker.database import Base, get_database, to_async_url
+from fitness_tracker.exercise_cache import exercise_id_cache
+from fitness_tracker.main import fitness_app
+from fitness_tracker.tables.sets_table import SetsTable
 from test.database_filler import fill_database
 
 TESTING_DATABASE_URL: str | None = os.getenv("TESTING_DATABASE_URL")
@@ -17,16 +21,16 @@ if not TESTING_DATABASE_URL:
     raise ValueError(msg)
 
 engine = create_engine(TESTING_DATABASE_URL)
+# TestClient runs every request on a new event loop, so async connections cannot be pooled between requests.
+async_engine = create_async_engine(to_async_url(TESTING_DATABASE_URL), poolclass=NullPool)
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
 
 
-def override_get_database() -> Generator:
-    try:
-        database = TestingSessionLocal()
+async def override_get_database() -> AsyncGenerator:
+    async with TestingAsyncSessionLocal() as database:
         yield database
-    finally:
-        database.close()
 
 
 @pytest.fixture
@@ -43,6 +47,8 @@ client = TestClient(fitness_app)
 
 OK_STATUS: int = 200
 NOT_FOUND_STATUS: int = 404
+BAD_REQUEST_STATUS: int = 400
+UPDATED_TRAINING_ID: int = 2
 
 
 @pytest.mark.parametrize(("training_id", "updated_training"), [
@@ -129,3 +135,72 @@ def test_update_training_failed(
     fill_database(test_database)
     response = client.put(f"/trainings/update/{training_id}", json=updated_training)
     assert response.status_code == NOT_FOUND_STATUS
+
+
+def test_update_training_applies_diff(test_database: Session) -> None:
+    fill_database(test_database)
+    updated_training = [
+        {"set_id": 2, "exercise_name": "Decline Pushups", "repetitions": 12, "weight": 0},
+        {"set_id": 3, "exercise_name": "Bench Press", "repetitions": 8, "weight": 110},
+        {"exercise_name": "Chin-ups", "repetitions": 6, "weight": 10},
+    ]
+    response = client.put(f"/trainings/update/{UPDATED_TRAINING_ID}", json=updated_training)
+    assert response.status_code == OK_STATUS
+
+    sets = test_database.query(SetsTable).filter(
+        SetsTable.training_id == UPDATED_TRAINING_ID,
+    ).order_by(SetsTable.id).all()
+    assert [(exercise_set.id, exercise_set.repetitions, exercise_set.weight) for exercise_set in sets[:2]] == [
+        (2, 12, 0),
+        (3, 8, 110),
+    ]
+    assert len(sets) == len(updated_training)
+
+
+@pytest.mark.parametrize(("updated_training"), [
+    [{"set_id": 5, "exercise_name": "Bench Press", "repetitions": 8, "weight": 110}],
+    [
+        {"set_id": 2, "exercise_name": "Bench Press", "repetitions": 8, "weight": 110},
+        {"set_id": 2, "exercise_name": "Bench Press", "repetitions": 9, "weight": 110},
+    ],
+])
+def test_update_training_rejects_foreign_sets(
+    updated_training: list[dict[str, str | int]],
+    test_database: Session,
+) -> None:
+    fill_database(test_database)
+    response = client.put("/trainings/update/2", json=updated_training)
+    assert response.status_code == BAD_REQUEST_STATUS
+    assert test_database.query(SetsTable).filter(SetsTable.training_id == 2).count() == 3  # noqa: PLR2004
+
+
+def test_update_training_resolves_only_new_and_renamed_sets(
+    test_database: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fill_database(test_database)
+    resolved_names: list[set[str]] = []
+    resolve = exercise_id_cache.resolve
+
+    async def recording_resolve(database: AsyncSession, exercise_names: set[str]) -> dict[str, int]:
+        resolved_names.append(exercise_names)
+        return await resolve(database, exercise_names)
+
+    monkeypatch.setattr(exercise_id_cache, "resolve", recording_resolve)
+    sets = client.get(f"/trainings/details/{UPDATED_TRAINING_ID}").json()["sets"]
+    kept_names = {exercise_set["exercise_name"] for exercise_set in sets}
+    sets[0]["repetitions"] += 1
+    sets[1]["exercise_name"] = "Chin-ups"
+    new_set = {"exercise_name": "Australian pull-ups", "repetitions": 6, "weight": 10}
+    assert kept_names.isdisjoint({"Chin-ups", "Australian pull-ups"})
+
+    # Kept sets sent with their current names keep their exercises, whatever the names resolve to.
+    response = client.put(f"/trainings/update/{UPDATED_TRAINING_ID}", json=[*sets, new_set])
+    assert response.status_code == OK_STATUS
+    assert resolved_names == [{"Chin-ups", "Australian pull-ups"}]
+
+    # Renaming a kept set to an unknown exercise is rejected like an unknown exercise of a new set.
+    sets = client.get(f"/trainings/details/{UPDATED_TRAINING_ID}").json()["sets"]
+    sets[0]["exercise_name"] = "wrong exercise"
+    response = client.put(f"/trainings/update/{UPDATED_TRAINING_ID}", json=sets)
+    assert response.status_code == NOT_FOUND_STATUS